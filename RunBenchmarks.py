@@ -0,0 +1,68 @@
+'''
+Created on 18.10.2026
+'''
+import os
+import sys
+from benchmark import BenchmarkDecryption, BenchmarkEncryption, BenchmarkRandomnessPool, BenchmarkShortExponentRandomness, BenchmarkWeightedSum, BenchmarkModularInverse, BenchmarkDamgardJurik
+from benchmark import RunBenchmarkSuite, SaveBenchmarkResults, LoadBenchmarkResults, GetMetadataDifferences, CompareBenchmarkResults
+
+# Where the suite's timings are written, and the baseline they are compared against (created from the first results if missing;
+# it is specific to the machine and the settings, so it is not under version control)
+BENCHMARK_RESULT_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark-results.json")
+BENCHMARK_BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark", "baseline.json")
+
+# How much slower (relative) than the baseline a timing may get before it counts as a regression
+REGRESSION_TOLERANCE = 0.25
+
+if __name__ == '__main__':
+    result = BenchmarkDecryption()
+    print("decryption w/o CRT:", round(result["regular"] * 1e6, 2), "us")
+    print("decryption w/  CRT:", round(result["crt"] * 1e6, 2), "us")
+    print("CRT decryption speedup:", round(result["speedup"], 2), "times")
+    result = BenchmarkEncryption()
+    print("encryption w/ random g:", round(result["regular"] * 1e6, 2), "us")
+    print("encryption w/ g = n + 1:", round(result["simple"] * 1e6, 2), "us")
+    print("g = n + 1 encryption speedup:", round(result["speedup"], 2), "times")
+    result = BenchmarkRandomnessPool()
+    print("encryption w/o randomness pool:", round(result["regular"] * 1e6, 2), "us")
+    print("encryption w/  randomness pool:", round(result["pooled"] * 1e6, 2), "us")
+    print("randomness pool speedup:", round(result["speedup"], 2), "times", result["statistics"])
+    result = BenchmarkShortExponentRandomness()
+    print("encryption w/ classic randomness:       ", round(result["regular"] * 1e6, 2), "us")
+    print("encryption w/ short-exponent randomness:", round(result["shortExponent"] * 1e6, 2), "us (table setup:", round(result["tableSetup"] * 1e3, 2), "ms)")
+    print("short-exponent randomness speedup:", round(result["speedup"], 2), "times")
+    result = BenchmarkWeightedSum()
+    print("encrypted fusion w/ Mult and Add:", round(result["regular"] * 1e6, 2), "us")
+    print("encrypted fusion w/ WeightedSum: ", round(result["weightedSum"] * 1e6, 2), "us")
+    print("weighted sum speedup:", round(result["speedup"], 2), "times")
+    result = BenchmarkModularInverse()
+    print("modular inverse w/ recursive Euclid:", round(result["recursive"] * 1e6, 2), "us")
+    print("modular inverse w/ built-in pow:    ", round(result["builtIn"] * 1e6, 2), "us")
+    print("modular inverse in a batch:         ", round(result["batch"] * 1e6, 2), "us per value")
+    print("modular inverse speedup:", round(result["speedup"], 2), "times (batch:", round(result["batchSpeedup"], 2), "times)")
+    for s, r in BenchmarkDamgardJurik().items():
+        print("Damgard-Jurik s =", s, "(" + str(r["rounds"]), "rounds): encryption", round(r["encryption"] * 1e6, 2), "us, fusion", round(r["fusion"] * 1e6, 2),
+              "us, decryption", round(r["decryption"] * 1e6, 2), "us, per round", round(r["perRound"] * 1e6, 2), "us")
+    
+    # The suite: crypto primitives across key sizes, consensus rounds across grid sizes, and whole simulation runs
+    results = RunBenchmarkSuite()
+    SaveBenchmarkResults(results, BENCHMARK_RESULT_FILE)
+    print("benchmark suite results written to", BENCHMARK_RESULT_FILE)
+    if not os.path.isfile(BENCHMARK_BASELINE_FILE):
+        SaveBenchmarkResults(results, BENCHMARK_BASELINE_FILE)
+        print("no baseline found, saved these results as the baseline in", BENCHMARK_BASELINE_FILE)
+        sys.exit(0)
+    baselineResults = LoadBenchmarkResults(BENCHMARK_BASELINE_FILE)
+    for key, (baseline, current) in GetMetadataDifferences(results, baselineResults).items():
+        print("warning: the baseline was measured with %s = %r, these results with %r" % (key, baseline, current))
+    try:
+        comparison = CompareBenchmarkResults(results, baselineResults, REGRESSION_TOLERANCE)
+    except ValueError:
+        print("the baseline measured a different configuration, so the timings cannot be compared; delete", BENCHMARK_BASELINE_FILE, "to record a new one")
+        sys.exit(2)
+    regressions = 0
+    for name, baseline, current, ratio, regressed in comparison:
+        print("%-40s %12.2f us -> %12.2f us (%5.2fx)%s" % (name, baseline * 1e6, current * 1e6, ratio, "  REGRESSION" if regressed else ""))
+        regressions += regressed
+    print(regressions, "regression(s) beyond", REGRESSION_TOLERANCE * 100, "% compared to", BENCHMARK_BASELINE_FILE)
+    sys.exit(1 if regressions > 0 else 0)
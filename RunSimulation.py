@@ -4,118 +4,126 @@ Created on 30.05.2018
 @author: Mikhail Aristov
 '''
 import multiprocessing as mp
-from numpy import sqrt
-from simulation import SimSystem, SimGrid, SimController, SimParameters as PARAM
+from simulation import SimSystem, SimGrid, SimVectorizedGrid, SimController, SimScheduler, SimBatchedSimulator, SimErrorStatistics, SimCheckpoint, SimProfiler, SimParameters as PARAM
 
 # Set parameters
 #PARAM.DO_NOT_ENCRYPT = True
 
-# Initialize the system, the sensor grid, and the controller
-system = SimSystem(PARAM.SYSTEM_INITIAL_STATE, PARAM.SYSTEM_RANDOM_WALK_SIGMA)
-grid = SimGrid(PARAM.SENSOR_GRID_DIMENSIONS)
-controller = SimController(system, grid)
+# The system, the sensor grid, the controller, and the batched simulator (built once per process by InitializeWorker)
+system, grid, controller, batchedSimulator = None, None, None, None
 
-# Runs a simulation a specified number of times
-def Simulation(runs, PID = None):
-    EstimateCount, CumulativeError, CumulativeErrorNoFilter, CumulativeErrorEncrypted = 0, 0, 0, 0
-    CumulativeErrorQ8, CumulativeErrorQ16, CumulativeErrorQ24 = 0, 0, 0
+# The profiler of this process, if profiling is enabled (installed only once, however often the worker is initialized)
+profiler = None
+
+# Initializes the system, the sensor grid, and the controller (or the batched simulator)
+def InitializeWorker():
+    global system, grid, controller, batchedSimulator, profiler
+    if PARAM.PROFILING and profiler is None:
+        profiler = SimProfiler()
+        profiler.Install()
+    if PARAM.BATCHED_SIMULATION and PARAM.DO_NOT_ENCRYPT:
+        batchedSimulator = SimBatchedSimulator(PARAM.SENSOR_GRID_DIMENSIONS, PARAM.BATCHED_SIMULATION_BATCH_SIZE)
+        return
+    batchedSimulator = None
+    system = SimSystem(PARAM.SYSTEM_INITIAL_STATE, PARAM.SYSTEM_RANDOM_WALK_SIGMA)
+    grid = (SimVectorizedGrid if PARAM.VECTORIZED_GRID or PARAM.LAZY_ENCRYPTED_CONSENSUS else SimGrid)(PARAM.SENSOR_GRID_DIMENSIONS)
+    controller = SimController(system, grid)
+
+# Runs a simulation a specified number of times and returns the error statistics per time step, round, and estimator
+def Simulation(runs, Verbose = True):
+    if batchedSimulator is not None:
+        return batchedSimulator.Simulation(runs)
+    TotalTimeSteps, ConsensusRoundCount = PARAM.TIME_STEPS_PER_RUN, PARAM.CONSENSUS_ROUND_COUNT
+    statistics = SimErrorStatistics(TotalTimeSteps, ConsensusRoundCount)
     for run in range(runs):
-        if runs < 100 or run % (runs // 100) == 0:
-            if PID is None:
-                print("Running simulation #", run, "of", runs)
-            else:
-                print("Process #", PID, "is at", round(run/runs*100, 2), "%")
+        if Verbose and (runs < 100 or run % (runs // 100) == 0):
+            print("Running simulation #", run, "of", runs)
         
         system.Reset()
         # Update the system for N time steps
-        TotalTimeSteps, ConsensusRoundCount = PARAM.TIME_STEPS_PER_RUN, PARAM.CONSENSUS_ROUND_COUNT
-        for _ in range(TotalTimeSteps):
+        for step in range(TotalTimeSteps):
             # Evolve the system one step
             system.StepOnce()
             
             # Take all measurements
             grid.TakeAllMeasurements(system.CurrentPos)
             
-            # Let the controller sample the unfiltered estimate error
-            controller.FetchRandomEstimate()
-            CumulativeErrorNoFilter += controller.GetSquaredError()
+            # Let the controller sample the unfiltered estimate errors
+            controller.FetchRandomEstimate(0)
+            statistics.Add(step, 0, controller.GetAllSquaredErrors())
             
-            # Perform K rounds of consensus filtering
-            for _ in range(ConsensusRoundCount):
+            # Perform K rounds of consensus filtering (sampling the errors in between, if requested)
+            for r in range(1, ConsensusRoundCount + 1):
                 grid.ExecuteConsensusRound()
+                if PARAM.TRACK_ERRORS_PER_ROUND and r < ConsensusRoundCount:
+                    controller.FetchEstimateFromSameSensor(r)
+                    statistics.Add(step, r, controller.GetAllSquaredErrors())
             
-            # Let the controller retrieve an estimate and return its SE
+            # Let the controller retrieve an estimate and record its SEs
             controller.FetchEstimateFromSameSensor()
-            CumulativeError += controller.GetSquaredError()
-            E8, E16, E24 = controller.GetQuantizedSquaredErrors()
-            CumulativeErrorQ8  += E8
-            CumulativeErrorQ16 += E16
-            CumulativeErrorQ24 += E24
-            if not PARAM.DO_NOT_ENCRYPT:
-                CumulativeErrorEncrypted += controller.GetDecryptedSquaredError()
-            EstimateCount += 1
+            statistics.Add(step, ConsensusRoundCount, controller.GetAllSquaredErrors())
+
+    return statistics
+
+# Runs one chunk of a Monte Carlo campaign with its own seed and returns its error statistics and its profile
+# (None if profiling is disabled)
+def SimulateChunk(Chunk):
+    index, runs, seed = Chunk
+    SimScheduler.SeedRandomNumberGenerators(seed)
+    if profiler is not None:
+        profiler.Reset()
+    statistics = Simulation(runs, Verbose=False)
+    return index, (statistics, None if profiler is None else profiler.Copy())
 
-    return EstimateCount, CumulativeErrorNoFilter, CumulativeError, CumulativeErrorQ8, CumulativeErrorQ16, CumulativeErrorQ24, CumulativeErrorEncrypted
+# Merges the (statistics, profile) results of two consecutive (sets of) chunks
+def MergeChunkResults(First, Second):
+    statistics, profile = First
+    otherStatistics, otherProfile = Second
+    if profile is None:
+        profile = otherProfile
+    elif otherProfile is not None:
+        profile.Merge(otherProfile)
+    return statistics.Merge(otherStatistics), profile
 
-# A wrapper for the simulation function that lets it run in parallel
-def ParallelSimulaton(PID, runs, globalEstCount, globalErrorNoFilter, globalErrorNoEnc, globalErrorQ8, globalErrorQ16, globalErrorQ24, globalErrorEnc):
-    # Run the simulation
-    EstimateCount, CumulativeErrorNoFilter, CumulativeError, CumulativeErrorQ8, CumulativeErrorQ16, CumulativeErrorQ24, CumulativeErrorEncrypted = Simulation(runs, PID=PID)
-    # Synchronize the output
-    with globalEstCount.get_lock():
-        globalEstCount.value += EstimateCount
-    with globalErrorNoFilter.get_lock():
-        globalErrorNoFilter.value += CumulativeErrorNoFilter
-    with globalErrorNoEnc.get_lock():
-        globalErrorNoEnc.value += CumulativeError
-    with globalErrorQ8.get_lock():
-        globalErrorQ8.value += CumulativeErrorQ8
-    with globalErrorQ16.get_lock():
-        globalErrorQ16.value += CumulativeErrorQ16
-    with globalErrorQ24.get_lock():
-        globalErrorQ24.value += CumulativeErrorQ24
-    with globalErrorEnc.get_lock():
-        globalErrorEnc.value += CumulativeErrorEncrypted
+# Reports the campaign's progress
+def PrintProgress(FinishedRuns, TotalRuns):
+    print("Finished", FinishedRuns, "of", TotalRuns, "runs (" + str(round(FinishedRuns / TotalRuns * 100, 2)) + "%)")
 
 if __name__ == '__main__':
-    # Check for parallelization
-    if PARAM.TRY_MULTIPROCESSING and mp.cpu_count() >= 4:
-        # Leave a couple cores for the system
-        parallelProcessCount = mp.cpu_count() - 2
-        # Split the total number of experiments equally between processes
-        experimentsPerProcess = PARAM.TOTAL_RUNS // parallelProcessCount
-        # Prepare output structures for the processes
-        syncEstimateCount, syncErrorNoFilter, syncErrorNoEnc, syncErrorEncrypted = mp.Value("i", 0), mp.Value("d", 0.0), mp.Value("d", 0.0), mp.Value("d", 0.0)
-        syncErrorQ8, syncErrorQ16, syncErrorQ24 = mp.Value("d", 0.0), mp.Value("d", 0.0), mp.Value("d", 0.0)
-        # Create the process objects
-        processes = [mp.Process(target=ParallelSimulaton, args=(p, experimentsPerProcess, syncEstimateCount, syncErrorNoFilter, syncErrorNoEnc, syncErrorQ8, syncErrorQ16, syncErrorQ24, syncErrorEncrypted)) for p in range(parallelProcessCount)]
-        
-        # Run all processes in parallel
-        [p.start() for p in processes]
-        [p.join() for p in processes]
-        
-        # Finally, format the output
-        EstimateCount = int(syncEstimateCount.value)
-        RMSEwoFilter = sqrt(float(syncErrorNoFilter.value) / EstimateCount)
-        RMSEwoEncrypt = sqrt(float(syncErrorNoEnc.value) / EstimateCount)
-        RMSEwQuant8bit = sqrt(float(syncErrorQ8.value) / EstimateCount)
-        RMSEwQuant16bit = sqrt(float(syncErrorQ16.value) / EstimateCount)
-        RMSEwQuant24bit = sqrt(float(syncErrorQ24.value) / EstimateCount)
-        RMSEwEncryption = sqrt(float(syncErrorEncrypted.value) / EstimateCount)
-    else:
-        EstimateCount, CumulativeErrorNoFilter, CumulativeError, CumulativeErrorQ8, CumulativeErrorQ16, CumulativeErrorQ24, CumulativeErrorEncrypted = Simulation(PARAM.TOTAL_RUNS)
-        RMSEwoFilter = sqrt(CumulativeErrorNoFilter / EstimateCount)
-        RMSEwoEncrypt = sqrt(CumulativeError / EstimateCount)
-        RMSEwQuant8bit = sqrt(CumulativeErrorQ8 / EstimateCount)
-        RMSEwQuant16bit = sqrt(CumulativeErrorQ16 / EstimateCount)
-        RMSEwQuant24bit = sqrt(CumulativeErrorQ24 / EstimateCount)
-        RMSEwEncryption = sqrt(CumulativeErrorEncrypted / EstimateCount)
+    # Generate (or load) the key pair once up front, so that all worker processes just load it from the key store
+    if not PARAM.DO_NOT_ENCRYPT:
+        SimController.GetKeyPair()
+    
+    # Split the campaign into small chunks that are handed out to all cores on demand (or run here one by one)
+    processCount = mp.cpu_count() if PARAM.TRY_MULTIPROCESSING else 1
+    scheduler = SimScheduler(PARAM.TOTAL_RUNS, PARAM.RUNS_PER_CHUNK, PARAM.RANDOM_SEED)
+    # The checkpoint merges the statistics in chunk order and, if enabled, lets a restarted campaign skip the finished chunks
+    fingerprint = PARAM.GetFingerprint()
+    checkpoint = SimCheckpoint(SimCheckpoint.GetFileName(PARAM.CHECKPOINT_DIRECTORY, fingerprint), fingerprint, scheduler.Chunks, MergeChunkResults)
+    if checkpoint.GetFinishedRuns() > 0:
+        print("Resuming from", checkpoint.FileName, "with", checkpoint.GetFinishedRuns(), "of", PARAM.TOTAL_RUNS, "runs finished")
+    statistics, profile = scheduler.Run(SimulateChunk, InitializeWorker, processCount, OnChunkDone=PrintProgress, Checkpoint=checkpoint)
+    
+    # Format the output
+    K = PARAM.CONSENSUS_ROUND_COUNT
+    EstimateCount = statistics.GetSampleCount("Plain", K)
+    RMSEwoFilter, _, _ = statistics.GetRootMeanSquaredError("Plain", 0)
+    RMSEwoEncrypt, _, _ = statistics.GetRootMeanSquaredError("Plain", K)
+    RMSEwQuant8bit, _, _ = statistics.GetRootMeanSquaredError("Q08", K)
+    RMSEwQuant16bit, _, _ = statistics.GetRootMeanSquaredError("Q16", K)
+    RMSEwQuant24bit, _, _ = statistics.GetRootMeanSquaredError("Q24", K)
+    RMSEwEncryption, _, _ = statistics.GetRootMeanSquaredError("Encrypted", K)
+    RMSEwEncryptionQ8, _, _ = statistics.GetRootMeanSquaredError("EncryptedQ08", K)
+    RMSEwEncryptionQ24, _, _ = statistics.GetRootMeanSquaredError("EncryptedQ24", K)
 
     print("total estimates evaluated:", EstimateCount)
     print("gossip round count:", PARAM.CONSENSUS_ROUND_COUNT)
     print("RMSE w/o  encryption:        ", RMSEwoEncrypt)
     if not PARAM.DO_NOT_ENCRYPT:
         print("RMSE w/   encryption:        ", RMSEwEncryption)
+        if PARAM.PACK_QUANTIZED_ESTIMATES:
+            print("RMSE w/   8-bit encryption:  ", RMSEwEncryptionQ8)
+            print("RMSE w/  24-bit encryption:  ", RMSEwEncryptionQ24)
     print("RMSE w/   8-bit quantization:", RMSEwQuant8bit)
     print("RMSE w/  16-bit quantization:", RMSEwQuant16bit)
     print("RMSE w/  24-bit quantization:", RMSEwQuant24bit)
@@ -126,4 +134,18 @@ if __name__ == '__main__':
         print("precision loss due to quantization:", RMSEwQuant16bit - RMSEwoEncrypt)
     else:
         print("precision gain w/ enc. filtering:         ", RMSEwoFilter/RMSEwEncryption, "times")
-        print("precision loss due to encryption:", RMSEwEncryption - RMSEwoEncrypt)
\ No newline at end of file
+        print("precision loss due to encryption:", RMSEwEncryption - RMSEwoEncrypt)
+    
+    # The 95% confidence intervals of all RMSEs, and their progression over the rounds if they were tracked
+    print("95% confidence intervals of the RMSE (unfiltered / after", K, "rounds):")
+    for estimator in SimErrorStatistics.ESTIMATORS:
+        if statistics.GetSampleCount(estimator, K) > 0:
+            print("  %-13s [%f, %f] / [%f, %f]" % ((estimator,) + statistics.GetRootMeanSquaredError(estimator, 0)[1:] + statistics.GetRootMeanSquaredError(estimator, K)[1:]))
+    if PARAM.TRACK_ERRORS_PER_ROUND:
+        print("RMSE w/o encryption per round:", [round(statistics.GetRootMeanSquaredError("Plain", r)[0], 6) for r in range(K + 1)])
+    
+    # Where the time went, summed over all chunks (and workers)
+    if profile is not None:
+        print("time per phase and operation counts:")
+        for line in profile.GetReport():
+            print(line)
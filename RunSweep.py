@@ -0,0 +1,59 @@
+'''
+Created on 18.10.2026
+'''
+import multiprocessing as mp
+import os
+import RunSimulation
+from simulation import SimController, SimParameterSweep, SimParameters as PARAM
+
+# The parameter values to sweep over (every combination is one point); all other settings are taken from SimParameters
+PARAMETER_GRID = {
+    "SENSOR_GRID_DIMENSIONS": [(4, 4), (8, 8)],
+    "OWN_ESTIMATE_WEIGHT": [0.1, 0.2, 0.3],
+    "WEIGHT_BIT_PRECISION": [5, 7],
+}
+
+# Where the results of all points are cached under the fingerprints of their settings
+RESULT_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".sweeps")
+
+# The settings every worker process starts from, and its simulation objects by configuration (built once per worker)
+baseSettings, configurations = None, {}
+
+def InitializeSweepWorker(BaseSettings):
+    global baseSettings
+    baseSettings = BaseSettings
+
+# Applies the parameters, reuses (or builds) the system, the grid with its topology and quantized weights,
+# and the controller with its key pair for this configuration, and simulates the chunk
+def SimulateSweepChunk(Parameters, Chunk):
+    SimParameterSweep.ApplyParameterSet(baseSettings, Parameters)
+    fingerprint = PARAM.GetFingerprint()
+    if fingerprint not in configurations:
+        RunSimulation.InitializeWorker()
+        configurations[fingerprint] = (RunSimulation.system, RunSimulation.grid, RunSimulation.controller, RunSimulation.batchedSimulator)
+    RunSimulation.system, RunSimulation.grid, RunSimulation.controller, RunSimulation.batchedSimulator = configurations[fingerprint]
+    return RunSimulation.SimulateChunk(Chunk)
+
+# Generates (or loads) the key pair of a point once up front, so that all worker processes just load it from the key store
+def PrepareCampaign():
+    if not PARAM.DO_NOT_ENCRYPT:
+        SimController.GetKeyPair()
+
+# Reports the RMSEs of a point with their 95% confidence intervals, and its profile if profiling is enabled
+def PrintCampaign(Parameters, Result):
+    Statistics, profile = Result
+    K = PARAM.CONSENSUS_ROUND_COUNT
+    print(Parameters, "(%d rounds):" % K)
+    for estimator, r in (("Plain", 0), ("Plain", K), ("Q16", K), ("Encrypted", K)):
+        if Statistics.GetSampleCount(estimator, r) > 0:
+            print("  RMSE %-9s after %2d rounds: %f [%f, %f]" % ((estimator, r) + Statistics.GetRootMeanSquaredError(estimator, r)))
+    if profile is not None:
+        for line in profile.GetReport():
+            print(" ", line)
+
+if __name__ == '__main__':
+    processCount = mp.cpu_count() if PARAM.TRY_MULTIPROCESSING else 1
+    sweep = SimParameterSweep(PARAMETER_GRID, RESULT_DIRECTORY)
+    print("Sweeping", len(sweep.ParameterSets), "points with", PARAM.TOTAL_RUNS, "runs each")
+    sweep.Run(SimulateSweepChunk, InitializeSweepWorker, processCount, PrepareCampaign=PrepareCampaign, OnCampaignDone=PrintCampaign,
+              Merge=RunSimulation.MergeChunkResults)
@@ -0,0 +1,152 @@
+'''
+Created on 18.10.2026
+'''
+import json
+import os
+import platform
+import tempfile
+import time
+import timeit as ti
+import random
+from random import getrandbits, randint
+import numpy as np
+from encryption import Paillier
+from simulation import SimSystem, SimGrid, SimVectorizedGrid, SimController, SimParameters as PARAM
+from utility import next_prime
+
+# Returns the best average time per call of a function over several rounds (in seconds), which is less sensitive
+# to other load on the machine than a single average
+def BestTimePerCall(Function, Repetitions, Rounds = 5):
+    return min(ti.repeat(Function, number = Repetitions, repeat = Rounds)) / Repetitions
+
+# The metadata that describes what was measured (rather than where), which has to match for timings to be comparable
+CONFIGURATION_METADATA = ("plaintextModulusBitSize", "gridDimensions", "settingsFingerprint")
+
+# Runs BenchmarkPrimitivesForKeyLength for every key length; the keys, plaintexts, and prime search starts are drawn
+# from a fixed seed, so that the timings of different runs can be compared with each other
+def BenchmarkPrimitives(KeyLengths = (256, 512, 1024, 2048), Repetitions = 20, KeyGenRepetitions = 2, Seed = 2018):
+    result, previousState = {}, random.getstate()
+    random.seed(Seed)
+    try:
+        for keyLength in KeyLengths:
+            result.update(BenchmarkPrimitivesForKeyLength(keyLength, Repetitions, KeyGenRepetitions))
+    finally:
+        random.setstate(previousState)
+    return result
+
+# Times key generation, encryption, decryption (via CRT), addition, multiplication by a positive, a negative, and a zero
+# factor, and the search for a prime of half the key length; returns {name: seconds per call}
+def BenchmarkPrimitivesForKeyLength(KeyLength, Repetitions, KeyGenRepetitions):
+    result = {}
+    result["paillier.keygen/%d" % KeyLength] = BestTimePerCall(lambda: Paillier.KeyGen(KeyLength, KeepFactorization = True, SimpleGenerator = True),
+                                                               KeyGenRepetitions)
+    pk, sk = Paillier.KeyGen(KeyLength, KeepFactorization = True, SimpleGenerator = True)
+    m1, m2, factor = randint(-2 ** 32, 2 ** 32), randint(-2 ** 32, 2 ** 32), randint(1, 2 ** 8)
+    c1, c2 = Paillier.Encrypt(pk, m1), Paillier.Encrypt(pk, m2)
+    if Paillier.Decrypt(sk, Paillier.Add(pk, c1, Paillier.Mult(pk, c2, -factor))) != m1 - factor * m2:
+        raise ArithmeticError('homomorphic operations do not match the plaintext result', KeyLength)
+    result["paillier.encrypt/%d" % KeyLength] = BestTimePerCall(lambda: Paillier.Encrypt(pk, m1), Repetitions)
+    result["paillier.decrypt/%d" % KeyLength] = BestTimePerCall(lambda: Paillier.Decrypt(sk, c1), Repetitions)
+    result["paillier.add/%d" % KeyLength] = BestTimePerCall(lambda: Paillier.Add(pk, c1, c2), Repetitions * 100)
+    result["paillier.mult.positive/%d" % KeyLength] = BestTimePerCall(lambda: Paillier.Mult(pk, c1, factor), Repetitions)
+    result["paillier.mult.negative/%d" % KeyLength] = BestTimePerCall(lambda: Paillier.Mult(pk, c1, -factor), Repetitions)
+    result["paillier.mult.zero/%d" % KeyLength] = BestTimePerCall(lambda: Paillier.Mult(pk, c1, 0), Repetitions)
+    starts = [getrandbits(KeyLength // 2) | (1 << (KeyLength // 2 - 1)) for _ in range(Repetitions)]
+    result["primes.next_prime/%d" % (KeyLength // 2)] = sum(BestTimePerCall(lambda: next_prime(s), 1) for s in starts) / len(starts)
+    return result
+
+# Sets up a system, a grid of the specified type and size, and a controller (which distributes the key pair),
+# and takes one set of measurements
+def SetUpGrid(GridType, GridSize):
+    system = SimSystem(PARAM.SYSTEM_INITIAL_STATE, PARAM.SYSTEM_RANDOM_WALK_SIGMA)
+    grid = GridType(GridSize)
+    SimController(system, grid)
+    grid.TakeAllMeasurements(system.CurrentPos)
+    return grid
+
+# Times ExecuteConsensusRound for the object and the vectorized grid of every size, with and without encryption,
+# for the key length configured in SimParameters; returns {name: seconds per round}
+def BenchmarkConsensusRounds(GridSizes = ((4, 4), (8, 8), (16, 16)), RoundCount = 5):
+    result, previousSetting = {}, PARAM.DO_NOT_ENCRYPT
+    RoundCount = min(RoundCount, PARAM.CONSENSUS_ROUND_COUNT)
+    try:
+        for encrypted in (False, True):
+            PARAM.DO_NOT_ENCRYPT = not encrypted
+            for gridType, gridName in ((SimGrid, "object"), (SimVectorizedGrid, "vectorized")):
+                for gridSize in GridSizes:
+                    # Time several fresh grids, since the vectorized one only supports the configured number of rounds per measurement
+                    times = []
+                    for _ in range(3):
+                        grid = SetUpGrid(gridType, gridSize)
+                        times.append(ti.timeit(grid.ExecuteConsensusRound, number = RoundCount) / RoundCount)
+                    result["round.%s.%s/%dx%d" % (gridName, "encrypted" if encrypted else "plaintext", gridSize[0], gridSize[1])] = min(times)
+    finally:
+        PARAM.DO_NOT_ENCRYPT = previousSetting
+    return result
+
+# Times RunSimulation.Simulation per run (for the settings in SimParameters), with and without encryption, as the best
+# of several rounds; returns {name: seconds per run}
+def BenchmarkSimulation(Runs = 1, Rounds = 3):
+    import RunSimulation
+    result, previousSetting = {}, PARAM.DO_NOT_ENCRYPT
+    try:
+        for encrypted in (False, True):
+            PARAM.DO_NOT_ENCRYPT = not encrypted
+            RunSimulation.InitializeWorker()
+            result["simulation.%s/run" % ("encrypted" if encrypted else "plaintext")] = BestTimePerCall(
+                lambda: RunSimulation.Simulation(Runs, Verbose = False), 1, Rounds = Rounds) / Runs
+    finally:
+        PARAM.DO_NOT_ENCRYPT = previousSetting
+    return result
+
+# Runs all three parts of the suite and returns the timings together with a description of the environment
+def RunBenchmarkSuite(Primitives = True, ConsensusRounds = True, Simulation = True):
+    results = {}
+    if Primitives:
+        results.update(BenchmarkPrimitives())
+    if ConsensusRounds:
+        results.update(BenchmarkConsensusRounds())
+    if Simulation:
+        results.update(BenchmarkSimulation())
+    metadata = {"date": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": platform.python_version(), "numpy": np.__version__,
+                "platform": platform.platform(), "processor": platform.processor(), "cpuCount": os.cpu_count(),
+                "plaintextModulusBitSize": PARAM.PLAINTEXT_MODULUS_BIT_SIZE, "gridDimensions": list(PARAM.SENSOR_GRID_DIMENSIONS),
+                "settingsFingerprint": PARAM.GetFingerprint()}
+    return {"metadata": metadata, "results": results}
+
+def SaveBenchmarkResults(Results, FileName):
+    directory = os.path.dirname(os.path.abspath(FileName))
+    os.makedirs(directory, exist_ok = True)
+    # Write to a temporary file first and then move it into place in one step
+    fileDescriptor, temporaryFileName = tempfile.mkstemp(dir = directory, suffix = ".tmp")
+    try:
+        with os.fdopen(fileDescriptor, "w") as resultFile:
+            json.dump(Results, resultFile, indent = 2, sort_keys = True)
+        os.replace(temporaryFileName, FileName)
+    except BaseException:
+        os.remove(temporaryFileName)
+        raise
+
+def LoadBenchmarkResults(FileName):
+    with open(FileName, "r") as resultFile:
+        return json.load(resultFile)
+
+# Returns {key: (baseline, current)} for all metadata that differs between the results and a baseline (except the date)
+def GetMetadataDifferences(Results, Baseline):
+    keys = (set(Results["metadata"]) | set(Baseline["metadata"])) - {"date"}
+    return {key: (Baseline["metadata"].get(key), Results["metadata"].get(key)) for key in sorted(keys)
+            if Baseline["metadata"].get(key) != Results["metadata"].get(key)}
+
+# Compares the timings with those of a baseline and returns (name, baseline, current, ratio, regressed) tuples for all
+# timings present in both, where a timing regressed if it is more than Tolerance (relative) slower than the baseline;
+# refuses to compare with a baseline that measured a different configuration
+def CompareBenchmarkResults(Results, Baseline, Tolerance = 0.25):
+    differences = {key: values for key, values in GetMetadataDifferences(Results, Baseline).items() if key in CONFIGURATION_METADATA}
+    if differences:
+        raise ValueError('the baseline was measured with a different configuration', differences)
+    comparison = []
+    for name in sorted(set(Results["results"]) & set(Baseline["results"])):
+        current, baseline = Results["results"][name], Baseline["results"][name]
+        ratio = current / baseline if baseline > 0 else float("inf")
+        comparison.append((name, baseline, current, ratio, ratio > 1 + Tolerance))
+    return comparison
@@ -0,0 +1,138 @@
+'''
+Created on 18.10.2026
+'''
+import timeit as ti
+from random import randint
+from encryption import Paillier, DamgardJurik, RandomnessPool
+from utility import ModularIntegerInverse, BatchModularIntegerInverse
+
+# A fixed 192-bit example key (the controller's former hard-wired key), so that the benchmarks do not depend on the key store
+EXAMPLE_PRIMES = (282174488599599500573849980909, 362736035870515331128527330659)
+
+# Returns the average time per call of a function (in seconds)
+def TimePerCall(Function, Repetitions):
+    return ti.timeit(Function, number = Repetitions) / Repetitions
+
+# Returns a set of plaintexts covering zero, small values, and both ends of the plaintext range
+def GetTestPlaintexts(n, RandomCount = 100):
+    bound = n // 2 - 1
+    return [0, 1, -1, 2 ** 16, -2 ** 16, bound, -bound] + [randint(-bound, bound) for _ in range(RandomCount)]
+
+# Compares regular decryption against CRT decryption, after verifying that both yield the same plaintexts
+def BenchmarkDecryption(Repetitions = 1000):
+    pk, skCRT = Paillier.KeyGenFromPrimes(*EXAMPLE_PRIMES, KeepFactorization = True)
+    sk = skCRT[:3] # The same key without its factorization, as a plain (l, mu, n) tuple
+    for m in GetTestPlaintexts(pk[0]):
+        c = Paillier.Encrypt(pk, m)
+        if Paillier.Decrypt(sk, c) != m or Paillier.Decrypt(skCRT, c) != m:
+            raise ArithmeticError('regular and CRT decryption disagree', m)
+    c = Paillier.Encrypt(pk, randint(0, pk[0] // 2))
+    regular = TimePerCall(lambda: Paillier.Decrypt(sk, c), Repetitions)
+    crt = TimePerCall(lambda: Paillier.Decrypt(skCRT, c), Repetitions)
+    return {"regular": regular, "crt": crt, "speedup": regular / crt}
+
+# Compares encryption with a random generator against encryption with g = n + 1, after verifying both round-trip
+def BenchmarkEncryption(Repetitions = 1000):
+    pk, sk = Paillier.KeyGenFromPrimes(*EXAMPLE_PRIMES)
+    pkSimple, skSimple = Paillier.KeyGenFromPrimes(*EXAMPLE_PRIMES, SimpleGenerator = True)
+    for m in GetTestPlaintexts(pk[0]):
+        if Paillier.Decrypt(sk, Paillier.Encrypt(pk, m)) != m or Paillier.Decrypt(skSimple, Paillier.Encrypt(pkSimple, m)) != m:
+            raise ArithmeticError('encryption does not round-trip', m)
+    m = randint(0, pk[0] // 2)
+    regular = TimePerCall(lambda: Paillier.Encrypt(pk, m), Repetitions)
+    simple = TimePerCall(lambda: Paillier.Encrypt(pkSimple, m), Repetitions)
+    return {"regular": regular, "simple": simple, "speedup": regular / simple}
+
+# Compares encryption with and without a warm randomness pool (the pool is filled up front and not refilled while timing)
+def BenchmarkRandomnessPool(Repetitions = 1000):
+    pk, sk = Paillier.KeyGenFromPrimes(*EXAMPLE_PRIMES, SimpleGenerator = True)
+    m = randint(0, pk[0] // 2)
+    regular = TimePerCall(lambda: Paillier.Encrypt(pk, m), Repetitions)
+    pool = RandomnessPool(HighWaterMark = Repetitions + 1, LowWaterMark = 0)
+    pool.Fill(pk)
+    previousPool = Paillier.NoisePool
+    Paillier.SetRandomnessPool(pool)
+    try:
+        pooled = TimePerCall(lambda: Paillier.Encrypt(pk, m), Repetitions)
+        if Paillier.Decrypt(sk, Paillier.Encrypt(pk, m)) != m:
+            raise ArithmeticError('pooled encryption does not round-trip', m)
+    finally:
+        Paillier.SetRandomnessPool(previousPool)
+    return {"regular": regular, "pooled": pooled, "speedup": regular / pooled, "statistics": pool.GetStatistics()}
+
+# Compares regular encryption against encryption with short-exponent fixed-base randomness (both with g = n + 1)
+def BenchmarkShortExponentRandomness(Repetitions = 1000, ExponentBitSize = 128, WindowBitSize = 8):
+    pk, sk = Paillier.KeyGenFromPrimes(*EXAMPLE_PRIMES, SimpleGenerator = True)
+    m = randint(0, pk[0] // 2)
+    regular = TimePerCall(lambda: Paillier.Encrypt(pk, m), Repetitions)
+    previousSettings = Paillier.SHORT_EXPONENT_RANDOMNESS, Paillier.SHORT_EXPONENT_BIT_SIZE, Paillier.FIXED_BASE_WINDOW_BIT_SIZE
+    Paillier.SetShortExponentRandomness(True, ExponentBitSize, WindowBitSize)
+    try:
+        tableSetup = TimePerCall(lambda: Paillier.GetFixedBaseTable(pk), 1)
+        shortExponent = TimePerCall(lambda: Paillier.Encrypt(pk, m), Repetitions)
+        for m in GetTestPlaintexts(pk[0]):
+            if Paillier.Decrypt(sk, Paillier.Encrypt(pk, m)) != m:
+                raise ArithmeticError('short-exponent encryption does not round-trip', m)
+    finally:
+        Paillier.SetShortExponentRandomness(*previousSettings)
+    return {"regular": regular, "shortExponent": shortExponent, "tableSetup": tableSetup, "speedup": regular / shortExponent}
+
+# Compares an inner sensor's encrypted fusion step (with its quantized weights) done with Mult and Add against a single WeightedSum
+def BenchmarkWeightedSum(Repetitions = 1000, Weights = (24, 13, 13, 13, 13, 13, 13, 13, 13)):
+    pk, sk = Paillier.KeyGenFromPrimes(*EXAMPLE_PRIMES, SimpleGenerator = True)
+    plaintexts = [randint(-2 ** 32, 2 ** 32) for _ in Weights]
+    ciphertexts = [Paillier.Encrypt(pk, m) for m in plaintexts]
+    def MultAndAdd():
+        result = Paillier.Mult(pk, ciphertexts[0], Weights[0])
+        for c, w in zip(ciphertexts[1:], Weights[1:]):
+            result = Paillier.Add(pk, result, Paillier.Mult(pk, c, w))
+        return result
+    expected = sum(m * w for m, w in zip(plaintexts, Weights))
+    if Paillier.Decrypt(sk, MultAndAdd()) != expected or Paillier.Decrypt(sk, Paillier.WeightedSum(pk, ciphertexts, Weights)) != expected:
+        raise ArithmeticError('weighted sum does not match the plaintext result')
+    regular = TimePerCall(MultAndAdd, Repetitions)
+    weightedSum = TimePerCall(lambda: Paillier.WeightedSum(pk, ciphertexts, Weights), Repetitions)
+    return {"regular": regular, "weightedSum": weightedSum, "speedup": regular / weightedSum}
+
+# The former recursive extended Euclidean algorithm, kept as the baseline for BenchmarkModularInverse
+def RecursiveExtendedIntegerEuclidean(a, b):
+    a, b = int(round(a)), int(round(b))
+    if a == 0:
+        return (b, 0, 1)
+    g, x, y = RecursiveExtendedIntegerEuclidean(b % a, a)
+    return (g, y - (b // a) * x, x)
+
+# Compares inverting ciphertexts modulo n^2 (as Paillier.Sub does) via the recursive extended Euclidean algorithm,
+# via ModularIntegerInverse, and via BatchModularIntegerInverse (per value), after verifying that all of them agree
+def BenchmarkModularInverse(Repetitions = 1000, BatchSize = 64):
+    pk, sk = Paillier.KeyGenFromPrimes(*EXAMPLE_PRIMES, SimpleGenerator = True)
+    ciphertexts = [Paillier.Encrypt(pk, randint(0, pk.n // 2)) for _ in range(BatchSize)]
+    def RecursiveInverse(c):
+        _, x, _ = RecursiveExtendedIntegerEuclidean(c, pk.nSquared)
+        return x % pk.nSquared
+    expected = [RecursiveInverse(c) for c in ciphertexts]
+    if [ModularIntegerInverse(c, pk.nSquared) for c in ciphertexts] != expected or BatchModularIntegerInverse(ciphertexts, pk.nSquared) != expected:
+        raise ArithmeticError('modular inverses disagree')
+    recursive = TimePerCall(lambda: RecursiveInverse(ciphertexts[0]), Repetitions)
+    builtIn = TimePerCall(lambda: ModularIntegerInverse(ciphertexts[0], pk.nSquared), Repetitions)
+    batch = TimePerCall(lambda: BatchModularIntegerInverse(ciphertexts, pk.nSquared), max(1, Repetitions // BatchSize)) / BatchSize
+    return {"recursive": recursive, "builtIn": builtIn, "batch": batch, "speedup": recursive / builtIn, "batchSpeedup": recursive / batch}
+
+# Compares Damgard-Jurik for several exponents s at the same modulus (i.e., at the same security level): how many consensus
+# rounds fit into a plaintext, and what encryption, one sensor's fusion step (as in BenchmarkWeightedSum), and decryption cost;
+# the cost per round spreads one encryption and one decryption over all rounds of a time step
+def BenchmarkDamgardJurik(Repetitions = 200, Exponents = (1, 2, 3), MeasurementBitSize = 32, WeightBitSize = 8, Weights = (24, 13, 13, 13, 13, 13, 13, 13, 13)):
+    result = {}
+    for s in Exponents:
+        pk, sk = DamgardJurik.KeyGenFromPrimes(*EXAMPLE_PRIMES, s)
+        rounds = (pk.n.bit_length() * s - MeasurementBitSize) // WeightBitSize
+        plaintexts = [randint(-2 ** MeasurementBitSize, 2 ** MeasurementBitSize) for _ in Weights]
+        ciphertexts = [DamgardJurik.Encrypt(pk, m) for m in plaintexts]
+        if DamgardJurik.Decrypt(sk, DamgardJurik.WeightedSum(pk, ciphertexts, Weights)) != sum(m * w for m, w in zip(plaintexts, Weights)):
+            raise ArithmeticError('Damgard-Jurik weighted sum does not match the plaintext result', s)
+        encryption = TimePerCall(lambda: DamgardJurik.Encrypt(pk, plaintexts[0]), Repetitions)
+        fusion = TimePerCall(lambda: DamgardJurik.WeightedSum(pk, ciphertexts, Weights), Repetitions)
+        decryption = TimePerCall(lambda: DamgardJurik.Decrypt(sk, ciphertexts[0]), Repetitions)
+        result[s] = {"rounds": rounds, "encryption": encryption, "fusion": fusion, "decryption": decryption,
+                     "perRound": (encryption + rounds * fusion + decryption) / rounds}
+    return result
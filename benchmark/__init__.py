@@ -0,0 +1,2 @@
+from benchmark.CryptoBenchmarks import BenchmarkDecryption, BenchmarkEncryption, BenchmarkRandomnessPool, BenchmarkShortExponentRandomness, BenchmarkWeightedSum, BenchmarkModularInverse, BenchmarkDamgardJurik
+from benchmark.BenchmarkSuite import BenchmarkPrimitives, BenchmarkConsensusRounds, BenchmarkSimulation, RunBenchmarkSuite, SaveBenchmarkResults, LoadBenchmarkResults, GetMetadataDifferences, CompareBenchmarkResults
@@ -0,0 +1,163 @@
+'''
+Created on 18.10.2026
+'''
+from math import comb
+from random import randint
+from encryption.Paillier import PaillierCryptosystem
+from encryption.DamgardJurikKeys import PublicKey, PrivateKey
+from utility import lcm, ModularIntegerInverse
+
+class DamgardJurikCryptosystem(object):
+    '''
+    The Damgard-Jurik generalization of the Paillier cryptosystem (with g = n + 1): for a modulus n of the same size,
+    plaintexts live modulo n^s instead of n, at the cost of ciphertexts modulo n^(s + 1) instead of n^2.
+    It offers the same interface as PaillierCryptosystem; for s = 1, it is the Paillier cryptosystem with g = n + 1.
+    All operations accept PublicKey/PrivateKey objects as well as plain (n, s) and (l, mu, n, s) tuples.
+    '''
+
+    # The key classes, for code that has to convert keys of either cryptosystem
+    PublicKey = PublicKey
+    PrivateKey = PrivateKey
+
+    @staticmethod
+    def GetPlaintextModulus(pk):
+        return PublicKey.From(pk).PlaintextModulus
+
+    @staticmethod
+    def GetCiphertextModulus(pk):
+        return PublicKey.From(pk).CiphertextModulus
+
+    @staticmethod
+    def GetNoiseFactor(pk):
+        pk = PublicKey.From(pk)
+        r = randint(0, pk.n)
+        return pow(r, pk.PlaintextModulus, pk.CiphertextModulus)
+
+    @staticmethod
+    def KeyGen(KeyLength, s, ProcessCount = 1):
+        # The modulus is the same as Paillier's, so generate a Paillier key and keep its primes
+        _, sk = PaillierCryptosystem.KeyGen(KeyLength, KeepFactorization = True, SimpleGenerator = True, ProcessCount = ProcessCount)
+        return DamgardJurikCryptosystem.KeyGenFromPrimes(sk.p, sk.q, s)
+
+    @staticmethod
+    def KeyGenFromPrimes(p, q, s):
+        '''
+        Returns the key pair as PublicKey (n, s) and PrivateKey (l, mu, n, s).
+        '''
+        n = p * q
+        l = lcm(p - 1, q - 1)
+        # For g = n + 1, decrypting g^l yields l itself
+        mu = ModularIntegerInverse(l, n ** s)
+        return PublicKey(n, s), PrivateKey(l, mu, n, s)
+
+    @staticmethod
+    def PowerOfGenerator(pk, m):
+        '''
+        Returns (1 + n)^m mod n^(s + 1) via the binomial theorem, i.e., the sum of (m choose k) * n^k for k = 0, ..., s.
+        '''
+        result, powerOfN = 0, 1
+        for k in range(pk.s + 1):
+            result += comb(m, k) * powerOfN
+            powerOfN *= pk.n
+        return result % pk.CiphertextModulus
+
+    @staticmethod
+    def Encrypt(pk, m):
+        # Check the message for size
+        pk = PublicKey.From(pk)
+        # Handle negative plaintexts
+        assert(abs(m) < pk.HalfPlaintextModulus)
+        if m < 0:
+            m += pk.PlaintextModulus
+        return DamgardJurikCryptosystem.PowerOfGenerator(pk, m) * DamgardJurikCryptosystem.GetNoiseFactor(pk) % pk.CiphertextModulus
+
+    @staticmethod
+    def EncryptZeros(pk, Count = 1):
+        assert(Count > 0)
+        pk = PublicKey.From(pk)
+        return [DamgardJurikCryptosystem.Encrypt(pk, 0) for _ in range(Count)]
+
+    @staticmethod
+    def Decrypt(sk, c):
+        sk = PrivateKey.From(sk)
+        # Check the ciphertext for size
+        assert(c >= 0 and c < sk.CiphertextModulus)
+        # Raising to l removes the noise and leaves (1 + n)^(m * l)
+        a = pow(c, sk.l, sk.CiphertextModulus)
+        # Extract the exponent m * l mod n^s, one power of n at a time
+        i = 0
+        for j in range(1, sk.s + 1):
+            t1 = PaillierCryptosystem.L(a % sk.PowersOfN[j + 1], sk.n)
+            t2 = i
+            for k in range(2, j + 1):
+                i -= 1
+                t2 = t2 * i % sk.PowersOfN[j]
+                t1 = (t1 - t2 * sk.ExtractionConstants[(j, k)]) % sk.PowersOfN[j]
+            i = t1
+        result = i * sk.mu % sk.PlaintextModulus
+        # Handle negative plaintexts
+        if result > sk.HalfPlaintextModulus:
+            result -= sk.PlaintextModulus
+        return result
+
+    @staticmethod
+    def Add(pk, c1, c2):
+        return (c1 * c2) % PublicKey.From(pk).CiphertextModulus
+
+    @staticmethod
+    def Sub(pk, c1, c2):
+        pk = PublicKey.From(pk)
+        subtrahend = ModularIntegerInverse(c2, pk.CiphertextModulus)
+        return DamgardJurikCryptosystem.Add(pk, c1, subtrahend)
+
+    @staticmethod
+    def Mult(pk, EncryptedFactor, PlaintextFactor):
+        if PlaintextFactor == 0:
+            # Anything multiplied by zero is zero, so return a fresh zero encryption
+            return DamgardJurikCryptosystem.Encrypt(pk, 0)
+        else:
+            modulus = PublicKey.From(pk).CiphertextModulus
+            result = pow(EncryptedFactor, abs(PlaintextFactor), modulus)
+            # Invert result if the plaintext factor was negative
+            if PlaintextFactor < 0:
+                result = ModularIntegerInverse(result, modulus)
+            return result
+
+    @staticmethod
+    def WeightedSum(pk, Ciphertexts, PlaintextWeights):
+        '''
+        Returns an encryption of the weighted sum of the encrypted plaintexts (see PaillierCryptosystem.WeightedSum).
+        '''
+        pk = PublicKey.From(pk)
+        modulus = pk.CiphertextModulus
+        positiveTerms = [(c, w) for c, w in zip(Ciphertexts, PlaintextWeights) if w > 0]
+        negativeTerms = [(c, -w) for c, w in zip(Ciphertexts, PlaintextWeights) if w < 0]
+        if not positiveTerms and not negativeTerms:
+            # Anything multiplied by zero is zero, so return a fresh zero encryption
+            return DamgardJurikCryptosystem.Encrypt(pk, 0)
+        result = PaillierCryptosystem.MultiExponentiation(positiveTerms, modulus)
+        if negativeTerms:
+            subtrahend = ModularIntegerInverse(PaillierCryptosystem.MultiExponentiation(negativeTerms, modulus), modulus)
+            result = result * subtrahend % modulus
+        return result
+
+# Returns the cryptosystem that a key belongs to: key objects decide by their class, and plain tuples by their arity,
+# i.e., (l, mu, n) and (l, mu, n, p, q, hp, hq, qInv) are Paillier and (l, mu, n, s) Damgard-Jurik private keys;
+# a public (n, x) tuple is a Paillier key if x > n (as g = n + 1 and random generators modulo n^2 are) and a Damgard-Jurik
+# key if x is a plausible exponent s (n^s has s times the bits of n), and anything else is refused as ambiguous
+def GetCryptosystem(Key):
+    if isinstance(Key, (PublicKey, PrivateKey)):
+        return DamgardJurikCryptosystem
+    if isinstance(Key, (PaillierCryptosystem.PublicKey, PaillierCryptosystem.PrivateKey)):
+        return PaillierCryptosystem
+    if len(Key) in (3, 8):
+        return PaillierCryptosystem
+    if len(Key) == 4:
+        return DamgardJurikCryptosystem
+    if len(Key) == 2:
+        n, x = Key
+        if x > n:
+            return PaillierCryptosystem
+        if 1 <= x < n.bit_length():
+            return DamgardJurikCryptosystem
+    raise ValueError('the key belongs to neither the Paillier nor the Damgard-Jurik cryptosystem', Key)
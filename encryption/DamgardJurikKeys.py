@@ -0,0 +1,102 @@
+'''
+Created on 18.10.2026
+'''
+from math import factorial
+from utility import ModularIntegerInverse
+
+class PublicKey(object):
+    '''
+    A Damgard-Jurik public key (n, s) with the generator g = n + 1: plaintexts live modulo n^s and ciphertexts modulo n^(s + 1).
+    It behaves like the tuple (n, s) for code that indexes or unpacks keys.
+    '''
+    __slots__ = ("n", "s", "PlaintextModulus", "CiphertextModulus", "HalfPlaintextModulus")
+
+    def __init__(self, n, s):
+        '''
+        Constructor
+        '''
+        assert(s >= 1)
+        self.n, self.s = n, s
+        self.PlaintextModulus = n ** s
+        self.CiphertextModulus = self.PlaintextModulus * n
+        self.HalfPlaintextModulus = self.PlaintextModulus // 2
+
+    @staticmethod
+    def From(Key):
+        '''
+        Returns the key itself if it already is a PublicKey, or converts an (n, s) tuple.
+        '''
+        return Key if isinstance(Key, PublicKey) else PublicKey(*Key)
+
+    def AsTuple(self):
+        return (self.n, self.s)
+
+    def __getitem__(self, Index):
+        return self.AsTuple()[Index]
+
+    def __iter__(self):
+        return iter(self.AsTuple())
+
+    def __len__(self):
+        return 2
+
+    def __eq__(self, Other):
+        if isinstance(Other, (PublicKey, tuple)):
+            return self.AsTuple() == tuple(Other)
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.AsTuple())
+
+    def __repr__(self):
+        return "DamgardJurikPublicKey(n=%d, s=%d)" % (self.n, self.s)
+
+class PrivateKey(object):
+    '''
+    A Damgard-Jurik private key (l, mu, n, s) with mu = l^-1 mod n^s, and the constants that decryption needs precomputed:
+    the powers of n and, for every step j and term k of the extraction of the plaintext, n^(k - 1) / k! mod n^j.
+    It behaves like the tuple (l, mu, n, s).
+    '''
+    __slots__ = ("l", "mu", "n", "s", "PlaintextModulus", "CiphertextModulus", "HalfPlaintextModulus", "PowersOfN", "ExtractionConstants")
+
+    def __init__(self, l, mu, n, s):
+        '''
+        Constructor
+        '''
+        assert(s >= 1)
+        self.l, self.mu, self.n, self.s = l, mu, n, s
+        self.PowersOfN = [n ** j for j in range(s + 2)]
+        self.PlaintextModulus, self.CiphertextModulus = self.PowersOfN[s], self.PowersOfN[s + 1]
+        self.HalfPlaintextModulus = self.PlaintextModulus // 2
+        self.ExtractionConstants = {(j, k): self.PowersOfN[k - 1] * ModularIntegerInverse(factorial(k), self.PowersOfN[j]) % self.PowersOfN[j]
+                                    for j in range(2, s + 1) for k in range(2, j + 1)}
+
+    @staticmethod
+    def From(Key):
+        '''
+        Returns the key itself if it already is a PrivateKey, or converts an (l, mu, n, s) tuple.
+        '''
+        return Key if isinstance(Key, PrivateKey) else PrivateKey(*Key)
+
+    def AsTuple(self):
+        return (self.l, self.mu, self.n, self.s)
+
+    def __getitem__(self, Index):
+        return self.AsTuple()[Index]
+
+    def __iter__(self):
+        return iter(self.AsTuple())
+
+    def __len__(self):
+        return 4
+
+    def __eq__(self, Other):
+        if isinstance(Other, (PrivateKey, tuple)):
+            return self.AsTuple() == tuple(Other)
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.AsTuple())
+
+    def __repr__(self):
+        return "DamgardJurikPrivateKey(n=%d, s=%d)" % (self.n, self.s)
@@ -0,0 +1,38 @@
+'''
+Created on 18.10.2026
+'''
+
+class FixedBaseExponentiator(object):
+    '''
+    Raises a fixed base to exponents of a bounded bit size using a precomputed windowed table.
+    Row i of the table holds base^(j * 2^(i * w)) for all w-bit digits j, so every exponentiation
+    costs at most one modular multiplication per window and no squarings at all.
+    '''
+
+    def __init__(self, Base, Modulus, ExponentBitSize, WindowBitSize = 8):
+        '''
+        Constructor
+        '''
+        assert(ExponentBitSize > 0 and WindowBitSize > 0)
+        self.Base, self.Modulus = Base % Modulus, Modulus
+        self.ExponentBitSize, self.WindowBitSize = ExponentBitSize, WindowBitSize
+        self.WindowMask = (1 << WindowBitSize) - 1
+        # Precompute the table row by row
+        self.Table = []
+        windowBase = self.Base
+        for _ in range((ExponentBitSize + WindowBitSize - 1) // WindowBitSize):
+            row = [1] * (1 << WindowBitSize)
+            for j in range(1, 1 << WindowBitSize):
+                row[j] = row[j - 1] * windowBase % Modulus
+            self.Table.append(row)
+            windowBase = row[-1] * windowBase % Modulus
+    
+    def Pow(self, Exponent):
+        assert(Exponent >= 0 and Exponent.bit_length() <= self.ExponentBitSize)
+        result = 1
+        for row in self.Table:
+            digit = Exponent & self.WindowMask
+            if digit:
+                result = result * row[digit] % self.Modulus
+            Exponent >>= self.WindowBitSize
+        return result
\ No newline at end of file
@@ -0,0 +1,68 @@
+'''
+Created on 18.10.2026
+'''
+import json
+import os
+import tempfile
+from encryption.Paillier import PaillierCryptosystem as Paillier
+from encryption.PaillierKeys import PublicKey, PrivateKey
+
+class KeyStore(object):
+    '''
+    Generates Paillier key pairs of a given length once and keeps them, including the factorization and the precomputed
+    decryption constants, in JSON files in a cache directory, so that later runs and every worker process simply reload them.
+    Without a directory, the key pairs are only kept in memory. Every file is written atomically, so processes that generate
+    the same key pair at the same time never leave a broken file behind (the last one just wins).
+    '''
+
+    # Key pairs already loaded or generated by this process, by (directory, key length, generator type)
+    LoadedKeyPairs = {}
+
+    def __init__(self, Directory = None):
+        '''
+        Constructor
+        '''
+        self.Directory = Directory
+
+    def GetFileName(self, KeyLength, SimpleGenerator):
+        return os.path.join(self.Directory, "paillier-%d%s.json" % (KeyLength, "-simple" if SimpleGenerator else ""))
+
+    def GetKeyPair(self, KeyLength, KeepFactorization = False, SimpleGenerator = False):
+        '''
+        Returns a key pair of the specified length (see PaillierCryptosystem.KeyGen), generating and saving it if necessary.
+        '''
+        key = (self.Directory, KeyLength, SimpleGenerator)
+        if key not in KeyStore.LoadedKeyPairs:
+            keyPair = self.Load(KeyLength, SimpleGenerator) if self.Directory is not None else None
+            if keyPair is None:
+                keyPair = Paillier.KeyGen(KeyLength, KeepFactorization = True, SimpleGenerator = SimpleGenerator)
+                if self.Directory is not None:
+                    self.Save(KeyLength, SimpleGenerator, keyPair)
+            KeyStore.LoadedKeyPairs[key] = keyPair
+        pk, sk = KeyStore.LoadedKeyPairs[key]
+        return (pk, sk) if KeepFactorization else (pk, PrivateKey(sk.l, sk.mu, sk.n))
+
+    def Load(self, KeyLength, SimpleGenerator):
+        fileName = self.GetFileName(KeyLength, SimpleGenerator)
+        if not os.path.isfile(fileName):
+            return None
+        with open(fileName, "r") as keyFile:
+            contents = json.load(keyFile)
+        pk, sk = PublicKey(*contents["pk"]), PrivateKey(*contents["sk"])
+        # Do not trust a file that was meant for a different key (files without the requested length hold exact-size moduli)
+        if contents.get("KeyLength", pk.n.bit_length()) != KeyLength or pk.SimpleGenerator != SimpleGenerator or sk.n != pk.n:
+            raise ValueError('the cached key pair does not match the requested one', fileName)
+        return pk, sk
+
+    def Save(self, KeyLength, SimpleGenerator, KeyPair):
+        pk, sk = KeyPair
+        os.makedirs(self.Directory, exist_ok = True)
+        # Write to a temporary file first and then move it into place in one step
+        fileDescriptor, temporaryFileName = tempfile.mkstemp(dir = self.Directory, suffix = ".tmp")
+        try:
+            with os.fdopen(fileDescriptor, "w") as keyFile:
+                json.dump({"KeyLength": KeyLength, "pk": list(pk.AsTuple()), "sk": list(sk.AsTuple())}, keyFile)
+            os.replace(temporaryFileName, self.GetFileName(KeyLength, SimpleGenerator))
+        except BaseException:
+            os.remove(temporaryFileName)
+            raise
@@ -0,0 +1,65 @@
+'''
+Created on 18.10.2026
+'''
+from encryption.DamgardJurik import GetCryptosystem
+
+class SlotPacking(object):
+    '''
+    Packs several signed integers into disjoint bit slots of a single Paillier (or Damgard-Jurik) plaintext, so that a single homomorphic
+    addition or scalar multiplication updates all of them at once. Every slot is sized for the worst-case growth of its
+    value over a given number of consensus rounds, so that the slots never overflow into each other.
+    '''
+
+    def __init__(self, SlotCount, ValueBitSize, WeightBitSize, RoundCount):
+        '''
+        Constructor
+        '''
+        assert(SlotCount > 0)
+        self.SlotCount = SlotCount
+        self.ValueBitSize = ValueBitSize
+        self.SlotBitSize = SlotPacking.GetSlotBitSize(ValueBitSize, WeightBitSize, RoundCount)
+        self.SlotModulus = 1 << self.SlotBitSize
+        self.SlotBound = self.SlotModulus >> 1
+
+    @staticmethod
+    def GetSlotBitSize(ValueBitSize, WeightBitSize, RoundCount):
+        '''
+        Every consensus round multiplies a value with weights of at most WeightBitSize bits (which add up to less than
+        2^WeightBitSize), so it grows by at most WeightBitSize bits per round; one more bit holds the sign.
+        '''
+        return ValueBitSize + RoundCount * WeightBitSize + 1
+
+    def GetPlaintextBitSize(self):
+        # All slots, plus one bit for the plaintext's own sign
+        return self.SlotCount * self.SlotBitSize + 1
+
+    def CheckKey(self, pk):
+        plaintextModulus = GetCryptosystem(pk).GetPlaintextModulus(pk)
+        if plaintextModulus.bit_length() <= self.GetPlaintextBitSize():
+            raise ArithmeticError('the plaintext space is too small for the packed slots', plaintextModulus.bit_length(), self.GetPlaintextBitSize())
+
+    def Pack(self, Values):
+        assert(len(Values) == self.SlotCount)
+        result = 0
+        for i, v in enumerate(Values):
+            assert(abs(v) < (1 << self.ValueBitSize))
+            result += v << (i * self.SlotBitSize)
+        return result
+
+    def Unpack(self, Plaintext):
+        result = []
+        for _ in range(self.SlotCount):
+            # Take the lowest slot as a signed value and remove it (including any borrow it caused)
+            v = Plaintext & (self.SlotModulus - 1)
+            if v >= self.SlotBound:
+                v -= self.SlotModulus
+            result.append(v)
+            Plaintext = (Plaintext - v) >> self.SlotBitSize
+        assert(Plaintext == 0)
+        return result
+
+    def Encrypt(self, pk, Values):
+        return GetCryptosystem(pk).Encrypt(pk, self.Pack(Values))
+
+    def Decrypt(self, sk, c):
+        return self.Unpack(GetCryptosystem(sk).Decrypt(sk, c))
@@ -3,90 +3,222 @@ Created on 16.01.2018
 
 @author: Mikhail Aristov
 '''
-from random import randint
+import multiprocessing as mp
+from math import isqrt
+from random import randint, getrandbits
+from encryption.FixedBase import FixedBaseExponentiator
+from encryption.PaillierKeys import PublicKey, PrivateKey
 from utility import next_prime, gcd, lcm, ModularIntegerInverse
 
 class PaillierCryptosystem(object):
     '''
     This is the core implementation of the Paillier homomorphic cryptosystem.
+    All operations accept PublicKey/PrivateKey objects as well as plain (n, g) and (l, mu, n) tuples.
     '''
     
+    # The key classes, for code that has to convert keys of either cryptosystem (see DamgardJurik.GetCryptosystem)
+    PublicKey = PublicKey
+    PrivateKey = PrivateKey
+    
+    # An optional RandomnessPool that Encrypt draws precomputed noise factors r^n mod n^2 from
+    NoisePool = None
+    
+    # Short-exponent randomness: instead of r^n for a random r, the noise factor is h^a for a fixed public base
+    # h = x^n mod n^2 (chosen once per key) and a short random exponent a, computed with a cached fixed-base table.
+    # SECURITY NOTE: this is NOT covered by the standard Paillier security proof. It additionally assumes that
+    # h^a with a short a is indistinguishable from a random n-th residue (the short-exponent variant of the DCR
+    # assumption used in the literature), which requires SHORT_EXPONENT_BIT_SIZE of at least twice the targeted security level.
+    SHORT_EXPONENT_RANDOMNESS = False
+    SHORT_EXPONENT_BIT_SIZE = 128
+    FIXED_BASE_WINDOW_BIT_SIZE = 8
+    FixedBaseTables = {}
+    
+    @staticmethod
+    def SetRandomnessPool(Pool):
+        PaillierCryptosystem.NoisePool = Pool
+    
     @staticmethod
-    def GetRandomPrime(PrimeRange):
-        searchStart = PrimeRange - randint(PrimeRange // 2, PrimeRange)
-        return next_prime(searchStart)
+    def SetShortExponentRandomness(Enabled, ExponentBitSize = 128, WindowBitSize = 8):
+        PaillierCryptosystem.SHORT_EXPONENT_RANDOMNESS = Enabled
+        PaillierCryptosystem.SHORT_EXPONENT_BIT_SIZE = ExponentBitSize
+        PaillierCryptosystem.FIXED_BASE_WINDOW_BIT_SIZE = WindowBitSize
+    
+    @staticmethod
+    def GetFixedBaseTable(pk):
+        pk = PublicKey.From(pk)
+        table = PaillierCryptosystem.FixedBaseTables.get(pk.n)
+        # (Re)build the table if the key is new or the settings have changed
+        if table is None or table.ExponentBitSize != PaillierCryptosystem.SHORT_EXPONENT_BIT_SIZE or table.WindowBitSize != PaillierCryptosystem.FIXED_BASE_WINDOW_BIT_SIZE:
+            h = pow(randint(1, pk.n - 1), pk.n, pk.nSquared)
+            table = FixedBaseExponentiator(h, pk.nSquared, PaillierCryptosystem.SHORT_EXPONENT_BIT_SIZE, PaillierCryptosystem.FIXED_BASE_WINDOW_BIT_SIZE)
+            PaillierCryptosystem.FixedBaseTables[pk.n] = table
+        return table
+    
+    @staticmethod
+    def GetPlaintextModulus(pk):
+        return PublicKey.From(pk).n
+    
+    @staticmethod
+    def GetCiphertextModulus(pk):
+        return PublicKey.From(pk).nSquared
+    
+    @staticmethod
+    def GetNoiseFactor(pk):
+        pk = PublicKey.From(pk)
+        # Use a precomputed factor if there is one
+        if PaillierCryptosystem.NoisePool is not None:
+            result = PaillierCryptosystem.NoisePool.Draw(pk)
+            if result is not None:
+                return result
+        # Raise the fixed base to a short random exponent, if enabled
+        if PaillierCryptosystem.SHORT_EXPONENT_RANDOMNESS:
+            return PaillierCryptosystem.GetFixedBaseTable(pk).Pow(getrandbits(PaillierCryptosystem.SHORT_EXPONENT_BIT_SIZE))
+        return PaillierCryptosystem.GetFreshNoiseFactor(pk)
+    
+    @staticmethod
+    def GetFreshNoiseFactor(pk):
+        # Pick a random noise factor
+        r = randint(0, pk.n)
+        return pow(r, pk.n, pk.nSquared)
+    
+    @staticmethod
+    def GetPrimeSearchStart(PrimeBitSize):
+        # Start at or above sqrt(2) * 2^(b - 1), so that the product of two such primes of b1 and b2 bits has exactly b1 + b2 bits
+        return randint(isqrt(2 ** (2 * PrimeBitSize - 1)) + 1, 2 ** PrimeBitSize - 1)
+    
+    @staticmethod
+    def GetRandomPrime(PrimeBitSize):
+        # Draw again in the rare case that the next prime lies beyond PrimeBitSize bits
+        while True:
+            prime = next_prime(PaillierCryptosystem.GetPrimeSearchStart(PrimeBitSize))
+            if prime.bit_length() == PrimeBitSize:
+                return prime
     
     @staticmethod
     def L(x, n):
         return (x - 1) // n
     
     @staticmethod
-    def KeyGen(KeyLength):
-        # Pick two primes randomly
-        PrimeRange = 2 ** (KeyLength // 2) - 1
-        p, q = PaillierCryptosystem.GetRandomPrime(PrimeRange), PaillierCryptosystem.GetRandomPrime(PrimeRange)
+    def KeyGen(KeyLength, KeepFactorization = False, SimpleGenerator = False, ProcessCount = 1):
+        '''
+        Returns a key pair with a modulus of KeyLength bits (see KeyGenFromPrimes). If ProcessCount is above one,
+        p and q are searched for in two worker processes at once; their search starts are drawn here either way.
+        '''
+        # Pick two primes randomly (p gets the extra bit of an odd key length)
+        pBitSize, qBitSize = (KeyLength + 1) // 2, KeyLength // 2
+        searchStarts = [PaillierCryptosystem.GetPrimeSearchStart(b) for b in (pBitSize, qBitSize)]
+        if ProcessCount > 1:
+            with mp.Pool(min(ProcessCount, 2)) as pool:
+                p, q = pool.map(next_prime, searchStarts)
+        else:
+            p, q = [next_prime(s) for s in searchStarts]
+        # Draw again in the rare case that the next prime lies beyond its bit size
+        if p.bit_length() != pBitSize:
+            p = PaillierCryptosystem.GetRandomPrime(pBitSize)
+        if q.bit_length() != qBitSize:
+            q = PaillierCryptosystem.GetRandomPrime(qBitSize)
         # Ensure the that gcd(pq, (p - 1)(q - 1)) == 1
-        while gcd(p * q, (p - 1) * (q - 1)) != 1:
-            q = PaillierCryptosystem.GetRandomPrime(PrimeRange)
-        return PaillierCryptosystem.KeyGenFromPrimes(p, q)
+        while p == q or gcd(p * q, (p - 1) * (q - 1)) != 1:
+            q = PaillierCryptosystem.GetRandomPrime(qBitSize)
+        return PaillierCryptosystem.KeyGenFromPrimes(p, q, KeepFactorization, SimpleGenerator)
     
     @staticmethod
-    def KeyGenFromPrimes(p, q):
+    def KeyGenFromPrimes(p, q, KeepFactorization = False, SimpleGenerator = False):
+        '''
+        Returns the key pair as PublicKey (n, g) and PrivateKey (l, mu, n). If KeepFactorization is set, the private key
+        also holds p, q and their constants (l, mu, n, p, q, hp, hq, qInv), which lets Decrypt use the Chinese remainder theorem.
+        If SimpleGenerator is set, g = n + 1, which lets Encrypt compute g^m mod n^2 as 1 + m * n.
+        '''
         # Ensure the that gcd(pq, (p - 1)(q - 1)) == 1
         assert(gcd(p * q, (p - 1) * (q - 1)) == 1)
         # Compute additional values
         n = p * q
         nSquared = n * n
         l = lcm(p - 1, q - 1)
-        # Get a random integer generator
-        g = randint(0, nSquared)
-        # Ensure n divides the order of g
-        tmp = PaillierCryptosystem.L(pow(g, l, nSquared), n)
-        mu = ModularIntegerInverse(tmp, n)
+        if SimpleGenerator:
+            # For g = n + 1, L(g^l mod n^2) = l mod n
+            g = n + 1
+            mu = ModularIntegerInverse(l, n)
+        else:
+            # Get a random integer generator
+            g = randint(0, nSquared)
+            # Ensure n divides the order of g
+            tmp = PaillierCryptosystem.L(pow(g, l, nSquared), n)
+            mu = ModularIntegerInverse(tmp, n)
+        if KeepFactorization:
+            hp, hq = PaillierCryptosystem.H(g, p), PaillierCryptosystem.H(g, q)
+            return PublicKey(n, g), PrivateKey(l, mu, n, p, q, hp, hq, ModularIntegerInverse(q, p))
         # Return pk, sk
-        return (n, g), (l, mu, n)
+        return PublicKey(n, g), PrivateKey(l, mu, n)
+    
+    @staticmethod
+    def H(g, p):
+        '''
+        Returns the CRT decryption constant hp = L_p(g^(p - 1) mod p^2)^-1 mod p.
+        '''
+        pSquared = p * p
+        return ModularIntegerInverse(PaillierCryptosystem.L(pow(g % pSquared, p - 1, pSquared), p), p)
     
     @staticmethod
     def Encrypt(pk, m):
         # Check the message for size
-        n, g, nSquared = pk[0], pk[1], pk[0] * pk[0]
+        pk = PublicKey.From(pk)
         # Handle negative plaintexts
-        assert(abs(m) < (n // 2))
+        assert(abs(m) < pk.HalfN)
         if m < 0:
-            m += n
-        # Pick a random noise factor
-        r = randint(0, n)
-        # Compute ciphertext
-        tmp1 = pow(g, m, nSquared)
-        tmp2 = pow(r, n, nSquared)
+            m += pk.n
+        # Compute ciphertext (using the binomial theorem for g = n + 1)
+        tmp1 = (1 + m * pk.n) % pk.nSquared if pk.SimpleGenerator else pow(pk.g, m, pk.nSquared)
+        tmp2 = PaillierCryptosystem.GetNoiseFactor(pk)
         # Return 
-        return tmp1 * tmp2 % nSquared
+        return tmp1 * tmp2 % pk.nSquared
     
     @staticmethod
     def EncryptZeros(pk, Count = 1):
         assert(Count > 0)
+        pk = PublicKey.From(pk)
         return [PaillierCryptosystem.Encrypt(pk, 0) for _ in range(Count)]
     
     @staticmethod
     def Decrypt(sk, c):
+        sk = PrivateKey.From(sk)
+        # Use the factorization if the private key contains it
+        if sk.HasFactorization():
+            return PaillierCryptosystem.DecryptCRT(sk, c)
         # Check the ciphertext for size
-        l, mu, n, nSquared = sk[0], sk[1], sk[2], sk[2] * sk[2]
-        assert(c >= 0 and c < nSquared)
+        assert(c >= 0 and c < sk.nSquared)
         # Compute plaintext message
-        tmp = PaillierCryptosystem.L(pow(c, l, nSquared), n)
-        result = tmp * mu % n
+        tmp = PaillierCryptosystem.L(pow(c, sk.l, sk.nSquared), sk.n)
+        result = tmp * sk.mu % sk.n
+        # Handle negative plaintexts
+        if result > sk.HalfN:
+            result -= sk.n
+        return result
+    
+    @staticmethod
+    def DecryptCRT(sk, c):
+        # Check the ciphertext for size
+        sk = PrivateKey.From(sk)
+        assert(c >= 0 and c < sk.nSquared)
+        # Compute the plaintext modulo p and q separately
+        p, q = sk.p, sk.q
+        mP = PaillierCryptosystem.L(pow(c % sk.pSquared, sk.pMinus1, sk.pSquared), p) * sk.hp % p
+        mQ = PaillierCryptosystem.L(pow(c % sk.qSquared, sk.qMinus1, sk.qSquared), q) * sk.hq % q
+        # Recombine them
+        result = mQ + q * ((mP - mQ) * sk.qInv % p)
         # Handle negative plaintexts
-        if result > (n // 2):
-            result -= n
+        if result > sk.HalfN:
+            result -= sk.n
         return result
     
     @staticmethod
     def Add(pk, c1, c2):
-        return (c1 * c2) % (pk[0] * pk[0])
+        return (c1 * c2) % PublicKey.From(pk).nSquared
     
     @staticmethod
     def Sub(pk, c1, c2):
-        subtrahend = ModularIntegerInverse(c2, pk[0] * pk[0])
+        pk = PublicKey.From(pk)
+        subtrahend = ModularIntegerInverse(c2, pk.nSquared)
         return PaillierCryptosystem.Add(pk, c1, subtrahend)
     
     @staticmethod
@@ -95,9 +227,45 @@ class PaillierCryptosystem(object):
             # Anything multiplied by zero is zero, so return a fresh zero encryption
             return PaillierCryptosystem.Encrypt(pk, 0)
         else:
-            nSquared = pk[0] * pk[0]
+            nSquared = PublicKey.From(pk).nSquared
             result = pow(EncryptedFactor, abs(PlaintextFactor), nSquared)
             # Invert result if the plaintext factor was negative
             if PlaintextFactor < 0:
                 result = ModularIntegerInverse(result, nSquared)
-            return result
\ No newline at end of file
+            return result
+    
+    @staticmethod
+    def WeightedSum(pk, Ciphertexts, PlaintextWeights):
+        '''
+        Returns an encryption of the weighted sum of the encrypted plaintexts, i.e., the product of c^w over all terms.
+        Terms with positive and negative weights are accumulated separately, so that only a single inversion is needed.
+        '''
+        pk = PublicKey.From(pk)
+        nSquared = pk.nSquared
+        positiveTerms = [(c, w) for c, w in zip(Ciphertexts, PlaintextWeights) if w > 0]
+        negativeTerms = [(c, -w) for c, w in zip(Ciphertexts, PlaintextWeights) if w < 0]
+        if not positiveTerms and not negativeTerms:
+            # Anything multiplied by zero is zero, so return a fresh zero encryption
+            return PaillierCryptosystem.Encrypt(pk, 0)
+        result = PaillierCryptosystem.MultiExponentiation(positiveTerms, nSquared)
+        if negativeTerms:
+            subtrahend = ModularIntegerInverse(PaillierCryptosystem.MultiExponentiation(negativeTerms, nSquared), nSquared)
+            result = result * subtrahend % nSquared
+        return result
+    
+    @staticmethod
+    def MultiExponentiation(Terms, Modulus):
+        '''
+        Returns the product of b^e mod Modulus over all (b, e) terms with non-negative exponents, using Straus' method:
+        bases with equal exponents are multiplied together first, then all exponents share one chain of squarings.
+        '''
+        groups = {}
+        for base, exponent in Terms:
+            groups[exponent] = groups[exponent] * base % Modulus if exponent in groups else base % Modulus
+        result = 1
+        for bit in reversed(range(max(groups, default=0).bit_length())):
+            result = result * result % Modulus
+            for exponent, base in groups.items():
+                if (exponent >> bit) & 1:
+                    result = result * base % Modulus
+        return result
\ No newline at end of file
@@ -0,0 +1,106 @@
+'''
+Created on 18.10.2026
+'''
+
+class PublicKey(object):
+    '''
+    A Paillier public key (n, g) with the constants that encryption and the homomorphic operations need precomputed.
+    It still behaves like the tuple (n, g) for code that indexes or unpacks public keys.
+    '''
+    __slots__ = ("n", "g", "nSquared", "HalfN", "SimpleGenerator")
+
+    def __init__(self, n, g):
+        '''
+        Constructor
+        '''
+        self.n, self.g = n, g
+        self.nSquared = n * n
+        self.HalfN = n // 2
+        self.SimpleGenerator = (g == n + 1)
+
+    @staticmethod
+    def From(Key):
+        '''
+        Returns the key itself if it already is a PublicKey, or converts an (n, g) tuple.
+        '''
+        return Key if isinstance(Key, PublicKey) else PublicKey(*Key)
+
+    def AsTuple(self):
+        return (self.n, self.g)
+
+    def __getitem__(self, Index):
+        return self.AsTuple()[Index]
+
+    def __iter__(self):
+        return iter(self.AsTuple())
+
+    def __len__(self):
+        return 2
+
+    def __eq__(self, Other):
+        if isinstance(Other, (PublicKey, tuple)):
+            return self.AsTuple() == tuple(Other)
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.AsTuple())
+
+    def __repr__(self):
+        return "PublicKey(n=%d, g=%d)" % (self.n, self.g)
+
+class PrivateKey(object):
+    '''
+    A Paillier private key (l, mu, n) with the constants that decryption needs precomputed.
+    If the factorization of n is known, it also holds the constants for decryption via the Chinese remainder theorem.
+    It still behaves like the tuple (l, mu, n), or (l, mu, n, p, q, hp, hq, qInv) with the factorization.
+    '''
+    __slots__ = ("l", "mu", "n", "nSquared", "HalfN", "p", "q", "hp", "hq", "qInv", "pSquared", "qSquared", "pMinus1", "qMinus1")
+
+    def __init__(self, l, mu, n, p = None, q = None, hp = None, hq = None, qInv = None):
+        '''
+        Constructor
+        '''
+        self.l, self.mu, self.n = l, mu, n
+        self.nSquared = n * n
+        self.HalfN = n // 2
+        self.p, self.q, self.hp, self.hq, self.qInv = p, q, hp, hq, qInv
+        if self.HasFactorization():
+            self.pSquared, self.qSquared = p * p, q * q
+            self.pMinus1, self.qMinus1 = p - 1, q - 1
+        else:
+            self.pSquared, self.qSquared, self.pMinus1, self.qMinus1 = None, None, None, None
+
+    @staticmethod
+    def From(Key):
+        '''
+        Returns the key itself if it already is a PrivateKey, or converts an (l, mu, n[, p, q, hp, hq, qInv]) tuple.
+        '''
+        return Key if isinstance(Key, PrivateKey) else PrivateKey(*Key)
+
+    def HasFactorization(self):
+        return self.p is not None
+
+    def AsTuple(self):
+        if self.HasFactorization():
+            return (self.l, self.mu, self.n, self.p, self.q, self.hp, self.hq, self.qInv)
+        return (self.l, self.mu, self.n)
+
+    def __getitem__(self, Index):
+        return self.AsTuple()[Index]
+
+    def __iter__(self):
+        return iter(self.AsTuple())
+
+    def __len__(self):
+        return len(self.AsTuple())
+
+    def __eq__(self, Other):
+        if isinstance(Other, (PrivateKey, tuple)):
+            return self.AsTuple() == tuple(Other)
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.AsTuple())
+
+    def __repr__(self):
+        return "PrivateKey(n=%d%s)" % (self.n, ", with factorization" if self.HasFactorization() else "")
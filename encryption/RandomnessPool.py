@@ -0,0 +1,108 @@
+'''
+Created on 18.10.2026
+'''
+import threading
+from collections import deque
+from random import SystemRandom
+
+# Generates Count noise factors r^n mod n^2 for the modulus n (a module-level function, so process pools can pickle it)
+def GenerateNoiseFactors(n, Count):
+    rng, nSquared = SystemRandom(), n * n
+    return [pow(rng.randint(1, n - 1), n, nSquared) for _ in range(Count)]
+
+class RandomnessPool(object):
+    '''
+    A pool of precomputed Paillier noise factors r^n mod n^2, kept separately for every public key and refilled
+    in bulk by a background thread. If an executor (e.g. a concurrent.futures.ProcessPoolExecutor) is given,
+    the thread hands the batches to it, so that the factors are computed in parallel to the simulation.
+    '''
+
+    def __init__(self, HighWaterMark = 1024, LowWaterMark = None, BatchSize = 64, Executor = None):
+        '''
+        Constructor
+        '''
+        assert(HighWaterMark > 0 and BatchSize > 0)
+        self.HighWaterMark = HighWaterMark
+        self.LowWaterMark = HighWaterMark // 2 if LowWaterMark is None else LowWaterMark
+        assert(0 <= self.LowWaterMark <= self.HighWaterMark)
+        self.BatchSize = BatchSize
+        self.MyExecutor = Executor
+        # Pooled factors per public key, identified by its modulus
+        self.Factors = {}
+        self.Hits, self.Misses = 0, 0
+        # Background refill
+        self.RefillRequested = threading.Event()
+        self.StopRequested = False
+        self.Worker = None
+
+    def Register(self, pk):
+        '''
+        Starts pooling noise factors for the public key.
+        '''
+        self.Factors.setdefault(pk[0], deque())
+        self.RequestRefill()
+
+    def Draw(self, pk):
+        '''
+        Returns a pooled noise factor for the public key, or None if there is none left.
+        '''
+        factors = self.Factors.get(pk[0])
+        if factors is None:
+            self.Misses += 1
+            return None
+        try:
+            result = factors.popleft()
+        except IndexError:
+            self.Misses += 1
+            self.RequestRefill()
+            return None
+        self.Hits += 1
+        if len(factors) < self.LowWaterMark:
+            self.RequestRefill()
+        return result
+
+    def Fill(self, pk = None):
+        '''
+        Tops up the pool of the public key (or of all registered keys) to the high-water mark in the calling thread.
+        '''
+        for n in ([pk[0]] if pk is not None else list(self.Factors)):
+            factors = self.Factors.setdefault(n, deque())
+            missing = self.HighWaterMark - len(factors)
+            if missing <= 0:
+                continue
+            batches = [min(self.BatchSize, missing - i) for i in range(0, missing, self.BatchSize)]
+            if self.MyExecutor is None:
+                results = (GenerateNoiseFactors(n, count) for count in batches)
+            else:
+                results = self.MyExecutor.map(GenerateNoiseFactors, [n] * len(batches), batches)
+            for batch in results:
+                factors.extend(batch)
+
+    def RequestRefill(self):
+        if self.Worker is None:
+            self.Worker = threading.Thread(target=self.RefillLoop, daemon=True)
+            self.Worker.start()
+        self.RefillRequested.set()
+
+    def RefillLoop(self):
+        while True:
+            self.RefillRequested.wait()
+            self.RefillRequested.clear()
+            if self.StopRequested:
+                return
+            try:
+                self.Fill()
+            except RuntimeError:
+                # The executor was shut down (e.g., at interpreter exit), so there is nothing left to refill with
+                return
+
+    def Stop(self):
+        self.StopRequested = True
+        self.RefillRequested.set()
+        if self.Worker is not None:
+            self.Worker.join()
+            self.Worker = None
+        self.StopRequested = False
+
+    def GetStatistics(self):
+        return {"hits": self.Hits, "misses": self.Misses, "pooled": sum(len(f) for f in self.Factors.values())}
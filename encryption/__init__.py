@@ -1 +1,7 @@
-from encryption.Paillier import PaillierCryptosystem as Paillier
\ No newline at end of file
+from encryption.Paillier import PaillierCryptosystem as Paillier
+from encryption.PaillierKeys import PublicKey as PaillierPublicKey, PrivateKey as PaillierPrivateKey
+from encryption.RandomnessPool import RandomnessPool
+from encryption.Packing import SlotPacking
+from encryption.KeyStore import KeyStore
+from encryption.DamgardJurik import DamgardJurikCryptosystem as DamgardJurik, GetCryptosystem
+from encryption.DamgardJurikKeys import PublicKey as DamgardJurikPublicKey, PrivateKey as DamgardJurikPrivateKey
\ No newline at end of file
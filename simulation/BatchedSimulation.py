@@ -0,0 +1,115 @@
+'''
+Created on 18.10.2026
+'''
+import numpy as np
+from simulation import SimParameters as PARAM
+from simulation.ErrorStatistics import ErrorStatistics
+from simulation.VectorizedConSensorGrid import VectorizedConSensorGrid
+
+class BatchedSimulator(object):
+    '''
+    Simulates many independent runs at once as (runs x time steps x sensors) arrays, for the plaintext and quantized
+    estimates only (i.e., with DO_NOT_ENCRYPT set). It draws exactly the same random numbers in the same order as the
+    per-object simulation and performs the same floating-point operations, so it returns the same squared errors
+    (whose statistics only differ by rounding, since they are accumulated a batch at a time).
+    '''
+
+    def __init__(self, GridSize, BatchSize = 20):
+        '''
+        Constructor
+        '''
+        self.MyGrid = VectorizedConSensorGrid(GridSize)
+        self.Weights = self.MyGrid.Weights
+        self.SensorCount = self.MyGrid.SensorCount
+        self.BatchSize = BatchSize
+        # The controller always queries the same sensor
+        self.QueriedSensorID = self.MyGrid.GetCentralSensor().MyID
+        # The errors are recorded after the last round (and after every round in between, if requested)
+        roundCount = PARAM.CONSENSUS_ROUND_COUNT
+        self.RecordedRounds = list(range(1, roundCount + 1)) if PARAM.TRACK_ERRORS_PER_ROUND else [roundCount]
+        # Its quantized estimate after r rounds is an exact integer combination of all quantized measurements,
+        # which is evaluated as int64 matrix products over limbs of the weights that are small enough not to overflow
+        self.LimbBitSize = 63 - PARAM.MEAS_BIT_SIZE - self.SensorCount.bit_length()
+        assert(self.LimbBitSize > 0)
+        self.RowLimbs = {}
+        row = self.Weights.GetQuantizedPowerRow(self.QueriedSensorID, 0)
+        for r in range(1, roundCount + 1):
+            row = self.Weights.ApplyQuantizedTransposed(row)
+            if r in self.RecordedRounds:
+                self.RowLimbs[r] = (self.SplitIntoLimbs([max(w, 0) for w in row]),
+                                    self.SplitIntoLimbs([max(-w, 0) for w in row]) if any(w < 0 for w in row) else None)
+
+    def SplitIntoLimbs(self, Row):
+        limbCount = max(1, -(-max(Row).bit_length() // self.LimbBitSize))
+        mask = (1 << self.LimbBitSize) - 1
+        return np.array([[(w >> (l * self.LimbBitSize)) & mask for w in Row] for l in range(limbCount)], dtype=np.int64)
+
+    def CombineLimbs(self, LimbProducts):
+        result = np.zeros(LimbProducts.shape[:-1], dtype=object)
+        for l in range(LimbProducts.shape[-1]):
+            result += LimbProducts[..., l].astype(object) * (1 << (l * self.LimbBitSize))
+        return result
+
+    def GetQueriedQuantizedEstimates(self, Measurements, QuantizationFactor, RoundCount):
+        quantized = np.rint(Measurements * QuantizationFactor).astype(np.int64)
+        assert(np.all(np.abs(quantized) < 2 ** PARAM.MEAS_BIT_SIZE))
+        positiveRowLimbs, negativeRowLimbs = self.RowLimbs[RoundCount]
+        result = self.CombineLimbs(quantized @ positiveRowLimbs.T)
+        if negativeRowLimbs is not None:
+            result -= self.CombineLimbs(quantized @ negativeRowLimbs.T)
+        return result
+
+    @staticmethod
+    def Unquantize(QuantizedEstimate, QuantizationFactor, RoundCount):
+        return float(QuantizedEstimate / QuantizationFactor / pow(PARAM.WEIGHT_QUANTIZATION_FACTOR, RoundCount))
+
+    def SimulateBatch(self, Runs):
+        '''
+        Returns the squared errors of the specified number of runs as a (runs x time steps x (1 + recorded rounds) x 4) array:
+        those of the plaintext and quantized estimates (as in ErrorStatistics.ESTIMATORS) of the queried sensor before
+        the consensus rounds and after each of the recorded rounds.
+        '''
+        steps = PARAM.TIME_STEPS_PER_RUN
+        # Draw all random numbers at once: per run and time step, one system step and one measurement per sensor
+        noise = np.random.standard_normal(Runs * steps * (1 + self.SensorCount)).reshape(Runs, steps, 1 + self.SensorCount)
+        positions = np.empty((Runs, steps), dtype=float)
+        position = np.full(Runs, float(PARAM.SYSTEM_INITIAL_STATE))
+        for t in range(steps):
+            position = position + (0 + PARAM.SYSTEM_RANDOM_WALK_SIGMA * noise[:, t, 0])
+            positions[:, t] = position
+        measurements = positions[:, :, None] + PARAM.SENSOR_MEASUREMENT_VARIANCE * noise[:, :, 1:]
+        result = np.empty((Runs, steps, 1 + len(self.RecordedRounds), 4), dtype=float)
+        i = self.QueriedSensorID
+        result[:, :, 0, 0] = (measurements[:, :, i] - positions) * (measurements[:, :, i] - positions)
+        # Plaintext consensus (with the sensors along the first axis)
+        estimates = np.ascontiguousarray(measurements.reshape(Runs * steps, self.SensorCount).T)
+        for r in range(1, PARAM.CONSENSUS_ROUND_COUNT + 1):
+            estimates = self.Weights.ApplyToColumns(estimates)
+            if r in self.RowLimbs:
+                estimate = estimates[i].reshape(Runs, steps)
+                result[:, :, self.RecordedRounds.index(r) + 1, 0] = (estimate - positions) * (estimate - positions)
+        # Quantized consensus (of the queried sensor only), before and after the rounds
+        for column, factor in ((1, PARAM.MEAS_QUANTIZATION_FACTOR_8), (2, PARAM.MEAS_QUANTIZATION_FACTOR_16), (3, PARAM.MEAS_QUANTIZATION_FACTOR_24)):
+            unquantized = np.rint(measurements[:, :, i] * factor).astype(np.int64) / factor
+            result[:, :, 0, column] = (unquantized - positions) * (unquantized - positions)
+            for j, r in enumerate(self.RecordedRounds, 1):
+                quantized = self.GetQueriedQuantizedEstimates(measurements, factor, r)
+                unquantized = np.array([self.Unquantize(q, factor, r) for q in quantized.ravel()], dtype=float).reshape(Runs, steps)
+                result[:, :, j, column] = (unquantized - positions) * (unquantized - positions)
+        return result
+
+    def Simulation(self, runs):
+        '''
+        Returns the same error statistics as RunSimulation.Simulation (for the plaintext and quantized estimates only,
+        unfiltered, after the last round, and after every round in between if TRACK_ERRORS_PER_ROUND is set).
+        '''
+        assert(PARAM.DO_NOT_ENCRYPT)
+        statistics = ErrorStatistics(PARAM.TIME_STEPS_PER_RUN, PARAM.CONSENSUS_ROUND_COUNT)
+        estimatorCount = len(ErrorStatistics.ESTIMATORS)
+        for start in range(0, runs, self.BatchSize):
+            errors = self.SimulateBatch(min(self.BatchSize, runs - start))
+            for j, r in enumerate([0] + self.RecordedRounds):
+                samples = np.full(errors.shape[:2] + (estimatorCount,), np.nan)
+                samples[:, :, :4] = errors[:, :, j]
+                statistics.AddSamples(r, samples)
+        return statistics
@@ -0,0 +1,85 @@
+'''
+Created on 18.10.2026
+'''
+import os
+import pickle
+import tempfile
+
+class CampaignCheckpoint(object):
+    '''
+    Keeps track of the finished chunks of a Monte Carlo campaign (see MonteCarloScheduler) and, given a file name,
+    saves its progress after every chunk, so that a restarted campaign skips the chunks that are already done.
+    It stores the parameter fingerprint and the chunks (index, runs, seed) of the campaign, whose seeds fully determine
+    their random numbers, and refuses to resume from a file that belongs to a different campaign. The results of the
+    longest finished prefix of chunks are merged in chunk order right away, and only those of chunks finished out of
+    order are kept separately, so the file stays small and the final result is the same as without any restart.
+    Every save is atomic, so a crash while writing leaves the previous checkpoint behind.
+    '''
+
+    def __init__(self, FileName, Fingerprint, Chunks, Merge):
+        '''
+        Constructor; Merge(a, b) returns the merged result of two (sets of) consecutive chunks.
+        '''
+        self.FileName = FileName
+        self.Fingerprint = Fingerprint
+        self.Chunks = [tuple(c) for c in Chunks]
+        self.Merge = Merge
+        self.PrefixLength, self.PrefixResult, self.PendingResults = 0, None, {}
+        if self.FileName is not None and os.path.isfile(self.FileName):
+            self.Load()
+
+    @staticmethod
+    def GetFileName(Directory, Fingerprint):
+        # Every parameter set has its own file, so changing a setting starts a new campaign instead of clashing with the old one
+        return os.path.join(Directory, Fingerprint + ".pickle") if Directory is not None else None
+
+    def Load(self):
+        with open(self.FileName, "rb") as checkpointFile:
+            contents = pickle.load(checkpointFile)
+        if contents["Fingerprint"] != self.Fingerprint or contents["Chunks"] != self.Chunks:
+            raise ValueError('the checkpoint belongs to a different parameter set', self.FileName)
+        self.PrefixLength, self.PrefixResult, self.PendingResults = contents["PrefixLength"], contents["PrefixResult"], contents["PendingResults"]
+
+    def Save(self):
+        directory = os.path.dirname(os.path.abspath(self.FileName))
+        os.makedirs(directory, exist_ok = True)
+        contents = {"Fingerprint": self.Fingerprint, "Chunks": self.Chunks, "PrefixLength": self.PrefixLength,
+                    "PrefixResult": self.PrefixResult, "PendingResults": self.PendingResults}
+        # Write to a temporary file first and then move it into place in one step
+        fileDescriptor, temporaryFileName = tempfile.mkstemp(dir = directory, suffix = ".tmp")
+        try:
+            with os.fdopen(fileDescriptor, "wb") as checkpointFile:
+                pickle.dump(contents, checkpointFile, protocol = pickle.HIGHEST_PROTOCOL)
+            os.replace(temporaryFileName, self.FileName)
+        except BaseException:
+            os.remove(temporaryFileName)
+            raise
+
+    def IsFinished(self, ChunkIndex):
+        return ChunkIndex < self.PrefixLength or ChunkIndex in self.PendingResults
+
+    def GetFinishedRuns(self):
+        return sum(runs for index, runs, _ in self.Chunks if self.IsFinished(index))
+
+    def Add(self, ChunkIndex, Result):
+        '''
+        Records the result of a finished chunk and saves the checkpoint.
+        '''
+        assert(not self.IsFinished(ChunkIndex))
+        self.PendingResults[ChunkIndex] = Result
+        while self.PrefixLength in self.PendingResults:
+            result = self.PendingResults.pop(self.PrefixLength)
+            self.PrefixResult = result if self.PrefixResult is None else self.Merge(self.PrefixResult, result)
+            self.PrefixLength += 1
+        if self.FileName is not None:
+            self.Save()
+
+    def IsComplete(self):
+        return self.PrefixLength == len(self.Chunks)
+
+    def GetResult(self):
+        '''
+        Returns the merged result of all chunks, once they are all finished.
+        '''
+        assert(self.IsComplete())
+        return self.PrefixResult
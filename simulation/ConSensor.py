@@ -5,13 +5,21 @@ Created on 30.05.2018
 '''
 from math import log2
 from numpy.random import normal as Gauss
-from encryption import Paillier
+from encryption import Paillier, GetCryptosystem
 from simulation import SimParameters as PARAM
 
 class ConSensor(object):
     '''
-    classdocs
+    A sensor node of the grid. Its neighbors (including itself) are kept in a fixed order, and all per-neighbor data
+    (the weights and the estimates received in the current round) lives in preallocated lists indexed by a neighbor's
+    position in that order. Every sensor knows its position among each neighbor's neighbors, so that it can write
+    its messages straight into the neighbors' receive buffers without any allocation, dict lookup, or grid lookup.
     '''
+    __slots__ = ("MyGrid", "MyID", "MyNeighbors", "MyPosition", "OtherPositions", "SendTargets", "MeasurementNoiseSigma",
+                 "NeighborWeights", "QuantizedNeighborWeights", "MostRecentMeasurement", "MostRecentEstimate",
+                 "Q08MostRecentEstimate", "Q16MostRecentEstimate", "Q24MostRecentEstimate", "EncMostRecentEstimate",
+                 "Cryptosystem", "pk", "Packing", "CurrentNeighborEstimates", "Q08NeighborEstimates", "Q16NeighborEstimates",
+                 "Q24NeighborEstimates", "EncryptedNeighborEstimates")
 
     def __init__(self, Grid, SensorID, MeasurementNoise):
         '''
@@ -21,10 +29,13 @@ class ConSensor(object):
         self.MyGrid = Grid
         self.MyID = SensorID
         self.MyNeighbors = []
-        # Internal sensor parameters
+        self.MyPosition = None
+        self.OtherPositions = []
+        self.SendTargets = []
+        # Internal sensor parameters (by neighbor position)
         self.MeasurementNoiseSigma = MeasurementNoise
-        self.NeighborWeights = {}
-        self.QuantizedNeighborWeights = {}
+        self.NeighborWeights = []
+        self.QuantizedNeighborWeights = []
         # Round-specific data
         self.MostRecentMeasurement = 0.0
         self.MostRecentEstimate = 0.0
@@ -33,12 +44,16 @@ class ConSensor(object):
         self.Q16MostRecentEstimate = 0
         self.Q24MostRecentEstimate = 0
         self.EncMostRecentEstimate = 0
+        self.Cryptosystem = Paillier
+        self.pk = None
+        self.Packing = None
         
-        self.CurrentNeighborEstimates = {}
-        self.Q08NeighborEstimates = {}
-        self.Q16NeighborEstimates = {}
-        self.Q24NeighborEstimates = {}
-        self.EncryptedNeighborEstimates = {}
+        # Receive buffers (by neighbor position)
+        self.CurrentNeighborEstimates = []
+        self.Q08NeighborEstimates = []
+        self.Q16NeighborEstimates = []
+        self.Q24NeighborEstimates = []
+        self.EncryptedNeighborEstimates = []
         
     def AddNeighborID(self, NeighborID):
         if NeighborID not in self.MyNeighbors:
@@ -46,18 +61,34 @@ class ConSensor(object):
             
     def UpdateNeighborEstimateWeights(self):
         '''
-        Sets the weight of own estimate to a fixed value and all other weights equal to each other.
+        Sets the weight of own estimate to a fixed value and all other weights equal to each other,
+        and (re)allocates the receive buffers for the current neighbors.
         '''
-        self.NeighborWeights.clear()
-        for nID in self.MyNeighbors:
-            self.NeighborWeights[nID] = PARAM.OWN_ESTIMATE_WEIGHT if nID == self.MyID else ((1.0 - PARAM.OWN_ESTIMATE_WEIGHT) / (len(self.MyNeighbors) - 1))
-            self.QuantizedNeighborWeights[nID] = self.Quantize(self.NeighborWeights[nID], PARAM.WEIGHT_QUANTIZATION_FACTOR, PARAM.WEIGHT_BIT_SIZE)
+        neighborCount = len(self.MyNeighbors)
+        self.MyPosition = self.MyNeighbors.index(self.MyID)
+        self.OtherPositions = [k for k in range(neighborCount) if k != self.MyPosition]
+        self.NeighborWeights = [PARAM.OWN_ESTIMATE_WEIGHT if nID == self.MyID else ((1.0 - PARAM.OWN_ESTIMATE_WEIGHT) / (neighborCount - 1)) for nID in self.MyNeighbors]
+        self.QuantizedNeighborWeights = [self.Quantize(w, PARAM.WEIGHT_QUANTIZATION_FACTOR, PARAM.WEIGHT_BIT_SIZE) for w in self.NeighborWeights]
         # Ensure all quantized weights add up to a single quantization factor
-        self.QuantizedNeighborWeights[self.MyID] += PARAM.WEIGHT_QUANTIZATION_FACTOR - sum(self.QuantizedNeighborWeights.values())
-        assert(PARAM.WEIGHT_QUANTIZATION_FACTOR == sum(self.QuantizedNeighborWeights.values()))
+        self.QuantizedNeighborWeights[self.MyPosition] += PARAM.WEIGHT_QUANTIZATION_FACTOR - sum(self.QuantizedNeighborWeights)
+        assert(PARAM.WEIGHT_QUANTIZATION_FACTOR == sum(self.QuantizedNeighborWeights))
+        self.CurrentNeighborEstimates = [0.0] * neighborCount
+        self.Q08NeighborEstimates = [0] * neighborCount
+        self.Q16NeighborEstimates = [0] * neighborCount
+        self.Q24NeighborEstimates = [0] * neighborCount
+        self.EncryptedNeighborEstimates = [0] * neighborCount
+    
+    def SetSendTargets(self, Targets):
+        '''
+        Sets the (sensor, position) pairs of all other neighbors, where position is this sensor's position among theirs.
+        '''
+        self.SendTargets = Targets
             
-    def SetEncryptionKey(self, pk):
-        self.pk = pk
+    def SetEncryptionKey(self, pk, Packing = None):
+        # The key determines the cryptosystem (Paillier or Damgard-Jurik)
+        self.Cryptosystem = GetCryptosystem(pk)
+        self.pk = self.Cryptosystem.PublicKey.From(pk)
+        self.Packing = Packing
             
     def GetMeasurement(self, RealState):
         return Gauss(RealState, self.MeasurementNoiseSigma)
@@ -72,7 +103,7 @@ class ConSensor(object):
         return self.Quantize(MeasuredState, QuantizationFactor, PARAM.MEAS_BIT_SIZE)
     
     def EncryptQuantizedMeasurement(self, QuantizedState):
-        return Paillier.Encrypt(self.pk, QuantizedState)
+        return self.Cryptosystem.Encrypt(self.pk, QuantizedState)
     
     def TakeMeasurement(self, RealState):#PARAM.MEAS_QUANTIZATION_FACTOR
         self.MostRecentMeasurement = self.GetMeasurement(RealState)
@@ -82,57 +113,40 @@ class ConSensor(object):
         self.Q16MostRecentEstimate = self.QuantizeMeasurement(self.MostRecentEstimate, PARAM.MEAS_QUANTIZATION_FACTOR_16)
         self.Q24MostRecentEstimate = self.QuantizeMeasurement(self.MostRecentEstimate, PARAM.MEAS_QUANTIZATION_FACTOR_24)
         if not PARAM.DO_NOT_ENCRYPT:
-            self.EncMostRecentEstimate = self.EncryptQuantizedMeasurement(self.Q16MostRecentEstimate)
+            if self.Packing is not None:
+                self.EncMostRecentEstimate = self.Packing.Encrypt(self.pk, [self.Q08MostRecentEstimate, self.Q16MostRecentEstimate, self.Q24MostRecentEstimate])
+            else:
+                self.EncMostRecentEstimate = self.EncryptQuantizedMeasurement(self.Q16MostRecentEstimate)
     
     def SendCurrentEstimateToNeighbors(self):
-        for nID in self.MyNeighbors:
-            n = self.MyGrid.GetSensorByID(nID)
-            n.ReceiveNeighborEstimate(self.MyID, self.MostRecentEstimate)
-            n.ReceiveQuantizedEstimate(self.MyID, self.Q08MostRecentEstimate, self.Q16MostRecentEstimate, self.Q24MostRecentEstimate)
-            if not PARAM.DO_NOT_ENCRYPT:
-                n.ReceiveEncryptedEstimate(self.MyID, self.EncMostRecentEstimate)
+        encrypt = not PARAM.DO_NOT_ENCRYPT
+        for n, position in self.SendTargets:
+            n.CurrentNeighborEstimates[position] = self.MostRecentEstimate
+            n.Q08NeighborEstimates[position] = self.Q08MostRecentEstimate
+            n.Q16NeighborEstimates[position] = self.Q16MostRecentEstimate
+            n.Q24NeighborEstimates[position] = self.Q24MostRecentEstimate
+            if encrypt:
+                n.EncryptedNeighborEstimates[position] = self.EncMostRecentEstimate
     
-    def ReceiveNeighborEstimate(self, NeighborID, NeighborEstimate):
-        assert(NeighborID in self.NeighborWeights)
-        self.CurrentNeighborEstimates[NeighborID] = NeighborEstimate
-
-    def ReceiveQuantizedEstimate(self, NeighborID, Q8Estimate, Q16Estimate, Q24Estimate):
-        assert(NeighborID in self.NeighborWeights)
-        self.Q08NeighborEstimates[NeighborID] = Q8Estimate
-        self.Q16NeighborEstimates[NeighborID] = Q16Estimate
-        self.Q24NeighborEstimates[NeighborID] = Q24Estimate
-
-    def ReceiveEncryptedEstimate(self, NeighborID, EncryptedEstimate):
-        assert(not PARAM.DO_NOT_ENCRYPT)
-        assert(NeighborID in self.NeighborWeights)
-        self.EncryptedNeighborEstimates[NeighborID] = EncryptedEstimate
-        
     def FuseNeighborEstimates(self):
-        self.MostRecentEstimate *= self.NeighborWeights[self.MyID]
-        for nID in self.MyNeighbors:
-            if nID == self.MyID:
-                continue # It's already been add to the result before...
-            assert(nID in self.CurrentNeighborEstimates)
-            self.MostRecentEstimate += self.NeighborWeights[nID] * self.CurrentNeighborEstimates[nID]
+        # Own estimate first, then the others in neighbor order (floating-point additions do not commute)
+        weights, estimates = self.NeighborWeights, self.CurrentNeighborEstimates
+        self.MostRecentEstimate *= weights[self.MyPosition]
+        for k in self.OtherPositions:
+            self.MostRecentEstimate += weights[k] * estimates[k]
         
     def FuseQuantizedNeighborEstimates(self):
-        self.Q08MostRecentEstimate *= self.QuantizedNeighborWeights[self.MyID]
-        self.Q16MostRecentEstimate *= self.QuantizedNeighborWeights[self.MyID]
-        self.Q24MostRecentEstimate *= self.QuantizedNeighborWeights[self.MyID]
-        for nID in self.MyNeighbors:
-            if nID == self.MyID:
-                continue # It's already been add to the result before...
-            assert(nID in self.CurrentNeighborEstimates)
-            self.Q08MostRecentEstimate += self.QuantizedNeighborWeights[nID] * self.Q08NeighborEstimates[nID]
-            self.Q16MostRecentEstimate += self.QuantizedNeighborWeights[nID] * self.Q16NeighborEstimates[nID]
-            self.Q24MostRecentEstimate += self.QuantizedNeighborWeights[nID] * self.Q24NeighborEstimates[nID]
+        # Fill in the own estimates, then take the (exact) weighted sums over all positions
+        weights, position = self.QuantizedNeighborWeights, self.MyPosition
+        self.Q08NeighborEstimates[position] = self.Q08MostRecentEstimate
+        self.Q16NeighborEstimates[position] = self.Q16MostRecentEstimate
+        self.Q24NeighborEstimates[position] = self.Q24MostRecentEstimate
+        self.Q08MostRecentEstimate = sum(w * e for w, e in zip(weights, self.Q08NeighborEstimates))
+        self.Q16MostRecentEstimate = sum(w * e for w, e in zip(weights, self.Q16NeighborEstimates))
+        self.Q24MostRecentEstimate = sum(w * e for w, e in zip(weights, self.Q24NeighborEstimates))
         
     def FuseEncryptedNeighborEstimates(self):
         assert(not PARAM.DO_NOT_ENCRYPT)
-        self.EncMostRecentEstimate = Paillier.Mult(self.pk, self.EncMostRecentEstimate, self.QuantizedNeighborWeights[self.MyID])
-        for nID in self.MyNeighbors:
-            if nID == self.MyID:
-                continue # It's already been add to the result before...
-            assert(nID in self.CurrentNeighborEstimates)
-            weightedEstimate = Paillier.Mult(self.pk, self.EncryptedNeighborEstimates[nID], self.QuantizedNeighborWeights[nID])
-            self.EncMostRecentEstimate = Paillier.Add(self.pk, self.EncMostRecentEstimate, weightedEstimate)
\ No newline at end of file
+        # Same as above: the homomorphic weighted sum does not depend on the order of its terms
+        self.EncryptedNeighborEstimates[self.MyPosition] = self.EncMostRecentEstimate
+        self.EncMostRecentEstimate = self.Cryptosystem.WeightedSum(self.pk, self.EncryptedNeighborEstimates, self.QuantizedNeighborWeights)
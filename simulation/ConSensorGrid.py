@@ -3,9 +3,12 @@ Created on 30.05.2018
 
 @author: Mikhail Aristov
 '''
+import multiprocessing as mp
 from random import choice
-from numpy import array, ndarray
+from numpy import array, cumsum, ndarray
+from encryption import GetCryptosystem
 from simulation import SimSensor, SimParameters as PARAM
+from simulation.ParallelFusion import ParallelFusionExecutor
         
 class ConSensorGrid(object):
     '''
@@ -22,15 +25,38 @@ class ConSensorGrid(object):
         for i in range(self.SensorCount):
             newSensor = SimSensor(self, i, PARAM.SENSOR_MEASUREMENT_VARIANCE)
             self.MySensors.append(newSensor)
-        # Connect sensors with their neighbors
+        # Connect sensors with their neighbors, kept in compressed sparse row form: the neighbors of sensor i (including
+        # itself) are NeighborIDs[NeighborOffsets[i]:NeighborOffsets[i + 1]]
+        neighborLists = [self.GetNeighborIDs(i) for i in range(self.SensorCount)]
+        self.NeighborOffsets = cumsum([0] + [len(l) for l in neighborLists])
+        self.NeighborIDs = array([nID for l in neighborLists for nID in l], dtype=int)
         for s in self.MySensors:
-            for nID in self.GetNeighborIDs(s.MyID):
+            for nID in neighborLists[s.MyID]:
                 s.AddNeighborID(nID)
             s.UpdateNeighborEstimateWeights()
+        # Let every sensor send straight into its neighbors' receive buffers, at its own position among their neighbors
+        for s in self.MySensors:
+            s.SetSendTargets([(self.MySensors[nID], self.MySensors[nID].MyNeighbors.index(s.MyID)) for nID in s.MyNeighbors if nID != s.MyID])
+        self.FusionExecutor = None
             
-    def DistributePublicKey(self, pk):
+    def DistributePublicKey(self, pk, Packing = None):
+        # Share a single key object with precomputed constants among all sensors
+        pk = GetCryptosystem(pk).PublicKey.From(pk)
         for s in self.MySensors:
-            s.SetEncryptionKey(pk)
+            s.SetEncryptionKey(pk, Packing)
+        self.StartParallelFusion(pk, self.NeighborOffsets, self.NeighborIDs, [w for s in self.MySensors for w in s.QuantizedNeighborWeights])
+    
+    def StartParallelFusion(self, pk, Offsets, NeighborIDs, Weights):
+        '''
+        Starts a ParallelFusionExecutor for the specified key and (CSR) weight matrix if PARALLEL_FUSION_PROCESS_COUNT asks for one,
+        the estimates are encrypted at all, and this is not a daemonic worker process (e.g., of the Monte Carlo scheduler),
+        which cannot have child processes.
+        '''
+        if self.FusionExecutor is not None:
+            self.FusionExecutor.Close()
+            self.FusionExecutor = None
+        if PARAM.PARALLEL_FUSION_PROCESS_COUNT > 1 and not PARAM.DO_NOT_ENCRYPT and not mp.current_process().daemon:
+            self.FusionExecutor = ParallelFusionExecutor(pk, Offsets, NeighborIDs, Weights, PARAM.PARALLEL_FUSION_PROCESS_COUNT)
     
     def GetSensorByID(self, SensorID):
         return self.MySensors[SensorID]
@@ -62,8 +88,13 @@ class ConSensorGrid(object):
         for s in self.MySensors:
             s.FuseNeighborEstimates()
             s.FuseQuantizedNeighborEstimates()
-            if not PARAM.DO_NOT_ENCRYPT:
+            if not PARAM.DO_NOT_ENCRYPT and self.FusionExecutor is None:
                 s.FuseEncryptedNeighborEstimates()
+        # The encrypted fusions are independent of each other, so the executor can do them all at once
+        if not PARAM.DO_NOT_ENCRYPT and self.FusionExecutor is not None:
+            fused = self.FusionExecutor.Fuse([s.EncMostRecentEstimate for s in self.MySensors])
+            for s, c in zip(self.MySensors, fused):
+                s.EncMostRecentEstimate = c
             
     def GetAllCurrentEstimates(self):
         buffer = array([s.MostRecentEstimate for s in self.MySensors], dtype=float)
@@ -3,7 +3,10 @@ Created on 30.05.2018
 
 @author: Mikhail Aristov
 '''
-from encryption import Paillier
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from math import nan
+from encryption import Paillier, DamgardJurik, GetCryptosystem, RandomnessPool, SlotPacking, KeyStore
 from simulation import SimParameters as PARAM
 
 class ConsensusController(object):
@@ -25,14 +28,59 @@ class ConsensusController(object):
         self.Q24Estimate = 0
         self.EncryptedEstimate = 0
         self.DecryptedEstimate = 0
+        self.DecryptedQ08Estimate = 0
+        self.DecryptedQ24Estimate = 0
         self.LastSensorQueried = None
+        self.EstimateRoundCount = PARAM.CONSENSUS_ROUND_COUNT
         
-        # From the security standpoint, the server must generate its own key pair, but for this simulation,
-        # we hard-wire a simple 192-bit key (not secure in any form or shape!) for performance reasons
-        self.pk, self.sk = Paillier.KeyGenFromPrimes(282174488599599500573849980909, 362736035870515331128527330659)
-        self.MyGrid.DistributePublicKey(self.pk)
+        self.Packing = ConsensusController.GetPacking()
+        self.pk, self.sk = ConsensusController.GetKeyPair()
+        self.Cryptosystem = GetCryptosystem(self.sk)
+        if self.Packing is not None:
+            self.Packing.CheckKey(self.pk)
+        self.MyGrid.DistributePublicKey(self.pk, self.Packing)
+        # Precompute encryption noise factors, if requested (Paillier only): fill the pool up front, and refill it in the
+        # background in other processes where possible (daemonic worker processes cannot have child processes)
+        if PARAM.RANDOMNESS_POOL_HIGH_WATER_MARK > 0 and not PARAM.DO_NOT_ENCRYPT and self.Cryptosystem is Paillier:
+            if Paillier.NoisePool is None:
+                executor = None
+                if PARAM.RANDOMNESS_POOL_PROCESS_COUNT > 0 and not mp.current_process().daemon:
+                    executor = ProcessPoolExecutor(PARAM.RANDOMNESS_POOL_PROCESS_COUNT)
+                Paillier.SetRandomnessPool(RandomnessPool(PARAM.RANDOMNESS_POOL_HIGH_WATER_MARK, Executor = executor))
+            Paillier.NoisePool.Fill(self.pk)
+            Paillier.NoisePool.Register(self.pk)
     
-    def FetchEstimate(self, FromSensor):
+    @staticmethod
+    def GetPacking():
+        # Packing all three quantized estimates into one ciphertext needs about three times the plaintext space
+        if PARAM.PACK_QUANTIZED_ESTIMATES:
+            return SlotPacking(3, PARAM.MEAS_BIT_SIZE, PARAM.WEIGHT_BIT_SIZE, PARAM.CONSENSUS_ROUND_COUNT)
+        return None
+    
+    @staticmethod
+    def GetKeyPair():
+        '''
+        Returns the key pair for the configured modulus size (or the packed slots' size, if larger) from the key store,
+        as a Damgard-Jurik key pair with the same primes if DAMGARD_JURIK_S is above one.
+        From the security standpoint, the server must generate its own key pair, but for this simulation, the key pair is
+        cached on disk for performance reasons (and small keys are not secure in any form or shape anyway!);
+        keeping the factorization in the private key speeds up decryption via the Chinese remainder theorem,
+        and the generator g = n + 1 speeds up encryption.
+        '''
+        keyLength, s, packing = PARAM.PLAINTEXT_MODULUS_BIT_SIZE, PARAM.DAMGARD_JURIK_S, ConsensusController.GetPacking()
+        if packing is not None:
+            # The plaintext modulus n^s needs more bits than the packed plaintexts, i.e., s * (keyLength - 1) of them
+            # suffice since n has exactly keyLength bits (rounded up to an even length)
+            keyLength = max(keyLength, -(-packing.GetPlaintextBitSize() // s) + 1)
+            keyLength += keyLength % 2
+        pk, sk = KeyStore(PARAM.KEY_STORE_DIRECTORY).GetKeyPair(keyLength, KeepFactorization = True, SimpleGenerator = True)
+        if s > 1:
+            return DamgardJurik.KeyGenFromPrimes(sk.p, sk.q, s)
+        return pk, sk
+    
+    def FetchEstimate(self, FromSensor, RoundCount = None):
+        # The quantized estimates carry one factor of the weight quantization per consensus round they went through
+        self.EstimateRoundCount = PARAM.CONSENSUS_ROUND_COUNT if RoundCount is None else RoundCount
         self.LastSensorQueried = FromSensor
         self.MostRecentPosition = self.MySystem.CurrentPos
         self.MostRecentEstimate = FromSensor.MostRecentEstimate
@@ -43,25 +91,33 @@ class ConsensusController(object):
         # Fetch encrypted estimate
         if not PARAM.DO_NOT_ENCRYPT:
             self.EncryptedEstimate = FromSensor.EncMostRecentEstimate
-            self.DecryptedEstimate = self.DecryptAndUnquantize(self.EncryptedEstimate)
+            if self.Packing is not None:
+                self.DecryptedQ08Estimate, self.DecryptedEstimate, self.DecryptedQ24Estimate = self.DecryptAndUnquantizePacked(self.EncryptedEstimate)
+            else:
+                self.DecryptedEstimate = self.DecryptAndUnquantize(self.EncryptedEstimate)
         return self.MostRecentEstimate, self.DecryptedEstimate
     
-    def FetchEstimateFromCenter(self):
-        return self.FetchEstimate(self.MyGrid.GetRandomSensor())
+    def FetchEstimateFromCenter(self, RoundCount = None):
+        return self.FetchEstimate(self.MyGrid.GetRandomSensor(), RoundCount)
     
-    def FetchRandomEstimate(self):
-        return self.FetchEstimate(self.MyGrid.GetCentralSensor())
+    def FetchRandomEstimate(self, RoundCount = None):
+        return self.FetchEstimate(self.MyGrid.GetCentralSensor(), RoundCount)
     
-    def FetchEstimateFromSameSensor(self):
-        return self.FetchEstimate(self.LastSensorQueried)
+    def FetchEstimateFromSameSensor(self, RoundCount = None):
+        return self.FetchEstimate(self.LastSensorQueried, RoundCount)
     
     def Unquantize(self, QuantizedEstimate, QuantizationFactor):
-        return float(QuantizedEstimate / QuantizationFactor / pow(PARAM.WEIGHT_QUANTIZATION_FACTOR, PARAM.CONSENSUS_ROUND_COUNT))
+        return float(QuantizedEstimate / QuantizationFactor / pow(PARAM.WEIGHT_QUANTIZATION_FACTOR, self.EstimateRoundCount))
     
     def DecryptAndUnquantize(self, ciphertext):
         assert(not PARAM.DO_NOT_ENCRYPT)
-        plaintext = Paillier.Decrypt(self.sk, ciphertext)
+        plaintext = self.Cryptosystem.Decrypt(self.sk, ciphertext)
         return self.Unquantize(plaintext, PARAM.MEAS_QUANTIZATION_FACTOR_16)
+    
+    def DecryptAndUnquantizePacked(self, ciphertext):
+        assert(not PARAM.DO_NOT_ENCRYPT and self.Packing is not None)
+        q08, q16, q24 = self.Packing.Decrypt(self.sk, ciphertext)
+        return self.Unquantize(q08, PARAM.MEAS_QUANTIZATION_FACTOR_8), self.Unquantize(q16, PARAM.MEAS_QUANTIZATION_FACTOR_16), self.Unquantize(q24, PARAM.MEAS_QUANTIZATION_FACTOR_24)
 
     def GetSquaredError(self):
         return (self.MostRecentEstimate - self.MostRecentPosition) * (self.MostRecentEstimate - self.MostRecentPosition)
@@ -74,4 +130,23 @@ class ConsensusController(object):
     
     def GetDecryptedSquaredError(self):
         assert(not PARAM.DO_NOT_ENCRYPT)
-        return (self.DecryptedEstimate - self.MostRecentPosition) * (self.DecryptedEstimate - self.MostRecentPosition)
\ No newline at end of file
+        return (self.DecryptedEstimate - self.MostRecentPosition) * (self.DecryptedEstimate - self.MostRecentPosition)
+    
+    def GetDecryptedQuantizedSquaredErrors(self):
+        assert(not PARAM.DO_NOT_ENCRYPT and self.Packing is not None)
+        error08 = self.DecryptedQ08Estimate - self.MostRecentPosition
+        error16 = self.DecryptedEstimate - self.MostRecentPosition
+        error24 = self.DecryptedQ24Estimate - self.MostRecentPosition
+        return error08 * error08, error16 * error16, error24 * error24
+    
+    def GetAllSquaredErrors(self):
+        '''
+        Returns the squared errors of the most recent estimates in the order of ErrorStatistics.ESTIMATORS (NaN if not available).
+        '''
+        E8, E16, E24 = self.GetQuantizedSquaredErrors()
+        result = [self.GetSquaredError(), E8, E16, E24, nan, nan, nan]
+        if not PARAM.DO_NOT_ENCRYPT:
+            result[4] = self.GetDecryptedSquaredError()
+            if self.Packing is not None:
+                result[5], _, result[6] = self.GetDecryptedQuantizedSquaredErrors()
+        return result
@@ -0,0 +1,128 @@
+'''
+Created on 18.10.2026
+'''
+from math import ceil, log2
+import numpy as np
+from simulation import SimParameters as PARAM
+
+class ConsensusWeightMatrix(object):
+    '''
+    The consensus weight matrix of a sensor grid in a sparse, fixed-width row layout (ELLPACK).
+    Row i holds the own weight of sensor i and the weights of its other neighbors in the order returned by
+    the grid's GetNeighborIDs, padded with zero weights, so that one product reproduces ConSensor's fusion exactly.
+    '''
+
+    def __init__(self, SensorCount, GetNeighborIDs):
+        '''
+        Constructor
+        '''
+        self.SensorCount = SensorCount
+        neighborLists = [[nID for nID in GetNeighborIDs(i) if nID != i] for i in range(SensorCount)]
+        self.NeighborCounts = np.array([len(neighbors) for neighbors in neighborLists], dtype=np.int64)
+        self.RowWidth = int(self.NeighborCounts.max())
+        # Padding slots point at the sensor itself with a zero weight
+        self.NeighborIndices = np.repeat(np.arange(SensorCount, dtype=np.int64)[:, None], self.RowWidth, axis=1)
+        self.SelfWeights = np.zeros(SensorCount, dtype=float)
+        self.NeighborWeights = np.zeros((SensorCount, self.RowWidth), dtype=float)
+        self.QuantizedSelfWeights = np.zeros(SensorCount, dtype=object)
+        self.QuantizedNeighborWeights = np.zeros((SensorCount, self.RowWidth), dtype=object)
+        for i, neighbors in enumerate(neighborLists):
+            selfWeight, neighborWeight, quantizedSelfWeight, quantizedNeighborWeight = self.GetSensorWeights(len(neighbors) + 1)
+            self.SelfWeights[i], self.QuantizedSelfWeights[i] = selfWeight, quantizedSelfWeight
+            self.NeighborIndices[i, :len(neighbors)] = neighbors
+            self.NeighborWeights[i, :len(neighbors)] = neighborWeight
+            self.QuantizedNeighborWeights[i, :len(neighbors)] = quantizedNeighborWeight
+        # The quantized weights fit into int64, too, which allows exact integer products in NumPy lanes
+        self.QuantizedSelfWeightsInt64 = self.QuantizedSelfWeights.astype(np.int64)
+        self.QuantizedNeighborWeightsInt64 = self.QuantizedNeighborWeights.astype(np.int64)
+
+    def GetQuantizedRows(self):
+        '''
+        Returns the quantized weight matrix in compressed sparse row form, i.e., as row offsets, column indices, and weights,
+        with the own weight first in every row.
+        '''
+        offsets, indices, weights = [0], [], []
+        for i in range(self.SensorCount):
+            count = int(self.NeighborCounts[i])
+            indices += [i] + self.NeighborIndices[i, :count].tolist()
+            weights += [self.QuantizedSelfWeights[i]] + self.QuantizedNeighborWeights[i, :count].tolist()
+            offsets.append(len(indices))
+        return offsets, indices, weights
+
+    @staticmethod
+    def GetSensorWeights(NeighborCount):
+        '''
+        Applies the same rule as ConSensor.UpdateNeighborEstimateWeights to a sensor with NeighborCount neighbors (including itself).
+        '''
+        selfWeight = PARAM.OWN_ESTIMATE_WEIGHT
+        neighborWeight = (1.0 - PARAM.OWN_ESTIMATE_WEIGHT) / (NeighborCount - 1)
+        quantizedSelfWeight = int(round(selfWeight * PARAM.WEIGHT_QUANTIZATION_FACTOR, 0))
+        quantizedNeighborWeight = int(round(neighborWeight * PARAM.WEIGHT_QUANTIZATION_FACTOR, 0))
+        # Ensure all quantized weights add up to a single quantization factor
+        quantizedSelfWeight += PARAM.WEIGHT_QUANTIZATION_FACTOR - quantizedSelfWeight - (NeighborCount - 1) * quantizedNeighborWeight
+        return selfWeight, neighborWeight, quantizedSelfWeight, quantizedNeighborWeight
+
+    def Apply(self, Estimates):
+        '''
+        Multiplies the estimates (sensors along the last axis) with the weight matrix.
+        '''
+        result = Estimates * self.SelfWeights
+        for k in range(self.RowWidth):
+            result += self.NeighborWeights[:, k] * Estimates[..., self.NeighborIndices[:, k]]
+        return result
+
+    def ApplyToColumns(self, Estimates):
+        '''
+        Same as Apply, but with the sensors along the first axis, which is much faster for many estimates per sensor.
+        '''
+        result = Estimates * self.SelfWeights[:, None]
+        for k in range(self.RowWidth):
+            result += self.NeighborWeights[:, k, None] * Estimates[self.NeighborIndices[:, k]]
+        return result
+
+    def ApplyQuantized(self, Estimates):
+        '''
+        Multiplies the quantized estimates (sensors along the last axis) with the quantized weight matrix.
+        '''
+        result = Estimates * self.QuantizedSelfWeights
+        for k in range(self.RowWidth):
+            result += self.QuantizedNeighborWeights[:, k] * Estimates[..., self.NeighborIndices[:, k]]
+        return result
+
+    def GetQuantizedBitGrowth(self, RoundCount):
+        '''
+        Returns by how many bits the quantized estimates can grow at most over the specified number of rounds:
+        every round multiplies their magnitude by at most the largest absolute row sum of the quantized weights.
+        '''
+        rowSums = np.abs(self.QuantizedSelfWeightsInt64) + np.abs(self.QuantizedNeighborWeightsInt64).sum(axis=1)
+        return ceil(RoundCount * log2(int(rowSums.max())))
+
+    def ApplyQuantizedResidues(self, Residues, ResidueSystem):
+        '''
+        Multiplies the quantized estimates given as int64 residues (lanes along the first axis, sensors along the last)
+        with the quantized weight matrix, lane by lane.
+        '''
+        result = Residues * self.QuantizedSelfWeightsInt64
+        for k in range(self.RowWidth):
+            result += self.QuantizedNeighborWeightsInt64[:, k] * Residues[..., self.NeighborIndices[:, k]]
+        return ResidueSystem.Reduce(result)
+
+    def ApplyQuantizedTransposed(self, Estimates):
+        '''
+        Multiplies a vector of quantized values with the transposed quantized weight matrix (i.e., a row vector from the left).
+        '''
+        result = Estimates * self.QuantizedSelfWeights
+        for k in range(self.RowWidth):
+            np.add.at(result, self.NeighborIndices[:, k], Estimates * self.QuantizedNeighborWeights[:, k])
+        return result
+
+    def GetQuantizedPowerRow(self, SensorID, Power):
+        '''
+        Returns the row of the sensor in the quantized weight matrix raised to the specified power (as exact Python integers),
+        i.e., the weights with which every quantized measurement contributes to the sensor's estimate after that many rounds.
+        '''
+        result = np.zeros(self.SensorCount, dtype=object)
+        result[SensorID] = 1
+        for _ in range(Power):
+            result = self.ApplyQuantizedTransposed(result)
+        return result
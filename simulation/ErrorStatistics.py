@@ -0,0 +1,118 @@
+'''
+Created on 18.10.2026
+'''
+from math import inf, nan, sqrt
+from statistics import NormalDist
+import numpy as np
+
+class ErrorStatistics(object):
+    '''
+    Streaming statistics of the squared estimation errors, kept per time step, consensus round (round zero being the
+    unfiltered measurement), and estimator as Welford accumulators (count, mean, and sum of squared deviations).
+    They are updated in place, so their size only depends on the number of time steps and rounds, never on the number
+    of runs. Accumulators of different workers are merged with the pairwise formula of Chan et al., which loses nothing
+    compared to accumulating all samples in one place; merging them in a fixed order keeps the results reproducible.
+    Missing samples (e.g., rounds that were not tracked, or encrypted estimators without encryption) are passed as NaN.
+    '''
+
+    # The estimators whose errors are tracked, in the order of the last axis
+    ESTIMATORS = ("Plain", "Q08", "Q16", "Q24", "Encrypted", "EncryptedQ08", "EncryptedQ24")
+
+    def __init__(self, TimeSteps, RoundCount):
+        '''
+        Constructor
+        '''
+        shape = (TimeSteps, RoundCount + 1, len(ErrorStatistics.ESTIMATORS))
+        self.Counts = np.zeros(shape, dtype=np.int64)
+        self.Means = np.zeros(shape, dtype=float)
+        self.SquaredDeviations = np.zeros(shape, dtype=float)
+
+    @staticmethod
+    def GetEstimatorIndex(Estimator):
+        return ErrorStatistics.ESTIMATORS.index(Estimator)
+
+    def Add(self, TimeStep, Round, SquaredErrors):
+        '''
+        Adds one sample per estimator (in the order of ESTIMATORS) to the accumulators of the time step and round.
+        '''
+        values = np.asarray(SquaredErrors, dtype=float)
+        valid = ~np.isnan(values)
+        counts, means = self.Counts[TimeStep, Round], self.Means[TimeStep, Round]
+        counts[valid] += 1
+        delta = values[valid] - means[valid]
+        means[valid] += delta / counts[valid]
+        self.SquaredDeviations[TimeStep, Round, valid] += delta * (values[valid] - means[valid])
+
+    def AddSamples(self, Round, SquaredErrors):
+        '''
+        Adds many samples at once, given as an array of shape (samples, time steps, estimators), to the accumulators of the round.
+        '''
+        values = np.asarray(SquaredErrors, dtype=float)
+        valid = ~np.isnan(values)
+        counts = valid.sum(axis=0)
+        means = np.where(valid, values, 0.0).sum(axis=0) / np.maximum(counts, 1)
+        squaredDeviations = np.where(valid, (values - means) ** 2, 0.0).sum(axis=0)
+        self.Counts[:, Round], self.Means[:, Round], self.SquaredDeviations[:, Round] = ErrorStatistics.Combine(
+            (self.Counts[:, Round], self.Means[:, Round], self.SquaredDeviations[:, Round]), (counts, means, squaredDeviations))
+
+    @staticmethod
+    def Combine(First, Second):
+        '''
+        Returns the (count, mean, sum of squared deviations) arrays of the union of two sets of samples.
+        '''
+        count1, mean1, squaredDeviations1 = First
+        count2, mean2, squaredDeviations2 = Second
+        count = count1 + count2
+        share = np.divide(count2, count, out=np.zeros(np.shape(count), dtype=float), where=count > 0)
+        delta = mean2 - mean1
+        return count, mean1 + delta * share, squaredDeviations1 + squaredDeviations2 + delta * delta * count1 * share
+
+    def Merge(self, Other):
+        '''
+        Adds all samples of another accumulator of the same shape to this one.
+        '''
+        assert(self.Counts.shape == Other.Counts.shape)
+        self.Counts, self.Means, self.SquaredDeviations = ErrorStatistics.Combine(
+            (self.Counts, self.Means, self.SquaredDeviations), (Other.Counts, Other.Means, Other.SquaredDeviations))
+        return self
+
+    @staticmethod
+    def MergeAll(Statistics):
+        '''
+        Merges a list of accumulators in the given order into a new one.
+        '''
+        result = ErrorStatistics(Statistics[0].Counts.shape[0], Statistics[0].Counts.shape[1] - 1)
+        for s in Statistics:
+            result.Merge(s)
+        return result
+
+    def GetPooled(self, Estimator, Round):
+        '''
+        Returns the (count, mean, sum of squared deviations) of one estimator and round over all time steps.
+        '''
+        e = ErrorStatistics.GetEstimatorIndex(Estimator)
+        pooled = (0, 0.0, 0.0)
+        for t in range(self.Counts.shape[0]):
+            pooled = ErrorStatistics.Combine(pooled, (self.Counts[t, Round, e], self.Means[t, Round, e], self.SquaredDeviations[t, Round, e]))
+        return int(pooled[0]), float(pooled[1]), float(pooled[2])
+
+    def GetSampleCount(self, Estimator, Round):
+        return int(self.Counts[:, Round, ErrorStatistics.GetEstimatorIndex(Estimator)].sum())
+
+    def GetRootMeanSquaredErrors(self, Estimator):
+        '''
+        Returns the RMSE of an estimator per time step and round (NaN where there are no samples).
+        '''
+        e = ErrorStatistics.GetEstimatorIndex(Estimator)
+        return np.sqrt(np.where(self.Counts[:, :, e] > 0, self.Means[:, :, e], np.nan))
+
+    def GetRootMeanSquaredError(self, Estimator, Round, Confidence = 0.95):
+        '''
+        Returns the RMSE of an estimator after the specified round over all time steps, with the bounds of its confidence
+        interval (from the normal approximation of the mean squared error), or NaNs if there are no samples.
+        '''
+        count, mean, squaredDeviations = self.GetPooled(Estimator, Round)
+        if count == 0:
+            return nan, nan, nan
+        halfWidth = NormalDist().inv_cdf((1 + Confidence) / 2) * sqrt(squaredDeviations / (count - 1) / count) if count > 1 else inf
+        return sqrt(mean), sqrt(max(mean - halfWidth, 0.0)), sqrt(mean + halfWidth)
@@ -0,0 +1,74 @@
+'''
+Created on 18.10.2026
+'''
+import multiprocessing as mp
+import random
+import numpy as np
+
+class MonteCarloScheduler(object):
+    '''
+    Splits a Monte Carlo campaign into small chunks of runs and hands them out to a process pool on demand,
+    so that fast workers simply take more chunks. Every chunk gets its own seed derived from the base seed
+    and the chunk index, and the partial results are collected in chunk order, so that the merged result
+    for a fixed seed is bit-identical no matter how many workers take part.
+    '''
+
+    def __init__(self, TotalRuns, RunsPerChunk, BaseSeed):
+        '''
+        Constructor
+        '''
+        assert(TotalRuns > 0 and RunsPerChunk > 0)
+        self.TotalRuns = TotalRuns
+        self.Chunks = [(i, min(RunsPerChunk, TotalRuns - start), MonteCarloScheduler.GetChunkSeed(BaseSeed, i))
+                       for i, start in enumerate(range(0, TotalRuns, RunsPerChunk))]
+
+    @staticmethod
+    def GetChunkSeed(BaseSeed, ChunkIndex):
+        return int(np.random.SeedSequence([BaseSeed, ChunkIndex]).generate_state(1)[0])
+
+    @staticmethod
+    def SeedRandomNumberGenerators(Seed):
+        np.random.seed(Seed)
+        random.seed(Seed)
+
+    def Run(self, ChunkFunction, Initializer, ProcessCount = 1, OnChunkDone = None, Checkpoint = None, Pool = None):
+        '''
+        Runs ChunkFunction((index, runs, seed)) -> (index, result) for every chunk, after running Initializer once per process,
+        and returns the results in chunk order. OnChunkDone(finishedRuns, totalRuns) is called in this process after every chunk.
+        With a CampaignCheckpoint, the chunks it already holds are skipped, every new result is added to it instead of
+        being kept in the list, and its merged result is returned. An existing Pool (whose processes must already be initialized)
+        is used instead of a new one and stays open.
+        '''
+        results = [None] * len(self.Chunks) if Checkpoint is None else None
+        chunks = [c for c in self.Chunks if Checkpoint is None or not Checkpoint.IsFinished(c[0])]
+        finishedRuns = self.TotalRuns - sum(runs for _, runs, _ in chunks)
+        if not chunks:
+            return results if Checkpoint is None else Checkpoint.GetResult()
+        if Pool is not None:
+            chunkResults = Pool.imap_unordered(ChunkFunction, chunks, chunksize=1)
+            pool = None
+        elif ProcessCount <= 1:
+            Initializer()
+            chunkResults = map(ChunkFunction, chunks)
+            pool = None
+        else:
+            pool = mp.Pool(ProcessCount, initializer=Initializer)
+            chunkResults = pool.imap_unordered(ChunkFunction, chunks, chunksize=1)
+        try:
+            for index, result in chunkResults:
+                if Checkpoint is None:
+                    results[index] = result
+                else:
+                    Checkpoint.Add(index, result)
+                finishedRuns += self.Chunks[index][1]
+                if OnChunkDone is not None:
+                    OnChunkDone(finishedRuns, self.TotalRuns)
+        except BaseException:
+            if pool is not None:
+                pool.terminate()
+            raise
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+        return results if Checkpoint is None else Checkpoint.GetResult()
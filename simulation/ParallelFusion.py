@@ -0,0 +1,84 @@
+'''
+Created on 18.10.2026
+'''
+import multiprocessing as mp
+import weakref
+from multiprocessing.shared_memory import SharedMemory
+from encryption import GetCryptosystem
+
+# The cryptosystem, key, neighbor structure, and shared buffers of a worker process (set up once by InitializeFusionWorker)
+workerState = None
+
+def InitializeFusionWorker(Cryptosystem, pk, Offsets, NeighborIDs, Weights, CiphertextByteLength, BufferNames):
+    global workerState
+    buffers = [SharedMemory(name=name) for name in BufferNames]
+    workerState = (Cryptosystem, Cryptosystem.PublicKey.From(pk), Offsets, NeighborIDs, Weights, CiphertextByteLength, buffers)
+
+def ReadCiphertext(Buffer, Index, ByteLength):
+    return int.from_bytes(Buffer.buf[Index * ByteLength:(Index + 1) * ByteLength], "little")
+
+def WriteCiphertext(Buffer, Index, ByteLength, Ciphertext):
+    Buffer.buf[Index * ByteLength:(Index + 1) * ByteLength] = Ciphertext.to_bytes(ByteLength, "little")
+
+# Fuses the encrypted estimates of the sensors start, ..., stop - 1 from the source buffer into the target buffer
+def FuseBlock(Block):
+    start, stop = Block
+    cryptosystem, pk, offsets, neighborIDs, weights, byteLength, (source, target) = workerState
+    # Decode every ciphertext the block needs only once (for a grid, these are the block's sensors plus the adjacent rows)
+    blockIDs = neighborIDs[offsets[start]:offsets[stop]]
+    first = min(blockIDs)
+    decoded = [ReadCiphertext(source, j, byteLength) for j in range(first, max(blockIDs) + 1)]
+    for i in range(start, stop):
+        ciphertexts = [decoded[j - first] for j in neighborIDs[offsets[i]:offsets[i + 1]]]
+        WriteCiphertext(target, i, byteLength, cryptosystem.WeightedSum(pk, ciphertexts, weights[offsets[i]:offsets[i + 1]]))
+    return Block
+
+class ParallelFusionExecutor(object):
+    '''
+    Fuses the encrypted estimates of all sensors of a grid for one consensus round in a persistent pool of worker processes.
+    The homomorphic weighted sums of different sensors are independent, so the sensors are split into contiguous blocks,
+    which the workers take on demand. The ciphertexts travel through two shared memory buffers of fixed-width byte strings
+    (one for the current and one for the fused estimates), so only the block bounds go through the pool's pipes.
+    The neighbor structure is given in compressed sparse row form: sensor i fuses the ciphertexts of the sensors
+    NeighborIDs[Offsets[i]:Offsets[i + 1]] with the quantized weights at the same positions.
+    '''
+
+    def __init__(self, pk, Offsets, NeighborIDs, Weights, ProcessCount, BlocksPerProcess = 4):
+        '''
+        Constructor
+        '''
+        cryptosystem = GetCryptosystem(pk)
+        self.SensorCount = len(Offsets) - 1
+        self.CiphertextByteLength = (cryptosystem.GetCiphertextModulus(pk).bit_length() + 7) // 8
+        blockSize = max(1, -(-self.SensorCount // (ProcessCount * BlocksPerProcess)))
+        self.Blocks = [(start, min(start + blockSize, self.SensorCount)) for start in range(0, self.SensorCount, blockSize)]
+        self.Buffers = [SharedMemory(create=True, size=self.SensorCount * self.CiphertextByteLength) for _ in range(2)]
+        # The neighbor structure and the key are sent to every worker only once
+        initArguments = (cryptosystem, tuple(pk), [int(o) for o in Offsets], [int(j) for j in NeighborIDs], [int(w) for w in Weights],
+                         self.CiphertextByteLength, [b.name for b in self.Buffers])
+        self.Pool = mp.Pool(ProcessCount, initializer=InitializeFusionWorker, initargs=initArguments)
+        # Shut the pool down and free the buffers when the executor is closed or garbage-collected
+        self.Finalizer = weakref.finalize(self, ParallelFusionExecutor.Release, self.Pool, self.Buffers)
+
+    @staticmethod
+    def Release(Pool, Buffers):
+        Pool.terminate()
+        Pool.join()
+        for b in Buffers:
+            b.close()
+            b.unlink()
+
+    def Close(self):
+        self.Finalizer()
+
+    def Fuse(self, Ciphertexts):
+        '''
+        Returns the fused ciphertexts of all sensors, given their current ones.
+        '''
+        assert(len(Ciphertexts) == self.SensorCount)
+        source, target = self.Buffers
+        for i, c in enumerate(Ciphertexts):
+            WriteCiphertext(source, i, self.CiphertextByteLength, c)
+        for _ in self.Pool.imap_unordered(FuseBlock, self.Blocks):
+            pass
+        return [ReadCiphertext(target, i, self.CiphertextByteLength) for i in range(self.SensorCount)]
@@ -0,0 +1,86 @@
+'''
+Created on 18.10.2026
+'''
+import itertools
+import multiprocessing as mp
+from functools import partial
+from simulation import SimParameters as PARAM
+from simulation.CampaignCheckpoint import CampaignCheckpoint
+from simulation.ErrorStatistics import ErrorStatistics
+from simulation.MonteCarloScheduler import MonteCarloScheduler
+
+class ParameterSet(tuple):
+    '''
+    An immutable (and hashable) set of settings that override SimParameters, held as sorted (name, value) pairs.
+    '''
+    __slots__ = ()
+
+    def __new__(cls, Settings):
+        return tuple.__new__(cls, sorted(dict(Settings).items()))
+
+    def AsDict(self):
+        return dict(self)
+
+    def __repr__(self):
+        return ", ".join("%s=%r" % item for item in self)
+
+class ParameterSweep(object):
+    '''
+    Expands a grid of parameter values ({name: [values]}) into ParameterSets, applies each of them on top of the settings
+    that were current when the sweep was created (see SimParameters.Apply), and runs a Monte Carlo campaign for each
+    on one shared process pool. Every campaign keeps its CampaignCheckpoint in the result directory under the
+    fingerprint of its settings, so that file doubles as a content-addressed result cache: running a sweep again
+    only simulates the points (and chunks) that are not there yet, and any sweep that contains the same point reuses it.
+    '''
+
+    def __init__(self, ParameterGrid, ResultDirectory):
+        '''
+        Constructor
+        '''
+        self.BaseSettings = PARAM.GetSettings()
+        self.ResultDirectory = ResultDirectory
+        names = sorted(ParameterGrid)
+        self.ParameterSets = [ParameterSet(zip(names, values)) for values in itertools.product(*(ParameterGrid[name] for name in names))]
+
+    @staticmethod
+    def ApplyParameterSet(BaseSettings, Parameters):
+        PARAM.Restore(BaseSettings)
+        PARAM.Apply(Parameters.AsDict())
+
+    def GetResultFileName(self, Fingerprint):
+        return CampaignCheckpoint.GetFileName(self.ResultDirectory, Fingerprint)
+
+    def Run(self, ChunkFunction, Initializer, ProcessCount = 1, PrepareCampaign = None, OnCampaignDone = None, Merge = ErrorStatistics.Merge):
+        '''
+        Runs ChunkFunction(parameters, (index, runs, seed)) -> (index, result) for all missing chunks of every point,
+        after running Initializer(baseSettings) once per process, and returns a list of (parameters, result) pairs, where
+        Merge(a, b) merges the results of consecutive chunks (by default, they are ErrorStatistics).
+        The chunk function has to apply the parameters (see ApplyParameterSet) before simulating.
+        PrepareCampaign() is called in this process, with the point's settings applied, before its chunks are handed out
+        (e.g., to generate the key pair once for all workers), and OnCampaignDone(parameters, result) after each point.
+        '''
+        pool = mp.Pool(ProcessCount, initializer=Initializer, initargs=(self.BaseSettings,)) if ProcessCount > 1 else None
+        results = []
+        try:
+            for parameters in self.ParameterSets:
+                ParameterSweep.ApplyParameterSet(self.BaseSettings, parameters)
+                fingerprint = PARAM.GetFingerprint()
+                scheduler = MonteCarloScheduler(PARAM.TOTAL_RUNS, PARAM.RUNS_PER_CHUNK, PARAM.RANDOM_SEED)
+                checkpoint = CampaignCheckpoint(self.GetResultFileName(fingerprint), fingerprint, scheduler.Chunks, Merge)
+                if not checkpoint.IsComplete() and PrepareCampaign is not None:
+                    PrepareCampaign()
+                result = scheduler.Run(partial(ChunkFunction, parameters), partial(Initializer, self.BaseSettings),
+                                       ProcessCount, Checkpoint=checkpoint, Pool=pool)
+                results.append((parameters, result))
+                if OnCampaignDone is not None:
+                    OnCampaignDone(parameters, result)
+        except BaseException:
+            if pool is not None:
+                pool.terminate()
+            raise
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+            PARAM.Restore(self.BaseSettings)
+        return results
@@ -0,0 +1,152 @@
+'''
+Created on 18.10.2026
+'''
+import functools
+import importlib
+import time
+
+class Profiler(object):
+    '''
+    Per-phase timers and operation counters for the grids, the sensors, the controller, and the cryptosystems.
+    Install() wraps the methods listed in PHASES and COUNTERS (in their classes, so every instance is covered) and
+    Uninstall() puts the original methods back; without an installed profiler, the simulation runs exactly the same code
+    as before and pays nothing. The times of nested phases (e.g., the encryptions within the measurements) are inclusive.
+    Work done by the processes of a parallel fusion pool or a randomness pool is timed as a whole (if at all), but its
+    operations are not counted.
+    The profilers of different chunks or workers add up with Merge.
+    '''
+
+    # The timed phases in the order of the simulation: (phase, module, owner, method); the owner is a class or the module
+    PHASES = (
+        ("measurement noise", "simulation.ConSensor", "ConSensor", "GetMeasurement"),
+        ("measurement quantization", "simulation.ConSensor", "ConSensor", "QuantizeMeasurement"),
+        ("measurement quantization", "simulation.VectorizedConSensorGrid", "VectorizedConSensorGrid", "QuantizeMeasurements"),
+        ("encryption", "encryption.Paillier", "PaillierCryptosystem", "Encrypt"),
+        ("encryption", "encryption.DamgardJurik", "DamgardJurikCryptosystem", "Encrypt"),
+        ("grid measurements", "simulation.ConSensorGrid", "ConSensorGrid", "TakeAllMeasurements"),
+        ("grid measurements", "simulation.VectorizedConSensorGrid", "VectorizedConSensorGrid", "TakeAllMeasurements"),
+        ("message passing", "simulation.ConSensor", "ConSensor", "SendCurrentEstimateToNeighbors"),
+        ("plaintext fusion", "simulation.ConSensor", "ConSensor", "FuseNeighborEstimates"),
+        ("quantized fusion", "simulation.ConSensor", "ConSensor", "FuseQuantizedNeighborEstimates"),
+        ("encrypted fusion", "simulation.ConSensor", "ConSensor", "FuseEncryptedNeighborEstimates"),
+        ("encrypted fusion", "simulation.VectorizedConSensorGrid", "VectorizedConSensorGrid", "FuseEncryptedEstimates"),
+        ("encrypted fusion", "simulation.ParallelFusion", "ParallelFusionExecutor", "Fuse"),
+        ("grid consensus rounds", "simulation.ConSensorGrid", "ConSensorGrid", "ExecuteConsensusRound"),
+        ("grid consensus rounds", "simulation.VectorizedConSensorGrid", "VectorizedConSensorGrid", "ExecuteConsensusRound"),
+        ("decryption", "simulation.ConsensusController", "ConsensusController", "DecryptAndUnquantize"),
+        ("decryption", "simulation.ConsensusController", "ConsensusController", "DecryptAndUnquantizePacked"),
+    )
+
+    # The counted operations: (counter, module, owner, method, how many operations one call makes (None means one));
+    # homomorphic multiplications are the ciphertext-by-plaintext products of Mult and of the weighted sums (one per term
+    # of a multi-exponentiation), exponentiations are the modular exponentiations of the homomorphic operations, encryptions
+    # (g^m unless g = n + 1, and the noise factors), and decryptions (two with the CRT), except for precomputed tables,
+    # and modules import ModularIntegerInverse by name, so every module that uses it has its own entry
+    COUNTERS = (
+        ("encryptions", "encryption.Paillier", "PaillierCryptosystem", "Encrypt", None),
+        ("encryptions", "encryption.DamgardJurik", "DamgardJurikCryptosystem", "Encrypt", None),
+        ("decryptions", "encryption.Paillier", "PaillierCryptosystem", "Decrypt", None),
+        ("decryptions", "encryption.DamgardJurik", "DamgardJurikCryptosystem", "Decrypt", None),
+        ("homomorphic multiplications", "encryption.Paillier", "PaillierCryptosystem", "Mult", None),
+        ("homomorphic multiplications", "encryption.DamgardJurik", "DamgardJurikCryptosystem", "Mult", None),
+        ("homomorphic multiplications", "encryption.Paillier", "PaillierCryptosystem", "MultiExponentiation", lambda terms, modulus: len(terms)),
+        ("exponentiations", "encryption.Paillier", "PaillierCryptosystem", "Mult", lambda pk, c, w: int(w != 0)),
+        ("exponentiations", "encryption.DamgardJurik", "DamgardJurikCryptosystem", "Mult", lambda pk, c, w: int(w != 0)),
+        ("exponentiations", "encryption.Paillier", "PaillierCryptosystem", "MultiExponentiation", lambda terms, modulus: int(len(terms) > 0)),
+        ("exponentiations", "encryption.Paillier", "PaillierCryptosystem", "Encrypt", lambda pk, m: int(pk[1] != pk[0] + 1)),
+        ("exponentiations", "encryption.Paillier", "PaillierCryptosystem", "GetFreshNoiseFactor", None),
+        ("exponentiations", "encryption.FixedBase", "FixedBaseExponentiator", "Pow", None),
+        ("exponentiations", "encryption.RandomnessPool", None, "GenerateNoiseFactors", lambda n, count: count),
+        ("exponentiations", "encryption.DamgardJurik", "DamgardJurikCryptosystem", "GetNoiseFactor", None),
+        ("exponentiations", "encryption.Paillier", "PaillierCryptosystem", "Decrypt", lambda sk, c: int(len(sk) == 3)),
+        ("exponentiations", "encryption.Paillier", "PaillierCryptosystem", "DecryptCRT", lambda sk, c: 2),
+        ("exponentiations", "encryption.DamgardJurik", "DamgardJurikCryptosystem", "Decrypt", None),
+        ("inversions", "encryption.Paillier", None, "ModularIntegerInverse", None),
+        ("inversions", "encryption.DamgardJurik", None, "ModularIntegerInverse", None),
+        ("messages", "simulation.ConSensor", "ConSensor", "SendCurrentEstimateToNeighbors", lambda sensor: len(sensor.SendTargets)),
+        ("messages", "simulation.VectorizedConSensorGrid", "VectorizedConSensorGrid", "ExecuteConsensusRound", lambda grid: int(grid.Weights.NeighborCounts.sum())),
+    )
+
+    def __init__(self):
+        '''
+        Constructor
+        '''
+        self.Times, self.Calls, self.Counts = {}, {}, {}
+        self.Originals = []
+
+    def Install(self):
+        assert(not self.Originals)
+        hooks = {}
+        for phase, moduleName, ownerName, method in Profiler.PHASES:
+            hooks.setdefault((moduleName, ownerName, method), [None, []])[0] = phase
+        for counter, moduleName, ownerName, method, operations in Profiler.COUNTERS:
+            hooks.setdefault((moduleName, ownerName, method), [None, []])[1].append((counter, operations))
+        for (moduleName, ownerName, method), (phase, counters) in hooks.items():
+            module = importlib.import_module(moduleName)
+            owner = module if ownerName is None else getattr(module, ownerName)
+            # Look the method up in the owner itself, so that static methods stay static and inherited methods are not copied
+            original = vars(owner)[method]
+            if isinstance(original, staticmethod):
+                wrapped = staticmethod(self.Wrap(original.__func__, phase, counters))
+            else:
+                wrapped = self.Wrap(original, phase, counters)
+            setattr(owner, method, wrapped)
+            self.Originals.append((owner, method, original))
+
+    def Uninstall(self):
+        for owner, method, original in reversed(self.Originals):
+            setattr(owner, method, original)
+        self.Originals = []
+
+    def Wrap(self, Function, Phase, Counters):
+        times, calls, counts, clock = self.Times, self.Calls, self.Counts, time.perf_counter
+        @functools.wraps(Function)
+        def Wrapper(*args, **kwargs):
+            for counter, operations in Counters:
+                counts[counter] = counts.get(counter, 0) + (1 if operations is None else operations(*args))
+            if Phase is None:
+                return Function(*args, **kwargs)
+            start = clock()
+            try:
+                return Function(*args, **kwargs)
+            finally:
+                times[Phase] = times.get(Phase, 0.0) + clock() - start
+                calls[Phase] = calls.get(Phase, 0) + 1
+        return Wrapper
+
+    def Reset(self):
+        # Clear the dictionaries in place, since the installed wrappers hold on to them
+        self.Times.clear()
+        self.Calls.clear()
+        self.Counts.clear()
+
+    def Copy(self):
+        '''
+        Returns a profiler with the current times and counts that is not installed (and can be pickled).
+        '''
+        result = Profiler()
+        result.Times, result.Calls, result.Counts = dict(self.Times), dict(self.Calls), dict(self.Counts)
+        return result
+
+    def Merge(self, Other):
+        '''
+        Adds the times and counts of another profiler to this one.
+        '''
+        for own, other in ((self.Times, Other.Times), (self.Calls, Other.Calls), (self.Counts, Other.Counts)):
+            for name, value in other.items():
+                own[name] = own.get(name, 0) + value
+        return self
+
+    def GetReport(self):
+        '''
+        Returns the lines of a report of all phases (in the order of the simulation) and counters that occurred.
+        '''
+        lines = []
+        for phase in dict.fromkeys(phase for phase, _, _, _ in Profiler.PHASES):
+            if phase in self.Calls:
+                lines.append("  %-28s %10.3f s in %9d calls (%9.1f us per call)" % (phase, self.Times[phase], self.Calls[phase],
+                                                                                       self.Times[phase] / self.Calls[phase] * 1e6))
+        for counter in dict.fromkeys(counter for counter, _, _, _, _ in Profiler.COUNTERS):
+            if counter in self.Counts:
+                lines.append("  %-28s %10d" % (counter, self.Counts[counter]))
+        return lines
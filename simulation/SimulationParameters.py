@@ -3,6 +3,8 @@ Created on 30.05.2018
 
 @author: Mikhail Aristov
 '''
+import hashlib
+import os
 
 class SimParameters(object):
     '''
@@ -15,9 +17,60 @@ class SimParameters(object):
     # Whether to actually encrypt communications (or to just evaluate the quantization, for performance reasons)
     DO_NOT_ENCRYPT = False
     
+    # Whether to pack the 8-, 16-, and 24-bit quantized estimates into the slots of one ciphertext (requires a larger key:
+    # at the default 192-bit PLAINTEXT_MODULUS_BIT_SIZE, the modulus grows to about 582 bits, which makes an encrypted campaign
+    # about six times slower than without packing, where only the 16-bit estimate is encrypted)
+    PACK_QUANTIZED_ESTIMATES = False
+    
+    # Whether to hold all sensor states in NumPy arrays instead of one object per sensor (same results, much faster)
+    VECTORIZED_GRID = False
+    
+    # Whether the vectorized grid should only compute the encrypted estimate of a sensor when the controller reads it,
+    # as one homomorphic weighted sum over its dependency cone, instead of fusing all encrypted estimates every round
+    LAZY_ENCRYPTED_CONSENSUS = False
+    
+    # How many worker processes fuse the encrypted estimates of a single grid within every consensus round (one means
+    # no pool); only possible in the main process, i.e., for a single long trajectory rather than alongside TRY_MULTIPROCESSING
+    PARALLEL_FUSION_PROCESS_COUNT = 1
+    
+    # How many precomputed encryption noise factors to keep per key (zero disables the randomness pool)
+    RANDOMNESS_POOL_HIGH_WATER_MARK = 0
+    
+    # How many worker processes refill the randomness pool (zero refills it in a thread of the simulating process, which
+    # competes with the encryptions for the interpreter lock); not possible within worker processes of TRY_MULTIPROCESSING
+    RANDOMNESS_POOL_PROCESS_COUNT = 1
+    
+    # Whether to simulate many runs at once as arrays (only possible with DO_NOT_ENCRYPT, same results, much faster)
+    BATCHED_SIMULATION = False
+    
+    # How many runs the batched simulation processes at once (small batches keep the arrays in the CPU cache)
+    BATCHED_SIMULATION_BATCH_SIZE = 20
+    
+    # Whether to record the estimation errors after every consensus round, not just before and after filtering
+    # (the controller then also fetches and, with encryption, decrypts an estimate after every round)
+    TRACK_ERRORS_PER_ROUND = False
+    
+    # Whether to time the phases of the simulation and count the cryptographic operations and messages (see Profiler),
+    # which RunSimulation reports at the end; nothing is instrumented otherwise
+    PROFILING = False
+    
     # How many runs in total the simulation should include
     TOTAL_RUNS = 1000
     
+    # Where RunSimulation keeps the progress of every campaign under the fingerprint of its settings, so that it can resume
+    # after a crash (None disables checkpoints); running a finished campaign again just reports it again
+    CHECKPOINT_DIRECTORY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".checkpoints")
+    
+    # The version of the chunk results that checkpoints and cached sweep results hold (2: error statistics and profile);
+    # it is part of the fingerprint, so files of another version are never resumed from
+    RESULT_FORMAT_VERSION = 2
+    
+    # How many runs are handed out to a worker process at once
+    RUNS_PER_CHUNK = 10
+    
+    # The base seed from which every chunk of runs derives its own seed
+    RANDOM_SEED = 2018
+    
     # How many agent runs in total the simulation should include
     TIME_STEPS_PER_RUN = 50
     
@@ -35,8 +88,15 @@ class SimParameters(object):
     # The length of the encryption key (for test purposes only, no real security guarantee!)
     PLAINTEXT_MODULUS_BIT_SIZE = 192 # bits
     
-    # How many rounds the consensus filter runs for (dependent on the bit sizes of the plaintext modulus, measurements, and weights)
-    CONSENSUS_ROUND_COUNT = int((PLAINTEXT_MODULUS_BIT_SIZE - MEAS_BIT_SIZE) / WEIGHT_BIT_SIZE)
+    # The Damgard-Jurik exponent s: plaintexts live modulo n^s, which offers s times the plaintext bits for the same
+    # key length (s = 1 is plain Paillier; for s > 1, ciphertexts live modulo n^(s + 1) instead of n^2)
+    DAMGARD_JURIK_S = 1
+    
+    # Where generated keys are cached between runs and shared with worker processes (None keeps them in memory only)
+    KEY_STORE_DIRECTORY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".keys")
+    
+    # How many rounds the consensus filter runs for (dependent on the bit sizes of the plaintext modulus n^s, measurements, and weights)
+    CONSENSUS_ROUND_COUNT = int((PLAINTEXT_MODULUS_BIT_SIZE * DAMGARD_JURIK_S - MEAS_BIT_SIZE) / WEIGHT_BIT_SIZE)
     
     # Where the simulated system is placed at time step zero
     SYSTEM_INITIAL_STATE = 100.0
@@ -51,4 +111,48 @@ class SimParameters(object):
     SENSOR_MEASUREMENT_VARIANCE = 5.0
     
     # The relative weight of the sensor's own estimate during estimate fusion
-    OWN_ESTIMATE_WEIGHT = 0.2 # interval: [0.0, 1.0]
\ No newline at end of file
+    OWN_ESTIMATE_WEIGHT = 0.2 # interval: [0.0, 1.0]
+    
+    # The settings that only affect how or where a campaign runs, but not its results
+    # (the batch size of the batched simulation only changes the order in which the statistics are accumulated)
+    EXECUTION_SETTINGS = ("TRY_MULTIPROCESSING", "VECTORIZED_GRID", "LAZY_ENCRYPTED_CONSENSUS", "PARALLEL_FUSION_PROCESS_COUNT",
+                          "RANDOMNESS_POOL_HIGH_WATER_MARK", "RANDOMNESS_POOL_PROCESS_COUNT", "BATCHED_SIMULATION_BATCH_SIZE",
+                          "PROFILING", "KEY_STORE_DIRECTORY", "CHECKPOINT_DIRECTORY", "EXECUTION_SETTINGS")
+    
+    @classmethod
+    def GetFingerprint(cls):
+        '''
+        Returns a hash of all settings that affect the results of a campaign (i.e., all but EXECUTION_SETTINGS).
+        '''
+        settings = sorted((name, repr(value)) for name, value in vars(cls).items() if name.isupper() and name not in cls.EXECUTION_SETTINGS)
+        return hashlib.sha256(repr(settings).encode("utf-8")).hexdigest()
+    
+    @classmethod
+    def GetSettings(cls):
+        '''
+        Returns all current settings as a dict.
+        '''
+        return {name: value for name, value in vars(cls).items() if name.isupper()}
+    
+    @classmethod
+    def Restore(cls, Settings):
+        '''
+        Sets all settings back to the values of a dict returned by GetSettings.
+        '''
+        for name, value in Settings.items():
+            setattr(cls, name, value)
+    
+    @classmethod
+    def Apply(cls, Overrides):
+        '''
+        Changes the specified settings and recomputes the settings that derive from them, unless those are overridden, too.
+        '''
+        for name, value in Overrides.items():
+            assert(name.isupper() and hasattr(cls, name)), name
+            setattr(cls, name, value)
+        if "WEIGHT_QUANTIZATION_FACTOR" not in Overrides:
+            cls.WEIGHT_QUANTIZATION_FACTOR = 2 ** cls.WEIGHT_BIT_PRECISION
+        if "WEIGHT_BIT_SIZE" not in Overrides:
+            cls.WEIGHT_BIT_SIZE = cls.WEIGHT_BIT_PRECISION + 1
+        if "CONSENSUS_ROUND_COUNT" not in Overrides:
+            cls.CONSENSUS_ROUND_COUNT = int((cls.PLAINTEXT_MODULUS_BIT_SIZE * cls.DAMGARD_JURIK_S - cls.MEAS_BIT_SIZE) / cls.WEIGHT_BIT_SIZE)
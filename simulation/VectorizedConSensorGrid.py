@@ -0,0 +1,161 @@
+'''
+Created on 18.10.2026
+'''
+import numpy as np
+from numpy.random import normal as Gauss
+from encryption import Paillier, GetCryptosystem
+from simulation import SimParameters as PARAM
+from simulation.ConSensorGrid import ConSensorGrid
+from simulation.ConsensusWeights import ConsensusWeightMatrix
+from utility import ResidueNumberSystem
+
+class VectorizedSensorView(object):
+    '''
+    A lightweight stand-in for a ConSensor that reads its state from the vectorized grid's arrays.
+    '''
+    __slots__ = ("MyGrid", "MyID")
+
+    def __init__(self, Grid, SensorID):
+        self.MyGrid = Grid
+        self.MyID = SensorID
+
+    @property
+    def MostRecentEstimate(self):
+        return float(self.MyGrid.Estimates[self.MyID])
+
+    @property
+    def Q08MostRecentEstimate(self):
+        return self.MyGrid.GetQuantizedEstimate(self.MyGrid.Q08Residues, self.MyID)
+
+    @property
+    def Q16MostRecentEstimate(self):
+        return self.MyGrid.GetQuantizedEstimate(self.MyGrid.Q16Residues, self.MyID)
+
+    @property
+    def Q24MostRecentEstimate(self):
+        return self.MyGrid.GetQuantizedEstimate(self.MyGrid.Q24Residues, self.MyID)
+
+    @property
+    def EncMostRecentEstimate(self):
+        return self.MyGrid.GetEncryptedEstimate(self.MyID)
+
+class VectorizedConSensorGrid(ConSensorGrid):
+    '''
+    A drop-in replacement for ConSensorGrid that keeps all sensor states in NumPy arrays
+    and performs every consensus round as one sparse weight-matrix product.
+    The quantized estimates are held exactly as int64 residues (see ResidueNumberSystem), sized for the worst-case
+    growth over CONSENSUS_ROUND_COUNT rounds, and only turned into full integers when a sensor's estimate is read.
+    With LAZY_ENCRYPTED_CONSENSUS, the encrypted measurements are not fused round by round at all. Since consensus is
+    linear, a sensor's encrypted estimate after K rounds is computed only when it is read, as one homomorphic weighted sum
+    of the encrypted measurements in its dependency cone with the sensor's row of the K-th power of the weight matrix.
+    '''
+
+    def __init__(self, GridSize):
+        '''
+        Constructor
+        '''
+        self.SensorCount, self.MySizeX, self.MySizeY = GridSize[0] * GridSize[1], GridSize[0], GridSize[1]
+        self.MySensors = [VectorizedSensorView(self, i) for i in range(self.SensorCount)]
+        self.Weights = ConsensusWeightMatrix(self.SensorCount, self.GetNeighborIDs)
+        self.pk, self.Packing, self.Cryptosystem = None, None, Paillier
+        self.FusionExecutor = None
+        # Sensor states
+        self.Measurements = np.zeros(self.SensorCount, dtype=float)
+        self.Estimates = np.zeros(self.SensorCount, dtype=float)
+        self.Residues = ResidueNumberSystem(PARAM.MEAS_BIT_SIZE + self.Weights.GetQuantizedBitGrowth(PARAM.CONSENSUS_ROUND_COUNT))
+        self.Q08Residues = self.Residues.ToResidues(np.zeros(self.SensorCount, dtype=np.int64))
+        self.Q16Residues = self.Residues.ToResidues(np.zeros(self.SensorCount, dtype=np.int64))
+        self.Q24Residues = self.Residues.ToResidues(np.zeros(self.SensorCount, dtype=np.int64))
+        self.RoundsSinceMeasurement = 0
+        self.EncryptedEstimates = [0] * self.SensorCount
+        # Lazy encrypted consensus: the cached dependency cones per (sensor, rounds), and the estimates computed since the last round
+        self.LazyEncryptedConsensus = PARAM.LAZY_ENCRYPTED_CONSENSUS
+        self.DependencyCones = {}
+        self.LazyEncryptedEstimates = {}
+
+    def DistributePublicKey(self, pk, Packing = None):
+        self.Cryptosystem = GetCryptosystem(pk)
+        self.pk = self.Cryptosystem.PublicKey.From(pk)
+        self.Packing = Packing
+        if not self.LazyEncryptedConsensus:
+            self.StartParallelFusion(self.pk, *self.Weights.GetQuantizedRows())
+
+    def QuantizeMeasurements(self, QuantizationFactor):
+        result = np.rint(self.Measurements * QuantizationFactor).astype(np.int64)
+        assert(np.all(np.abs(result) < 2 ** PARAM.MEAS_BIT_SIZE))
+        return result
+
+    def GetQuantizedEstimate(self, Residues, SensorID):
+        return self.Residues.FromResidues(Residues[:, SensorID])
+
+    def GetDependencyCone(self, SensorID, RoundCount):
+        '''
+        Returns the IDs of the sensors whose measurements contribute to the sensor's estimate after the specified number
+        of rounds, together with their (exact, quantized) weights.
+        '''
+        key = (SensorID, RoundCount)
+        if key not in self.DependencyCones:
+            row = self.Weights.GetQuantizedPowerRow(SensorID, RoundCount)
+            coneIDs = [j for j in range(self.SensorCount) if row[j] != 0]
+            self.DependencyCones[key] = (coneIDs, [row[j] for j in coneIDs])
+        return self.DependencyCones[key]
+
+    def GetEncryptedEstimate(self, SensorID):
+        if not self.LazyEncryptedConsensus or self.RoundsSinceMeasurement == 0:
+            return self.EncryptedEstimates[SensorID]
+        # The encrypted estimates still hold the encrypted measurements, so fuse the sensor's dependency cone at once
+        if SensorID not in self.LazyEncryptedEstimates:
+            coneIDs, weights = self.GetDependencyCone(SensorID, self.RoundsSinceMeasurement)
+            self.LazyEncryptedEstimates[SensorID] = self.Cryptosystem.WeightedSum(self.pk, [self.EncryptedEstimates[j] for j in coneIDs], weights)
+        return self.LazyEncryptedEstimates[SensorID]
+
+    def TakeAllMeasurements(self, RealPos):
+        self.Measurements = Gauss(RealPos, PARAM.SENSOR_MEASUREMENT_VARIANCE, size=self.SensorCount)
+        self.Estimates = self.Measurements.copy()
+        # Quantize and encrypt them, too
+        q08 = self.QuantizeMeasurements(PARAM.MEAS_QUANTIZATION_FACTOR_8)
+        q16 = self.QuantizeMeasurements(PARAM.MEAS_QUANTIZATION_FACTOR_16)
+        q24 = self.QuantizeMeasurements(PARAM.MEAS_QUANTIZATION_FACTOR_24)
+        self.Q08Residues, self.Q16Residues, self.Q24Residues = self.Residues.ToResidues(q08), self.Residues.ToResidues(q16), self.Residues.ToResidues(q24)
+        self.RoundsSinceMeasurement = 0
+        self.LazyEncryptedEstimates = {}
+        if not PARAM.DO_NOT_ENCRYPT:
+            if self.Packing is not None:
+                self.EncryptedEstimates = [self.Packing.Encrypt(self.pk, [q8, q16, q24]) for q8, q16, q24 in zip(q08.tolist(), q16.tolist(), q24.tolist())]
+            else:
+                self.EncryptedEstimates = [self.Cryptosystem.Encrypt(self.pk, m) for m in q16.tolist()]
+
+    def ExecuteConsensusRound(self):
+        self.Estimates = self.Weights.Apply(self.Estimates)
+        # The residues are only sized for the configured number of rounds
+        assert(self.RoundsSinceMeasurement < PARAM.CONSENSUS_ROUND_COUNT)
+        self.Q08Residues = self.Weights.ApplyQuantizedResidues(self.Q08Residues, self.Residues)
+        self.Q16Residues = self.Weights.ApplyQuantizedResidues(self.Q16Residues, self.Residues)
+        self.Q24Residues = self.Weights.ApplyQuantizedResidues(self.Q24Residues, self.Residues)
+        self.RoundsSinceMeasurement += 1
+        if self.LazyEncryptedConsensus:
+            self.LazyEncryptedEstimates = {}
+        elif not PARAM.DO_NOT_ENCRYPT:
+            self.FuseEncryptedEstimates()
+
+    def FuseEncryptedEstimates(self):
+        '''
+        Homomorphically applies the quantized weight matrix to the encrypted estimates, sensor by sensor.
+        '''
+        if self.FusionExecutor is not None:
+            self.EncryptedEstimates = self.FusionExecutor.Fuse(self.EncryptedEstimates)
+            return
+        previous, W = self.EncryptedEstimates, self.Weights
+        fused = []
+        for i in range(self.SensorCount):
+            neighbors = W.NeighborIndices[i, :W.NeighborCounts[i]]
+            ciphertexts = [previous[i]] + [previous[nID] for nID in neighbors]
+            weights = [W.QuantizedSelfWeights[i]] + list(W.QuantizedNeighborWeights[i, :W.NeighborCounts[i]])
+            fused.append(self.Cryptosystem.WeightedSum(self.pk, ciphertexts, weights))
+        self.EncryptedEstimates = fused
+
+    def GetAllCurrentEstimates(self):
+        return np.ndarray(shape = (self.MySizeX, self.MySizeY), buffer = self.Estimates.copy())
+
+    def GetCurrentErrors(self, RealPos):
+        return np.ndarray(shape = (self.MySizeX, self.MySizeY), buffer = self.Estimates - RealPos)
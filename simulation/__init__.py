@@ -1,5 +1,12 @@
 from simulation.SimulationParameters import SimParameters
 from simulation.ConSensor import ConSensor as SimSensor
 from simulation.ConSensorGrid import ConSensorGrid as SimGrid
+from simulation.VectorizedConSensorGrid import VectorizedConSensorGrid as SimVectorizedGrid
 from simulation.ConsensusController import ConsensusController as SimController
-from simulation.SimSystem import SimSystem
\ No newline at end of file
+from simulation.SimSystem import SimSystem
+from simulation.ErrorStatistics import ErrorStatistics as SimErrorStatistics
+from simulation.CampaignCheckpoint import CampaignCheckpoint as SimCheckpoint
+from simulation.MonteCarloScheduler import MonteCarloScheduler as SimScheduler
+from simulation.ParameterSweep import ParameterSweep as SimParameterSweep, ParameterSet as SimParameterSet
+from simulation.BatchedSimulation import BatchedSimulator as SimBatchedSimulator
+from simulation.Profiling import Profiler as SimProfiler
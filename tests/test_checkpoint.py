@@ -0,0 +1,46 @@
+'''
+Created on 18.10.2026
+'''
+import operator
+import pytest
+from simulation import SimCheckpoint, SimParameters as PARAM
+
+CHUNKS = [(0, 2, 11), (1, 2, 12), (2, 2, 13)]
+
+def test_results_are_merged_in_chunk_order_and_resumed(tmp_path):
+    fileName = SimCheckpoint.GetFileName(str(tmp_path), "abc")
+    checkpoint = SimCheckpoint(fileName, "abc", CHUNKS, operator.add)
+    checkpoint.Add(1, "b")
+    checkpoint.Add(0, "a")
+    resumed = SimCheckpoint(fileName, "abc", CHUNKS, operator.add)
+    assert resumed.GetFinishedRuns() == 4 and not resumed.IsFinished(2)
+    resumed.Add(2, "c")
+    assert resumed.IsComplete() and resumed.GetResult() == "abc"
+
+def test_checkpoint_of_another_fingerprint_is_refused(tmp_path):
+    fileName = str(tmp_path / "campaign.pickle")
+    SimCheckpoint(fileName, "abc", CHUNKS, operator.add).Add(0, "a")
+    with pytest.raises(ValueError):
+        SimCheckpoint(fileName, "xyz", CHUNKS, operator.add)
+
+def test_result_format_is_part_of_the_fingerprint():
+    settings = PARAM.GetSettings()
+    try:
+        fingerprint = PARAM.GetFingerprint()
+        PARAM.Apply({"RESULT_FORMAT_VERSION": PARAM.RESULT_FORMAT_VERSION - 1})
+        assert PARAM.GetFingerprint() != fingerprint
+    finally:
+        PARAM.Restore(settings)
+
+def test_execution_settings_are_not_part_of_the_fingerprint():
+    settings = PARAM.GetSettings()
+    try:
+        fingerprint = PARAM.GetFingerprint()
+        PARAM.Apply({"VECTORIZED_GRID": not PARAM.VECTORIZED_GRID, "LAZY_ENCRYPTED_CONSENSUS": not PARAM.LAZY_ENCRYPTED_CONSENSUS,
+                     "RANDOMNESS_POOL_HIGH_WATER_MARK": PARAM.RANDOMNESS_POOL_HIGH_WATER_MARK + 64,
+                     "BATCHED_SIMULATION_BATCH_SIZE": PARAM.BATCHED_SIMULATION_BATCH_SIZE + 1, "PROFILING": not PARAM.PROFILING})
+        assert PARAM.GetFingerprint() == fingerprint
+        PARAM.Apply({"TOTAL_RUNS": PARAM.TOTAL_RUNS + 1})
+        assert PARAM.GetFingerprint() != fingerprint
+    finally:
+        PARAM.Restore(settings)
@@ -0,0 +1,63 @@
+'''
+Created on 18.10.2026
+'''
+import random
+import pytest
+from encryption import Paillier, DamgardJurik, GetCryptosystem
+from tests.test_paillier import GetTestPlaintexts
+
+EXAMPLE_PRIMES = (282174488599599500573849980909, 362736035870515331128527330659)
+
+@pytest.mark.parametrize("s", [1, 2, 3, 4])
+def test_round_trip(s):
+    pk, sk = DamgardJurik.KeyGenFromPrimes(*EXAMPLE_PRIMES, s)
+    assert pk.PlaintextModulus == (EXAMPLE_PRIMES[0] * EXAMPLE_PRIMES[1]) ** s
+    for m in GetTestPlaintexts(pk.PlaintextModulus, RandomCount = 20):
+        c = DamgardJurik.Encrypt(pk, m)
+        assert 0 <= c < pk.CiphertextModulus
+        assert DamgardJurik.Decrypt(sk, c) == m
+
+@pytest.mark.parametrize("s", [1, 2, 3])
+def test_homomorphic_operations(s):
+    pk, sk = DamgardJurik.KeyGenFromPrimes(*EXAMPLE_PRIMES, s)
+    rng = random.Random(s)
+    bound = pk.PlaintextModulus // 8
+    m1, m2, m3 = rng.randint(-bound, bound), rng.randint(-bound, bound), -123456789
+    c1, c2, c3 = DamgardJurik.Encrypt(pk, m1), DamgardJurik.Encrypt(pk, m2), DamgardJurik.Encrypt(pk, m3)
+    assert DamgardJurik.Decrypt(sk, DamgardJurik.Add(pk, c1, c2)) == m1 + m2
+    assert DamgardJurik.Decrypt(sk, DamgardJurik.Sub(pk, c1, c2)) == m1 - m2
+    assert DamgardJurik.Decrypt(sk, DamgardJurik.Mult(pk, c3, -3)) == -3 * m3
+    assert DamgardJurik.Decrypt(sk, DamgardJurik.Mult(pk, c1, 0)) == 0
+    assert DamgardJurik.Decrypt(sk, DamgardJurik.WeightedSum(pk, [c1, c2, c3], [3, -2, 0])) == 3 * m1 - 2 * m2
+    assert DamgardJurik.Decrypt(sk, DamgardJurik.WeightedSum(pk, [c1, c2], [0, 0])) == 0
+
+def test_tuple_keys_work_like_key_objects():
+    pk, sk = DamgardJurik.KeyGenFromPrimes(*EXAMPLE_PRIMES, 2)
+    assert tuple(pk) == (pk.n, 2) and len(sk) == 4 and pk == tuple(pk) and sk == tuple(sk)
+    c = DamgardJurik.Encrypt(tuple(pk), -42)
+    assert DamgardJurik.Decrypt(tuple(sk), c) == -42
+    assert DamgardJurik.Decrypt(sk, DamgardJurik.WeightedSum(tuple(pk), [c, c], [2, 3])) == -210
+    # Both the key objects and the plain tuples lead to the right cryptosystem
+    assert GetCryptosystem(pk) is GetCryptosystem(tuple(pk)) is DamgardJurik
+    assert GetCryptosystem(sk) is GetCryptosystem(tuple(sk)) is DamgardJurik
+
+def test_cryptosystem_is_decided_by_the_key():
+    paillierPK, paillierSK = Paillier.KeyGenFromPrimes(*EXAMPLE_PRIMES, KeepFactorization = True)
+    n = paillierPK.n
+    for key in (paillierPK, paillierSK, tuple(paillierPK), tuple(paillierSK), tuple(paillierSK)[:3], (n, n + 1)):
+        assert GetCryptosystem(key) is Paillier
+    for key in ((n, 1), (n, 3), (1, 2, n, 3)):
+        assert GetCryptosystem(key) is DamgardJurik
+    # Neither a generator above n nor a plausible exponent s, or a key of neither arity
+    for key in ((n, 0), (n, n.bit_length()), (n, n), (1, 2, n, 4, 5), (n,)):
+        with pytest.raises(ValueError):
+            GetCryptosystem(key)
+
+def test_s_equal_to_one_decrypts_paillier_ciphertexts():
+    # For s = 1, Damgard-Jurik is Paillier with g = n + 1, so the two cryptosystems share their keys and ciphertexts
+    paillierPK, paillierSK = Paillier.KeyGenFromPrimes(*EXAMPLE_PRIMES, SimpleGenerator = True)
+    pk, sk = DamgardJurik.KeyGenFromPrimes(*EXAMPLE_PRIMES, 1)
+    assert pk.CiphertextModulus == paillierPK.nSquared and sk.mu == paillierSK.mu
+    for m in GetTestPlaintexts(pk.n, RandomCount = 20):
+        assert DamgardJurik.Decrypt(sk, Paillier.Encrypt(paillierPK, m)) == m
+        assert Paillier.Decrypt(paillierSK, DamgardJurik.Encrypt(pk, m)) == m
@@ -0,0 +1,81 @@
+'''
+Created on 18.10.2026
+'''
+from math import inf, isnan, sqrt
+from statistics import NormalDist
+import numpy as np
+import pytest
+from simulation import SimErrorStatistics as ErrorStatistics
+
+STEPS, ROUNDS, ESTIMATORS = 3, 2, len(ErrorStatistics.ESTIMATORS)
+
+# Returns squared errors of shape (samples, time steps, rounds + 1, estimators), with some of them missing (NaN)
+def GetSamples(Count, Seed = 2018):
+    rng = np.random.default_rng(Seed)
+    samples = rng.chisquare(1, size=(Count, STEPS, ROUNDS + 1, ESTIMATORS)) * rng.uniform(0.5, 2.0, size=(1, STEPS, ROUNDS + 1, ESTIMATORS))
+    samples[rng.random(samples.shape) < 0.2] = np.nan
+    samples[:, :, :, -1] = np.nan # An estimator without any samples
+    return samples
+
+# Accumulates the samples one at a time if Vectorized is unset, or a round at a time otherwise
+def Accumulate(Samples, Vectorized):
+    result = ErrorStatistics(STEPS, ROUNDS)
+    if Vectorized:
+        for r in range(ROUNDS + 1):
+            result.AddSamples(r, Samples[:, :, r])
+    else:
+        for sample in Samples:
+            for t in range(STEPS):
+                for r in range(ROUNDS + 1):
+                    result.Add(t, r, sample[t, r])
+    return result
+
+def AssertMatchesOnePass(Statistics, Samples):
+    valid = ~np.isnan(Samples)
+    counts = valid.sum(axis=0)
+    np.testing.assert_array_equal(Statistics.Counts, counts)
+    means = np.where(valid, Samples, 0.0).sum(axis=0) / np.maximum(counts, 1)
+    np.testing.assert_allclose(Statistics.Means, means, rtol = 1e-12)
+    squaredDeviations = np.where(valid, (Samples - means) ** 2, 0.0).sum(axis=0)
+    np.testing.assert_allclose(Statistics.SquaredDeviations, squaredDeviations, rtol = 1e-10, atol = 1e-12)
+
+@pytest.mark.parametrize("Vectorized", [False, True])
+def test_merged_accumulators_match_a_single_pass(Vectorized):
+    samples = GetSamples(60)
+    AssertMatchesOnePass(Accumulate(samples, Vectorized), samples)
+    # Split the samples unevenly (with an empty part), accumulate every part separately, and merge them in order
+    parts = [samples[:1], samples[1:1], samples[1:25], samples[25:]]
+    merged = ErrorStatistics.MergeAll([Accumulate(part, Vectorized) for part in parts])
+    AssertMatchesOnePass(merged, samples)
+    # Merging accumulators filled in different ways makes no difference either
+    mixed = Accumulate(samples[:30], not Vectorized).Merge(Accumulate(samples[30:], Vectorized))
+    AssertMatchesOnePass(mixed, samples)
+
+def test_pooled_statistics_and_confidence_intervals():
+    samples = GetSamples(80)
+    statistics = ErrorStatistics.MergeAll([Accumulate(samples[:40], True), Accumulate(samples[40:], True)])
+    for e, estimator in enumerate(ErrorStatistics.ESTIMATORS[:-1]):
+        for r in range(ROUNDS + 1):
+            pooled = samples[:, :, r, e][~np.isnan(samples[:, :, r, e])]
+            count, mean, squaredDeviations = statistics.GetPooled(estimator, r)
+            assert count == len(pooled) == statistics.GetSampleCount(estimator, r)
+            assert mean == pytest.approx(pooled.mean(), rel = 1e-12)
+            assert squaredDeviations == pytest.approx(((pooled - pooled.mean()) ** 2).sum(), rel = 1e-10)
+            for confidence in (0.9, 0.95, 0.99):
+                halfWidth = NormalDist().inv_cdf((1 + confidence) / 2) * pooled.std(ddof = 1) / sqrt(len(pooled))
+                rmse, lower, upper = statistics.GetRootMeanSquaredError(estimator, r, confidence)
+                assert rmse == pytest.approx(sqrt(pooled.mean()), rel = 1e-12)
+                assert lower == pytest.approx(sqrt(max(pooled.mean() - halfWidth, 0.0)), rel = 1e-10)
+                assert upper == pytest.approx(sqrt(pooled.mean() + halfWidth), rel = 1e-10)
+    # Wider intervals for a higher confidence
+    _, lower90, upper90 = statistics.GetRootMeanSquaredError("Plain", ROUNDS, 0.9)
+    _, lower99, upper99 = statistics.GetRootMeanSquaredError("Plain", ROUNDS, 0.99)
+    assert lower99 < lower90 < upper90 < upper99
+
+def test_confidence_intervals_of_too_few_samples():
+    statistics = ErrorStatistics(STEPS, ROUNDS)
+    assert all(isnan(v) for v in statistics.GetRootMeanSquaredError("Plain", 0))
+    statistics.Add(1, 0, [4.0] + [np.nan] * (ESTIMATORS - 1))
+    assert statistics.GetRootMeanSquaredError("Plain", 0) == (2.0, 0.0, inf)
+    assert all(isnan(v) for v in statistics.GetRootMeanSquaredError("Q08", 0))
+    assert np.isnan(statistics.GetRootMeanSquaredErrors("Plain")[0, 0]) and statistics.GetRootMeanSquaredErrors("Plain")[1, 0] == 2.0
@@ -0,0 +1,32 @@
+'''
+Created on 18.10.2026
+'''
+import random
+import pytest
+from encryption import Paillier
+from encryption.FixedBase import FixedBaseExponentiator
+
+EXAMPLE_PRIMES = (282174488599599500573849980909, 362736035870515331128527330659)
+
+@pytest.mark.parametrize("ExponentBitSize, WindowBitSize", [(128, 8), (100, 7), (64, 1), (9, 4)])
+def test_comb_matches_pow(ExponentBitSize, WindowBitSize):
+    pk, _ = Paillier.KeyGenFromPrimes(*EXAMPLE_PRIMES, SimpleGenerator = True)
+    rng = random.Random(ExponentBitSize)
+    g = rng.randint(2, pk.nSquared - 1)
+    table = FixedBaseExponentiator(g, pk.nSquared, ExponentBitSize, WindowBitSize)
+    exponents = [0, 1, 2 ** ExponentBitSize - 1, 2 ** (ExponentBitSize - 1)] + [rng.getrandbits(ExponentBitSize) for _ in range(50)]
+    for e in exponents:
+        assert table.Pow(e) == pow(g, e, pk.nSquared)
+
+def test_short_exponent_ciphertexts_decrypt():
+    pk, sk = Paillier.KeyGenFromPrimes(*EXAMPLE_PRIMES, KeepFactorization = True, SimpleGenerator = True)
+    previous = (Paillier.SHORT_EXPONENT_RANDOMNESS, Paillier.SHORT_EXPONENT_BIT_SIZE, Paillier.FIXED_BASE_WINDOW_BIT_SIZE)
+    Paillier.SetShortExponentRandomness(True, ExponentBitSize = 128, WindowBitSize = 6)
+    try:
+        plaintexts = [0, 1, -1, 2 ** 40, -(pk.n // 2 - 1)] + [random.randint(-2 ** 64, 2 ** 64) for _ in range(20)]
+        ciphertexts = [Paillier.Encrypt(pk, m) for m in plaintexts]
+        assert [Paillier.Decrypt(sk, c) for c in ciphertexts] == plaintexts
+        assert len(set(ciphertexts)) == len(ciphertexts)
+        assert Paillier.Decrypt(sk, Paillier.WeightedSum(pk, ciphertexts[:3], [3, -2, 5])) == 3 * 0 - 2 * 1 + 5 * -1
+    finally:
+        Paillier.SetShortExponentRandomness(*previous)
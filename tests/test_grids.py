@@ -0,0 +1,50 @@
+'''
+Created on 18.10.2026
+'''
+import numpy as np
+import pytest
+import RunSimulation
+from simulation import SimParameters as PARAM
+
+# A campaign that is small enough for the test suite, with a small key that is generated into a temporary key store
+SETTINGS = {"SENSOR_GRID_DIMENSIONS": (5, 5), "TIME_STEPS_PER_RUN": 4, "PLAINTEXT_MODULUS_BIT_SIZE": 192,
+            "TRACK_ERRORS_PER_ROUND": True, "PROFILING": False}
+
+@pytest.fixture(autouse = True)
+def RestoreSettings(tmp_path):
+    settings = PARAM.GetSettings()
+    PARAM.Apply(dict(SETTINGS, KEY_STORE_DIRECTORY = str(tmp_path)))
+    yield
+    PARAM.Restore(settings)
+
+# Runs one seeded chunk of a few runs with the specified settings and returns its error statistics
+def SimulateChunk(Settings):
+    PARAM.Apply(Settings)
+    RunSimulation.InitializeWorker()
+    _, (statistics, _) = RunSimulation.SimulateChunk((0, 3, PARAM.RANDOM_SEED))
+    return statistics
+
+def AssertEqualStatistics(First, Second):
+    np.testing.assert_array_equal(First.Counts, Second.Counts)
+    np.testing.assert_array_equal(First.Means, Second.Means)
+    np.testing.assert_array_equal(First.SquaredDeviations, Second.SquaredDeviations)
+
+@pytest.mark.parametrize("Encrypted", [False, True])
+def test_vectorized_grid_matches_object_grid(Encrypted):
+    reference = SimulateChunk({"DO_NOT_ENCRYPT": not Encrypted, "VECTORIZED_GRID": False})
+    AssertEqualStatistics(reference, SimulateChunk({"DO_NOT_ENCRYPT": not Encrypted, "VECTORIZED_GRID": True}))
+
+def test_lazy_encrypted_consensus_matches_object_grid():
+    # The lazy grid only fuses the encrypted estimates the controller reads, so the per-round errors must match, too
+    reference = SimulateChunk({"DO_NOT_ENCRYPT": False, "VECTORIZED_GRID": False})
+    AssertEqualStatistics(reference, SimulateChunk({"DO_NOT_ENCRYPT": False, "LAZY_ENCRYPTED_CONSENSUS": True}))
+
+@pytest.mark.parametrize("TrackErrorsPerRound", [False, True])
+def test_batched_simulation_matches_object_grid(TrackErrorsPerRound):
+    PARAM.Apply({"DO_NOT_ENCRYPT": True, "TRACK_ERRORS_PER_ROUND": TrackErrorsPerRound})
+    reference = SimulateChunk({"BATCHED_SIMULATION": False})
+    batched = SimulateChunk({"BATCHED_SIMULATION": True, "BATCHED_SIMULATION_BATCH_SIZE": 2})
+    # The squared errors are the same, but the batches accumulate them in a different order
+    np.testing.assert_array_equal(reference.Counts, batched.Counts)
+    np.testing.assert_allclose(reference.Means, batched.Means, rtol = 1e-12)
+    np.testing.assert_allclose(reference.SquaredDeviations, batched.SquaredDeviations, rtol = 1e-9, atol = 1e-12)
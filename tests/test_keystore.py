@@ -0,0 +1,29 @@
+'''
+Created on 18.10.2026
+'''
+import os
+import pytest
+from encryption import Paillier, KeyStore
+
+@pytest.fixture(autouse = True)
+def ForgetLoadedKeyPairs():
+    KeyStore.LoadedKeyPairs.clear()
+    yield
+    KeyStore.LoadedKeyPairs.clear()
+
+@pytest.mark.parametrize("KeyLength", [192, 193])
+def test_saved_key_pairs_reload(tmp_path, KeyLength):
+    pk, sk = KeyStore(str(tmp_path)).GetKeyPair(KeyLength, KeepFactorization = True, SimpleGenerator = True)
+    assert pk.n.bit_length() == KeyLength
+    # A fresh process only finds the file
+    KeyStore.LoadedKeyPairs.clear()
+    reloadedPk, reloadedSk = KeyStore(str(tmp_path)).GetKeyPair(KeyLength, KeepFactorization = True, SimpleGenerator = True)
+    assert reloadedPk == pk and reloadedSk == sk
+    assert Paillier.Decrypt(reloadedSk, Paillier.Encrypt(reloadedPk, -42)) == -42
+
+def test_key_pair_of_another_length_is_refused(tmp_path):
+    store = KeyStore(str(tmp_path))
+    store.GetKeyPair(128, SimpleGenerator = True)
+    os.replace(store.GetFileName(128, True), store.GetFileName(129, True))
+    with pytest.raises(ValueError):
+        store.GetKeyPair(129, SimpleGenerator = True)
@@ -0,0 +1,122 @@
+'''
+Created on 18.10.2026
+'''
+import random
+import numpy as np
+import pytest
+from utility import ModularIntegerInverse, BatchModularIntegerInverse
+from utility.modular import ModularMatrixInverse, MultModuloArray, MultModuloPowerOf2Array, MultModulo, MultModuloPowerOf2
+
+# A prime, a product of two primes (like a Paillier modulus), its square, and a power of two
+MODULI = [2 ** 61 - 1, 282174488599599500573849980909 * 362736035870515331128527330659,
+          (282174488599599500573849980909 * 362736035870515331128527330659) ** 2, 2 ** 64]
+
+@pytest.mark.parametrize("Modulus", MODULI)
+def test_batch_inverse_matches_builtin_inverse(Modulus):
+    rng = random.Random(Modulus)
+    values = [v for v in (rng.randrange(-Modulus, Modulus) for _ in range(40)) if v % 2 == 1 or Modulus % 2 == 1]
+    values += [1, -1, Modulus + 1]
+    assert BatchModularIntegerInverse(values, Modulus) == [pow(v, -1, Modulus) for v in values]
+    assert [ModularIntegerInverse(v, Modulus) for v in values] == [pow(v, -1, Modulus) for v in values]
+    assert BatchModularIntegerInverse(values[:1], Modulus) == [pow(values[0], -1, Modulus)]
+    assert BatchModularIntegerInverse([], Modulus) == []
+
+def test_batch_inverse_reports_the_first_value_without_an_inverse():
+    p, q = 1000003, 1000033
+    with pytest.raises(ArithmeticError) as error:
+        BatchModularIntegerInverse([3, 5, 2 * p, 7, q], p * q)
+    assert error.value.args == ('modular inverse does not exist', p, 2 * p, p * q)
+    with pytest.raises(ArithmeticError):
+        BatchModularIntegerInverse([0], 17)
+
+# The Gauss-Jordan elimination of the original ModularMatrixInverse (without pivoting, on Python integers)
+def BaselineMatrixInverse(Rows, Modulus):
+    size = len(Rows)
+    matrix = [[v % Modulus for v in row] for row in Rows]
+    result = [[int(i == j) for j in range(size)] for i in range(size)]
+    for i in range(size):
+        factor = pow(matrix[i][i], -1, Modulus)
+        matrix[i] = [v * factor % Modulus for v in matrix[i]]
+        result[i] = [v * factor % Modulus for v in result[i]]
+        for j in range(size):
+            if i != j:
+                factor = matrix[j][i]
+                matrix[j] = [(matrix[j][k] - matrix[i][k] * factor) % Modulus for k in range(size)]
+                result[j] = [(result[j][k] - result[i][k] * factor) % Modulus for k in range(size)]
+    return result
+
+# Returns a random matrix whose diagonal entries are invertible modulo the prime, so that the baseline needs no pivoting
+def GetRandomMatrix(Size, Modulus, Seed):
+    rng = random.Random(Seed)
+    return np.array([[rng.randrange(1, Modulus) if i == j else rng.randrange(Modulus) for j in range(Size)] for i in range(Size)],
+                     dtype=np.int64 if Modulus < 2 ** 63 else object)
+
+def AssertIsInverse(Matrix, Inverse, Modulus):
+    product = np.array(Matrix.tolist(), dtype=object).dot(np.array(Inverse.tolist(), dtype=object)) % Modulus
+    assert product.tolist() == np.identity(len(Matrix), dtype=int).tolist()
+
+@pytest.mark.parametrize("Modulus, DType", [(65521, np.int64), (2 ** 56 - 5, np.int64), (2 ** 57 - 13, object),
+                                            (2 ** 61 - 1, object), (2 ** 89 - 1, object)])
+def test_matrix_inverse_matches_baseline_on_both_sides_of_the_int64_cutover(Modulus, DType):
+    for seed in range(3):
+        matrix = GetRandomMatrix(7, Modulus, seed)
+        timings = []
+        inverse = ModularMatrixInverse(matrix, Modulus, TimingHook = lambda size, seconds: timings.append(size))
+        assert inverse.dtype == DType and timings == [7]
+        assert inverse.tolist() == BaselineMatrixInverse(matrix.tolist(), Modulus)
+        AssertIsInverse(matrix, inverse, Modulus)
+
+def test_matrix_inverse_leaves_its_argument_alone():
+    matrix = GetRandomMatrix(5, 65521, 1)
+    original = matrix.copy()
+    ModularMatrixInverse(matrix, 65521)
+    np.testing.assert_array_equal(matrix, original)
+
+@pytest.mark.parametrize("Modulus", [2 ** 16, 3 ** 20, 2 ** 70])
+def test_matrix_inverse_pivots_for_prime_power_moduli(Modulus):
+    # The leading entries are not invertible modulo a prime power, but the matrix is (its determinant is -1)
+    matrix = np.array([[2, 1, 0], [1, 0, 0], [3, 6, 1]], dtype=np.int64 if Modulus < 2 ** 63 else object)
+    if Modulus % 3 == 0:
+        matrix[:, 0] *= 3
+        matrix[0, 1], matrix[1, 0] = 1, 1
+    AssertIsInverse(matrix, ModularMatrixInverse(matrix, Modulus), Modulus)
+
+@pytest.mark.parametrize("Matrix, Modulus", [
+    ([[1, 2], [2, 4]], 65521),               # singular over the integers
+    ([[1, 2], [3, 1]], 5),                   # determinant -5, i.e., singular modulo 5 only
+    ([[2, 0], [0, 1]], 2 ** 16),             # the determinant shares the factor 2 with the modulus
+    ([[4, 2, 0], [2, 1, 0], [0, 0, 1]], 2 ** 57 - 13), # singular on Python integers
+])
+def test_matrix_inverse_detects_singular_matrices(Matrix, Modulus):
+    with pytest.raises(ArithmeticError):
+        ModularMatrixInverse(np.array(Matrix, dtype=np.int64), Modulus)
+
+BIT_SIZES = [5, 31, 32, 56, 63]
+
+# Returns int64 factors at the extremes of the int64 range and of the modulus, and random ones in between
+def GetFactors(Modulus, Seed, RandomCount = 200):
+    rng = random.Random(Seed)
+    extremes = [v for v in (0, 1, -1, Modulus - 1, Modulus, Modulus + 1, -Modulus, 2 ** 63 - 1, -2 ** 63) if -2 ** 63 <= v < 2 ** 63]
+    return extremes + [rng.randint(-2 ** 63, 2 ** 63 - 1) for _ in range(RandomCount)] + [rng.randrange(Modulus) for _ in range(RandomCount)]
+
+@pytest.mark.parametrize("BitSize", BIT_SIZES)
+def test_array_multiplication_matches_python_integers(BitSize):
+    for modulus in (2 ** (BitSize - 1) + 1, 2 ** BitSize - 1):
+        factors1, factors2 = GetFactors(modulus, BitSize), GetFactors(modulus, -BitSize)[::-1]
+        expected = [a * b % modulus for a, b in zip(factors1, factors2)]
+        result = MultModuloArray(np.array(factors1, dtype=np.int64), np.array(factors2, dtype=np.int64), modulus)
+        assert result.dtype == np.int64 and result.tolist() == expected
+        # Broadcasting, and the scalar wrapper
+        outer = MultModuloArray(np.array(factors1[:20], dtype=np.int64)[:, None], np.array(factors2[:30], dtype=np.int64)[None, :], modulus)
+        assert outer.tolist() == [[a * b % modulus for b in factors2[:30]] for a in factors1[:20]]
+        assert [MultModulo(a, b, modulus) for a, b in zip(factors1[:50], factors2[:50])] == expected[:50]
+
+@pytest.mark.parametrize("BitSize", BIT_SIZES)
+def test_power_of_2_array_multiplication_matches_python_integers(BitSize):
+    modulus = 2 ** BitSize
+    factors1, factors2 = GetFactors(modulus, BitSize), GetFactors(modulus, -BitSize)[::-1]
+    # Python's % of a power of two keeps the low bits of the two's complement, just like the bitmask
+    expected = [a * b % modulus for a, b in zip(factors1, factors2)]
+    result = MultModuloPowerOf2Array(np.array(factors1, dtype=np.int64), np.array(factors2, dtype=np.int64), BitSize)
+    assert result.dtype == np.int64 and result.tolist() == expected
+    assert [MultModuloPowerOf2(a, b, BitSize) for a, b in zip(factors1[:50], factors2[:50])] == expected[:50]
@@ -0,0 +1,52 @@
+'''
+Created on 18.10.2026
+'''
+import random
+import pytest
+from encryption import Paillier, SlotPacking
+
+EXAMPLE_PRIMES = (282174488599599500573849980909, 362736035870515331128527330659)
+
+@pytest.fixture
+def KeyPair():
+    return Paillier.KeyGenFromPrimes(*EXAMPLE_PRIMES, KeepFactorization = True, SimpleGenerator = True)
+
+def test_signed_values_round_trip(KeyPair):
+    pk, sk = KeyPair
+    packing = SlotPacking(3, 16, 4, 3)
+    packing.CheckKey(pk)
+    bound = 2 ** 16 - 1
+    for values in ([0, 0, 0], [1, -1, 0], [-bound, bound, -bound], [bound, -1, 1], [-1, -1, -1]):
+        assert packing.Unpack(packing.Pack(values)) == values
+        assert packing.Decrypt(sk, packing.Encrypt(pk, values)) == values
+
+def test_values_and_keys_that_overflow_are_refused(KeyPair):
+    pk, _ = KeyPair
+    packing = SlotPacking(3, 16, 4, 3)
+    with pytest.raises(AssertionError):
+        packing.Pack([2 ** 16, 0, 0])
+    with pytest.raises(AssertionError):
+        packing.Pack([0, -2 ** 16, 0])
+    # Seven slots of 29 bits do not fit into the 192-bit plaintext space
+    with pytest.raises(ArithmeticError):
+        SlotPacking(7, 16, 4, 3).CheckKey(pk)
+
+def test_packed_weighted_sum_unpacks_to_per_slot_weighted_sums(KeyPair):
+    pk, sk = KeyPair
+    rng = random.Random(2018)
+    packing = SlotPacking(3, 16, 4, 3)
+    values = [[rng.randint(-2 ** 16 + 1, 2 ** 16 - 1) for _ in range(3)] for _ in range(5)]
+    weights = [rng.randint(-7, 7) for _ in range(5)]
+    ciphertext = Paillier.WeightedSum(pk, [packing.Encrypt(pk, v) for v in values], weights)
+    expected = [sum(w * v[slot] for w, v in zip(weights, values)) for slot in range(3)]
+    assert packing.Decrypt(sk, ciphertext) == expected
+
+def test_slots_hold_the_worst_case_growth_over_all_rounds(KeyPair):
+    pk, sk = KeyPair
+    packing = SlotPacking(3, 16, 4, 3)
+    # Weights add up to 2^4 - 1, and all values have the largest magnitude, so every round adds almost 4 bits
+    weights, values = [12, 1, 1, 1], [2 ** 16 - 1, -(2 ** 16 - 1), 2 ** 16 - 1]
+    ciphertext = packing.Encrypt(pk, values)
+    for _ in range(3):
+        ciphertext = Paillier.WeightedSum(pk, [ciphertext] * len(weights), weights)
+    assert packing.Decrypt(sk, ciphertext) == [v * 15 ** 3 for v in values]
@@ -0,0 +1,43 @@
+'''
+Created on 18.10.2026
+'''
+import random
+import pytest
+from encryption import Paillier
+
+EXAMPLE_PRIMES = (282174488599599500573849980909, 362736035870515331128527330659)
+
+# Returns plaintexts around zero, at both ends of the plaintext range (|m| < n / 2), and in between
+def GetTestPlaintexts(n, RandomCount = 50):
+    bound = n // 2 - 1
+    rng = random.Random(2018)
+    return [0, 1, -1, 2 ** 16, -2 ** 16, bound, -bound, bound - 1, -bound + 1] + [rng.randint(-bound, bound) for _ in range(RandomCount)]
+
+@pytest.mark.parametrize("SimpleGenerator", [False, True])
+def test_regular_and_crt_decryption_round_trip(SimpleGenerator):
+    pk, skCRT = Paillier.KeyGenFromPrimes(*EXAMPLE_PRIMES, KeepFactorization = True, SimpleGenerator = SimpleGenerator)
+    sk = tuple(skCRT)[:3] # The same key without its factorization, as a plain (l, mu, n) tuple
+    assert not Paillier.KeyGenFromPrimes(*EXAMPLE_PRIMES)[1].HasFactorization()
+    for m in GetTestPlaintexts(pk.n):
+        c = Paillier.Encrypt(tuple(pk), m)
+        assert Paillier.Decrypt(sk, c) == m
+        assert Paillier.Decrypt(skCRT, c) == m
+        assert Paillier.Decrypt(tuple(skCRT), c) == m
+
+def test_homomorphic_operations_with_crt_keys():
+    pk, sk = Paillier.KeyGenFromPrimes(*EXAMPLE_PRIMES, KeepFactorization = True, SimpleGenerator = True)
+    m1, m2 = 123456789, -987654321
+    c1, c2 = Paillier.Encrypt(pk, m1), Paillier.Encrypt(pk, m2)
+    assert Paillier.Decrypt(sk, Paillier.Add(pk, c1, c2)) == m1 + m2
+    assert Paillier.Decrypt(sk, Paillier.Sub(pk, c1, c2)) == m1 - m2
+    assert Paillier.Decrypt(sk, Paillier.Mult(pk, c1, -3)) == -3 * m1
+    assert Paillier.Decrypt(sk, Paillier.Mult(pk, c1, 0)) == 0
+    assert Paillier.Decrypt(sk, Paillier.WeightedSum(pk, [c1, c2], [5, -7])) == 5 * m1 - 7 * m2
+
+@pytest.mark.parametrize("KeyLength", [96, 127, 128, 129, 193])
+def test_key_generation_yields_the_requested_modulus_size(KeyLength):
+    random.seed(KeyLength)
+    for _ in range(5):
+        pk, sk = Paillier.KeyGen(KeyLength, KeepFactorization = True, SimpleGenerator = True)
+        assert pk.n.bit_length() == KeyLength
+        assert Paillier.Decrypt(sk, Paillier.Encrypt(pk, -12345)) == -12345
@@ -0,0 +1,54 @@
+'''
+Created on 18.10.2026
+'''
+import pytest
+from encryption import Paillier, DamgardJurik
+from simulation import SimGrid, SimVectorizedGrid, SimParameters as PARAM
+from simulation.ParallelFusion import ParallelFusionExecutor
+from tests.test_grids import SETTINGS, SimulateChunk, AssertEqualStatistics
+
+EXAMPLE_PRIMES = (282174488599599500573849980909, 362736035870515331128527330659)
+
+@pytest.fixture(autouse = True)
+def RestoreSettings(tmp_path):
+    settings = PARAM.GetSettings()
+    PARAM.Apply(dict(SETTINGS, KEY_STORE_DIRECTORY = str(tmp_path)))
+    yield
+    PARAM.Restore(settings)
+
+@pytest.mark.parametrize("s", [1, 2])
+def test_parallel_fusion_matches_serial_weighted_sums(s):
+    pk, sk = Paillier.KeyGenFromPrimes(*EXAMPLE_PRIMES, SimpleGenerator = True) if s == 1 else DamgardJurik.KeyGenFromPrimes(*EXAMPLE_PRIMES, s)
+    cryptosystem = Paillier if s == 1 else DamgardJurik
+    grid = SimGrid((4, 3))
+    offsets, neighborIDs = grid.NeighborOffsets, grid.NeighborIDs
+    weights = [w for sensor in grid.MySensors for w in sensor.QuantizedNeighborWeights]
+    ciphertexts = [cryptosystem.Encrypt(pk, 1000 * i - 5000) for i in range(grid.SensorCount)]
+    serial = [cryptosystem.WeightedSum(pk, [ciphertexts[j] for j in neighborIDs[offsets[i]:offsets[i + 1]]], weights[offsets[i]:offsets[i + 1]])
+              for i in range(grid.SensorCount)]
+    executor = ParallelFusionExecutor(pk, offsets, neighborIDs, weights, 2, BlocksPerProcess = 2)
+    try:
+        assert executor.Fuse(ciphertexts) == serial
+        # The pool persists, so a second round goes through the same workers and buffers
+        assert executor.Fuse(serial) == [cryptosystem.WeightedSum(pk, [serial[j] for j in neighborIDs[offsets[i]:offsets[i + 1]]],
+                                                                  weights[offsets[i]:offsets[i + 1]]) for i in range(grid.SensorCount)]
+    finally:
+        executor.Close()
+
+@pytest.mark.parametrize("Vectorized", [False, True])
+def test_parallel_fusion_yields_the_same_campaign(Vectorized):
+    settings = {"DO_NOT_ENCRYPT": False, "VECTORIZED_GRID": Vectorized}
+    reference = SimulateChunk(dict(settings, PARALLEL_FUSION_PROCESS_COUNT = 1))
+    AssertEqualStatistics(reference, SimulateChunk(dict(settings, PARALLEL_FUSION_PROCESS_COUNT = 2)))
+
+@pytest.mark.parametrize("GridClass", [SimGrid, SimVectorizedGrid])
+def test_no_fusion_pool_without_encryption(GridClass):
+    pk, _ = Paillier.KeyGenFromPrimes(*EXAMPLE_PRIMES, SimpleGenerator = True)
+    PARAM.Apply({"PARALLEL_FUSION_PROCESS_COUNT": 2, "DO_NOT_ENCRYPT": True})
+    grid = GridClass((3, 3))
+    grid.DistributePublicKey(pk)
+    assert grid.FusionExecutor is None
+    PARAM.Apply({"DO_NOT_ENCRYPT": False})
+    grid.DistributePublicKey(pk)
+    assert grid.FusionExecutor is not None
+    grid.FusionExecutor.Close()
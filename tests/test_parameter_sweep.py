@@ -0,0 +1,64 @@
+'''
+Created on 18.10.2026
+'''
+import os
+import numpy as np
+import pytest
+import RunSimulation
+import RunSweep
+from simulation import SimParameterSweep, SimCheckpoint, SimParameters as PARAM
+
+SETTINGS = {"SENSOR_GRID_DIMENSIONS": (3, 3), "TIME_STEPS_PER_RUN": 2, "TOTAL_RUNS": 4, "RUNS_PER_CHUNK": 2,
+            "DO_NOT_ENCRYPT": True, "TRACK_ERRORS_PER_ROUND": False, "PROFILING": False}
+
+@pytest.fixture(autouse = True)
+def RestoreSettings(tmp_path):
+    settings = PARAM.GetSettings()
+    PARAM.Apply(dict(SETTINGS, KEY_STORE_DIRECTORY = str(tmp_path / "keys")))
+    yield
+    PARAM.Restore(settings)
+
+# Runs a sweep over the grid in this process and returns its results, the points whose chunks were simulated,
+# and the points that were prepared
+def RunSweepCounting(ParameterGrid, ResultDirectory):
+    simulated, prepared = [], []
+    def SimulateChunk(Parameters, Chunk):
+        simulated.append((Parameters, Chunk[0]))
+        return RunSweep.SimulateSweepChunk(Parameters, Chunk)
+    sweep = SimParameterSweep(ParameterGrid, ResultDirectory)
+    results = sweep.Run(SimulateChunk, RunSweep.InitializeSweepWorker, 1, PrepareCampaign = lambda: prepared.append(PARAM.OWN_ESTIMATE_WEIGHT),
+                        Merge = RunSimulation.MergeChunkResults)
+    return results, simulated, prepared
+
+# Returns the fingerprint of the base settings with the parameters applied
+def GetFingerprint(Parameters):
+    settings = PARAM.GetSettings()
+    try:
+        PARAM.Apply(Parameters)
+        return PARAM.GetFingerprint()
+    finally:
+        PARAM.Restore(settings)
+
+def test_points_are_cached_by_fingerprint(tmp_path):
+    resultDirectory, ownEstimateWeight = str(tmp_path / "sweeps"), PARAM.OWN_ESTIMATE_WEIGHT
+    results, simulated, prepared = RunSweepCounting({"OWN_ESTIMATE_WEIGHT": [0.1, 0.3]}, resultDirectory)
+    assert [p.AsDict() for p, _ in results] == [{"OWN_ESTIMATE_WEIGHT": 0.1}, {"OWN_ESTIMATE_WEIGHT": 0.3}]
+    assert len(simulated) == 4 and prepared == [0.1, 0.3]
+    assert PARAM.OWN_ESTIMATE_WEIGHT == ownEstimateWeight # The base settings are back
+    fileNames = [SimCheckpoint.GetFileName(resultDirectory, GetFingerprint({"OWN_ESTIMATE_WEIGHT": w})) for w in (0.1, 0.3)]
+    assert sorted(os.listdir(resultDirectory)) == sorted(os.path.basename(f) for f in fileNames)
+    # The two points differ, and all runs of each went into its result
+    (first, _), (second, _) = results[0][1], results[1][1]
+    assert first.GetSampleCount("Plain", PARAM.CONSENSUS_ROUND_COUNT) == PARAM.TOTAL_RUNS * PARAM.TIME_STEPS_PER_RUN
+    assert not np.array_equal(first.Means, second.Means)
+    # Running the sweep again recomputes nothing and returns the same results
+    again, simulated, prepared = RunSweepCounting({"OWN_ESTIMATE_WEIGHT": [0.1, 0.3]}, resultDirectory)
+    assert simulated == [] and prepared == []
+    for (parameters, (statistics, _)), (otherParameters, (otherStatistics, _)) in zip(results, again):
+        assert parameters == otherParameters
+        np.testing.assert_array_equal(statistics.Means, otherStatistics.Means)
+        np.testing.assert_array_equal(statistics.SquaredDeviations, otherStatistics.SquaredDeviations)
+    # Another sweep that shares a point only simulates the new one
+    _, simulated, prepared = RunSweepCounting({"OWN_ESTIMATE_WEIGHT": [0.3, 0.5]}, resultDirectory)
+    assert {p.AsDict()["OWN_ESTIMATE_WEIGHT"] for p, _ in simulated} == {0.5} and prepared == [0.5]
+    assert len(os.listdir(resultDirectory)) == 3
@@ -0,0 +1,68 @@
+'''
+Created on 18.10.2026
+'''
+import pytest
+from encryption import Paillier, DamgardJurik, RandomnessPool
+from simulation import SimProfiler, SimSensor
+
+EXAMPLE_PRIMES = (282174488599599500573849980909, 362736035870515331128527330659)
+
+def test_profiler_counts_operations_and_uninstalls():
+    pk, sk = Paillier.KeyGenFromPrimes(*EXAMPLE_PRIMES, KeepFactorization = True, SimpleGenerator = True)
+    originals = (SimSensor.FuseEncryptedNeighborEstimates, Paillier.Encrypt, Paillier.MultiExponentiation)
+    profiler = SimProfiler()
+    profiler.Install()
+    try:
+        assert SimSensor.FuseEncryptedNeighborEstimates is not originals[0]
+        c1, c2, c3 = Paillier.Encrypt(pk, 1), Paillier.Encrypt(pk, 2), Paillier.Encrypt(pk, 3)
+        assert Paillier.Decrypt(sk, Paillier.WeightedSum(pk, [c1, c2, c3], [4, 0, -5])) == 4 - 15
+        assert Paillier.Decrypt(sk, Paillier.Mult(pk, c1, 7)) == 7
+    finally:
+        profiler.Uninstall()
+    assert (SimSensor.FuseEncryptedNeighborEstimates, Paillier.Encrypt, Paillier.MultiExponentiation) == originals
+    # One product per nonzero weight of the weighted sum, and one for Mult; one exponentiation per noise factor, per
+    # multi-exponentiation of the weighted sum (of the positive and of the negative terms), for Mult, and two per CRT decryption
+    assert profiler.Counts == {"encryptions": 3, "decryptions": 2, "homomorphic multiplications": 3, "exponentiations": 3 + 2 + 1 + 4, "inversions": 1}
+    assert profiler.Calls == {"encryption": 3}
+    merged = profiler.Copy().Merge(profiler)
+    assert merged.Counts["encryptions"] == 6 and merged.Calls["encryption"] == 6
+
+# Returns the counts of the operations the function makes with an installed profiler
+def CountOperations(Function):
+    profiler = SimProfiler()
+    profiler.Install()
+    try:
+        Function()
+    finally:
+        profiler.Uninstall()
+    return profiler.Counts
+
+def test_profiler_counts_the_exponentiations_of_encryption_and_decryption():
+    pk, sk = Paillier.KeyGenFromPrimes(*EXAMPLE_PRIMES)
+    c = Paillier.Encrypt(pk, 5)
+    # g^m and the noise factor, and a single exponentiation for decryption without the factorization
+    assert CountOperations(lambda: Paillier.Encrypt(pk, 5))["exponentiations"] == 2
+    assert CountOperations(lambda: Paillier.Decrypt(tuple(sk), c))["exponentiations"] == 1
+    # Zero weights make a fresh encryption of zero instead
+    assert CountOperations(lambda: Paillier.Mult(pk, c, 0))["exponentiations"] == 2
+    pk, sk = DamgardJurik.KeyGenFromPrimes(*EXAMPLE_PRIMES, 2)
+    c = DamgardJurik.Encrypt(pk, 5)
+    assert CountOperations(lambda: DamgardJurik.Decrypt(sk, DamgardJurik.Mult(pk, DamgardJurik.Encrypt(pk, 5), -2)))["exponentiations"] == 3
+
+@pytest.mark.parametrize("ShortExponents", [False, True])
+def test_profiler_counts_the_exponentiations_of_noise_factors(ShortExponents):
+    pk, _ = Paillier.KeyGenFromPrimes(*EXAMPLE_PRIMES, SimpleGenerator = True)
+    previous = (Paillier.SHORT_EXPONENT_RANDOMNESS, Paillier.SHORT_EXPONENT_BIT_SIZE, Paillier.FIXED_BASE_WINDOW_BIT_SIZE)
+    Paillier.SetShortExponentRandomness(ShortExponents)
+    # Without a low-water mark, drawing the last factor does not start a refill in the background
+    pool = RandomnessPool(HighWaterMark = 3, LowWaterMark = 0, BatchSize = 2)
+    try:
+        Paillier.GetFixedBaseTable(pk) # Precomputed tables are not counted
+        assert CountOperations(lambda: Paillier.EncryptZeros(pk, 4))["exponentiations"] == 4
+        # Pooled factors are counted when the pool is filled in this process (in batches), but not when they are drawn
+        Paillier.SetRandomnessPool(pool)
+        assert CountOperations(lambda: pool.Fill(pk))["exponentiations"] == 3
+        assert CountOperations(lambda: [Paillier.Encrypt(pk, 0) for _ in range(3)]).get("exponentiations", 0) == 0
+    finally:
+        Paillier.SetRandomnessPool(None)
+        Paillier.SetShortExponentRandomness(*previous)
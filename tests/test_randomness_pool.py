@@ -0,0 +1,35 @@
+'''
+Created on 18.10.2026
+'''
+from concurrent.futures import ProcessPoolExecutor
+import pytest
+from encryption import Paillier, RandomnessPool
+
+EXAMPLE_PRIMES = (282174488599599500573849980909, 362736035870515331128527330659)
+
+@pytest.fixture
+def KeyPair():
+    yield Paillier.KeyGenFromPrimes(*EXAMPLE_PRIMES, KeepFactorization = True, SimpleGenerator = True)
+    Paillier.SetRandomnessPool(None)
+
+@pytest.mark.parametrize("UseExecutor", [False, True])
+def test_pooled_noise_factors_are_drawn_and_decrypt(KeyPair, UseExecutor):
+    pk, sk = KeyPair
+    executor = ProcessPoolExecutor(1) if UseExecutor else None
+    try:
+        pool = RandomnessPool(HighWaterMark = 16, LowWaterMark = 0, BatchSize = 4, Executor = executor)
+        pool.Fill(pk)
+        Paillier.SetRandomnessPool(pool)
+        plaintexts = list(range(-8, 8))
+        ciphertexts = [Paillier.Encrypt(pk, m) for m in plaintexts]
+        assert pool.GetStatistics() == {"hits": 16, "misses": 0, "pooled": 0}
+        assert [Paillier.Decrypt(sk, c) for c in ciphertexts] == plaintexts
+        # Every factor is used only once
+        assert len(set(ciphertexts)) == len(ciphertexts)
+        # An empty pool falls back to computing the factor
+        assert Paillier.Decrypt(sk, Paillier.Encrypt(pk, 42)) == 42
+        pool.Stop()
+        assert pool.Misses == 1
+    finally:
+        if executor is not None:
+            executor.shutdown()
@@ -0,0 +1,40 @@
+'''
+Created on 18.10.2026
+'''
+import functools
+import numpy as np
+import pytest
+import RunSimulation
+from simulation import SimScheduler, SimParameters as PARAM
+
+SETTINGS = {"SENSOR_GRID_DIMENSIONS": (4, 4), "TIME_STEPS_PER_RUN": 3, "PLAINTEXT_MODULUS_BIT_SIZE": 192,
+            "TRACK_ERRORS_PER_ROUND": True, "PROFILING": False, "RANDOMNESS_POOL_PROCESS_COUNT": 0}
+
+@pytest.fixture(autouse = True)
+def RestoreSettings(tmp_path):
+    settings = PARAM.GetSettings()
+    PARAM.Apply(dict(SETTINGS, KEY_STORE_DIRECTORY = str(tmp_path)))
+    yield
+    PARAM.Restore(settings)
+
+# Runs a campaign of five runs in chunks of two and returns its merged error statistics
+def RunCampaign(ProcessCount):
+    results = SimScheduler(5, 2, PARAM.RANDOM_SEED).Run(RunSimulation.SimulateChunk, RunSimulation.InitializeWorker, ProcessCount)
+    return functools.reduce(RunSimulation.MergeChunkResults, results)[0]
+
+@pytest.mark.parametrize("Encrypted", [False, True])
+def test_merged_result_does_not_depend_on_the_process_count(Encrypted):
+    PARAM.Apply({"DO_NOT_ENCRYPT": not Encrypted})
+    if Encrypted:
+        # Generate the key up front, as RunSimulation does, so that both workers load the same one
+        RunSimulation.SimController.GetKeyPair()
+    serial, parallel = RunCampaign(1), RunCampaign(2)
+    np.testing.assert_array_equal(serial.Counts, parallel.Counts)
+    np.testing.assert_array_equal(serial.Means, parallel.Means)
+    np.testing.assert_array_equal(serial.SquaredDeviations, parallel.SquaredDeviations)
+
+def test_chunks_cover_all_runs_with_distinct_seeds():
+    chunks = SimScheduler(5, 2, 42).Chunks
+    assert [(index, runs) for index, runs, _ in chunks] == [(0, 2), (1, 2), (2, 1)]
+    assert len({seed for _, _, seed in chunks}) == 3
+    assert chunks == SimScheduler(5, 2, 42).Chunks
@@ -1,2 +1,3 @@
 from utility.primes import next_prime
-from utility.modular import gcd, lcm, ModularIntegerInverse
\ No newline at end of file
+from utility.modular import gcd, lcm, ModularIntegerInverse, BatchModularIntegerInverse
+from utility.residues import ResidueNumberSystem
\ No newline at end of file
@@ -15,14 +15,19 @@ def BitSize(n):
         result += 1
     return result
 
-# Extended Euclidean algorithm
+# Extended Euclidean algorithm, returns (g, x, y) with g = x * a + y * b
 def ExtendedIntegerEuclidean(a, b):
     a, b = int(round(a)), int(round(b))
-    if a == 0:
-        return (b, 0, 1)
-    else:
-        g, x, y = ExtendedIntegerEuclidean(b % a, a)
-        return (g, y - (b // a) * x, x)
+    # Iterates over the same remainders as the recursion (a, b) -> (b % a, a), so the results are identical
+    previousR, r = b, a
+    previousX, x = 0, 1
+    previousY, y = 1, 0
+    while r != 0:
+        quotient = previousR // r
+        previousR, r = r, previousR - quotient * r
+        previousX, x = x, previousX - quotient * x
+        previousY, y = y, previousY - quotient * y
+    return (previousR, previousX, previousY)
 
 # Greatest common denominator
 def gcd(a, b):
@@ -36,59 +41,115 @@ def lcm(a, b):
 # Returns the multiplicative inverse of a modulo m
 def ModularIntegerInverse(a, m):
     a, m = int(round(a)), int(round(m))
-    g, x, _ = ExtendedIntegerEuclidean(a, m)
-    if g != 1:
-        #print(g, a, m)
-        raise ArithmeticError('modular inverse does not exist', g, a, m)
-    else:
-        return x % m
+    try:
+        # Python's built-in modular inverse runs the extended Euclidean algorithm natively
+        return pow(a, -1, m)
+    except ValueError:
+        raise ArithmeticError('modular inverse does not exist', gcd(a, m), a, m) from None
 
-# Gaussian elimination within the ring
-def ModularMatrixInverse(Matrix, Modulus):
+# Returns the multiplicative inverses of all values modulo m with a single modular inversion (Montgomery's trick)
+def BatchModularIntegerInverse(Values, m):
+    Values, m = [int(round(v)) % int(round(m)) for v in Values], int(round(m))
+    if len(Values) == 0:
+        return []
+    # Prefix products: prefixes[i] = Values[0] * ... * Values[i]
+    prefixes = [Values[0]]
+    for v in Values[1:]:
+        prefixes.append(prefixes[-1] * v % m)
+    try:
+        inverse = pow(prefixes[-1], -1, m)
+    except ValueError:
+        # Report the first value without an inverse
+        for v in Values:
+            ModularIntegerInverse(v, m)
+        raise
+    # Peel off one value at a time: inverse of Values[i] = inverse of prefixes[i] * prefixes[i - 1]
+    result = [0] * len(Values)
+    for i in range(len(Values) - 1, 0, -1):
+        result[i] = inverse * prefixes[i - 1] % m
+        inverse = inverse * Values[i] % m
+    result[0] = inverse
+    return result
+
+# Multiplies every entry of a column vector with every entry of a row vector modulo m (both reduced modulo m);
+# object arrays (for moduli beyond 63 bits) are simply multiplied as Python integers
+def MultModuloOuter(Column, Row, Modulus):
+    if Column.dtype == object:
+        return np.outer(Column, Row) % Modulus
+    return MultModuloArray(Column[:, None], Row[None, :], Modulus)
+
+# Gaussian elimination within the ring, with whole-row updates; TimingHook(MatrixSize, Seconds) is called when done, if given
+def ModularMatrixInverse(Matrix, Modulus, TimingHook = None):
     # Assert that matrix is square
     assert(len(Matrix.shape) == 2)
     assert(Matrix.shape[0] == Matrix.shape[1])
-    matrixSize = Matrix.shape[0]
-    # Assert that matrix is invertible
-    if(int(round(np.linalg.det(Matrix))) == 0):
-        raise ArithmeticError('the matrix is not invertible, because its determinant is zero!')
-    # Initialize the result as identity matrix
-    result = np.zeros((matrixSize, matrixSize),dtype=np.int64)
-    for i in range(0, matrixSize):
-        result[i, i] = 1
-    # Invert the matrix
+    matrixSize, Modulus = Matrix.shape[0], int(round(Modulus))
+    # Work on int64 if the modulus is small enough (see MultModuloArray), on Python integers otherwise
+    # (beyond 56 bits, the many small limbs cost more than multiplying Python integers)
+    dtype = np.int64 if Modulus.bit_length() <= 56 else object
     startTime = ti.default_timer()
+    # Eliminate on the matrix augmented by the identity matrix, which then turns into the result
+    augmented = np.zeros((matrixSize, 2 * matrixSize), dtype=dtype)
+    augmented[:, :matrixSize] = np.array([[int(v) % Modulus for v in row] for row in Matrix.tolist()], dtype=dtype)
+    augmented[:, matrixSize:] = np.identity(matrixSize, dtype=dtype)
     for i in range(0, matrixSize):
+        # Pick a pivot row whose leading coefficient is invertible, or fail if there is none
+        pivot = next((j for j in range(i, matrixSize) if gcd(int(augmented[j, i]), Modulus) in (1, -1)), None)
+        if pivot is None:
+            raise ArithmeticError('the matrix is not invertible modulo', Modulus, 'no invertible pivot in column', i)
+        if pivot != i:
+            augmented[[i, pivot]] = augmented[[pivot, i]]
         # Reduce current row so its leading coefficient is 1
-        factor = np.int64(ModularIntegerInverse(Matrix[i][i], Modulus))
-        Matrix[i] = [MultModulo(v, factor, Modulus) for v in Matrix[i]]
-        result[i] = [MultModulo(v, factor, Modulus) for v in result[i]] # Dito for the result matrix...
-        # Subtract current row from every other row
-        for j in range(0, matrixSize):
-            if(i != j):
-                factor = Matrix[j][i]
-                Matrix[j] = [(Matrix[j][k] - MultModulo(Matrix[i][k], factor, Modulus)) % Modulus for k in range(matrixSize)]
-                result[j] = [(result[j][k] - MultModulo(result[i][k], factor, Modulus)) % Modulus for k in range(matrixSize)]
-    print("matrix of size", matrixSize, "inverted in", round(ti.default_timer() - startTime, 5), "seconds")
-    return result
+        factor = ModularIntegerInverse(int(augmented[i, i]), Modulus)
+        augmented[i] = MultModuloOuter(np.array([factor], dtype=dtype), augmented[i], Modulus)[0]
+        # Subtract current row from every other row (the columns left of the pivot are already eliminated),
+        # i.e., add it times the negated leading coefficients
+        factors = (Modulus - augmented[:, i]) % Modulus
+        factors[i] = 0
+        remainder = augmented[:, i:] + MultModuloOuter(factors, augmented[i, i:], Modulus)
+        augmented[:, i:] = np.where(remainder >= Modulus, remainder - Modulus, remainder)
+    if TimingHook is not None:
+        TimingHook(matrixSize, ti.default_timer() - startTime)
+    return augmented[:, matrixSize:].copy()
+
+# Multiplies int64 arrays element by element modulo m < 2^63 (with broadcasting) without integer overflows;
+# the result is an int64 array with entries in [0, m)
+def MultModuloArray(Factor1, Factor2, Modulus):
+    Modulus = int(Modulus)
+    assert(0 < Modulus < 2 ** 63)
+    # Reduce both factors into [0, m), where they can be handled as uint64
+    Factor1 = np.mod(np.asarray(Factor1, dtype=np.int64), Modulus).astype(np.uint64)
+    Factor2 = np.mod(np.asarray(Factor2, dtype=np.int64), Modulus).astype(np.uint64)
+    modulus = np.uint64(Modulus)
+    if (Modulus - 1) ** 2 < 2 ** 64:
+        return (Factor1 * Factor2 % modulus).astype(np.int64)
+    # Otherwise, split the first factor into limbs small enough that limb * (m - 1) and (m - 1) << limb size still fit
+    # into uint64, and go through them from the top, Horner-style
+    limbBitSize = 64 - Modulus.bit_length()
+    limbMask, shiftBits = np.uint64((1 << limbBitSize) - 1), np.uint64(limbBitSize)
+    result = np.zeros(np.broadcast(Factor1, Factor2).shape, dtype=np.uint64)
+    for shift in range(((Modulus.bit_length() - 1) // limbBitSize) * limbBitSize, -1, -limbBitSize):
+        limbProduct = ((Factor1 >> np.uint64(shift)) & limbMask) * Factor2 % modulus
+        result = ((result << shiftBits) % modulus + limbProduct) % modulus
+    return result.astype(np.int64)
+
+# Multiplies int64 arrays element by element modulo 2^ModulusPower (with broadcasting); since 2^ModulusPower divides 2^64,
+# the wraparound of the uint64 product does not change the result, so only the bits above the modulus need to be masked off
+def MultModuloPowerOf2Array(Factor1, Factor2, ModulusPower):
+    # Check the modulus and prepare the bitmask
+    assert(ModulusPower <= 63)
+    bitMask = np.uint64(2 ** ModulusPower - 1)
+    # Reinterpret the int64 factors as uint64 (i.e., in two's complement, just like Python's & on negative integers)
+    Factor1 = np.asarray(Factor1, dtype=np.int64).view(np.uint64)
+    Factor2 = np.asarray(Factor2, dtype=np.int64).view(np.uint64)
+    return (Factor1 * Factor2 & bitMask).astype(np.int64)
 
 # This ensures that the product of factors does not cause integer overflows
 def MultModulo(Factor1, Factor2, Modulus):
-    return np.int64(int(Factor1) * int(Factor2) % int(Modulus))
+    Modulus = int(Modulus)
+    return MultModuloArray(int(Factor1) % Modulus, int(Factor2) % Modulus, Modulus)[()]
 
 # Uses bitwise operators to accelerate multiplication modulo a power of 2
 def MultModuloPowerOf2(Factor1, Factor2, ModulusPower):
-    # Check the modulus and prepare the bitmask
-    assert(ModulusPower <= 63)
     bitMask = 2 ** ModulusPower - 1
-    Factor1, Factor2 = Factor1 & bitMask, Factor2 & bitMask
-    # Loop through bits of the first factor and
-    result = 0
-    while Factor1 > 0:
-        # Add the second factor, properly bit-shifted, to the result
-        if Factor1 & 1:
-            result = (result + Factor2) & bitMask
-        # Bit-shift the factors (within the bitmask)
-        Factor2 = (Factor2 & bitMask) << 1
-        Factor1 = Factor1 >> 1
-    return result
\ No newline at end of file
+    return int(MultModuloPowerOf2Array(int(Factor1) & bitMask, int(Factor2) & bitMask, ModulusPower))
\ No newline at end of file
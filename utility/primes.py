@@ -3,8 +3,9 @@ Source: https://gist.github.com/bnlucas/5876128
 
 @author: bnlucas
 '''
-from fractions import gcd
+from math import gcd
 from random import randrange
+import numpy as np
 
 PRIMES_LE_31 = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31)
 PRIMONIAL_31 = 200560490130
@@ -96,7 +97,7 @@ def selfridge(n):
             return ds, 0, 0
 
         if jacobi(ds, n) == -1:
-            return ds, 1, (1 - ds) / 4
+            return ds, 1, (1 - ds) // 4
 
         d += 2
         s *= -1
@@ -121,7 +122,7 @@ def chain(n, u1, v1, u2, v2, d, q, m):
             if int(v1) & 1 == 1:
                 v1 = v1 + n
 
-            u1, v1 = (u1 / 2) % n, (v1 / 2) % n
+            u1, v1 = (u1 // 2) % n, (v1 // 2) % n
             k = (q * k) % n
 
         m = m >> 1
@@ -232,7 +233,30 @@ def baillie_psw(n, limit=100):
         and strong_lucas_pseudoprime(n)
 
 
-def next_prime(n):
+def small_primes(limit):
+    sieve = np.ones(limit, dtype=bool)
+    sieve[:2] = False
+    for p in range(2, isqrt(limit - 1) + 1):
+        if sieve[p]:
+            sieve[p * p::p] = False
+    return np.flatnonzero(sieve).tolist()
+
+
+SIEVE_PRIME_LIMIT = 2 ** 16
+SIEVE_PRIMES = small_primes(SIEVE_PRIME_LIMIT)
+SIEVE_WINDOW_SIZE = 2 ** 13
+
+
+def sieve_window(start, length=SIEVE_WINDOW_SIZE, primes=SIEVE_PRIMES):
+    # Rules out all multiples of the sieving primes in [start, start + length)
+    # at once (start must exceed the largest of them)
+    candidates = np.ones(length, dtype=bool)
+    for p in primes:
+        candidates[(-start) % p::p] = False
+    return [start + i for i in np.flatnonzero(candidates).tolist()]
+
+
+def next_prime_wheel(n):
     if n < 2:
         return 2
 
@@ -247,4 +271,19 @@ def next_prime(n):
     while not baillie_psw(n):
         n += gap[n % 30]
 
-    return n
\ No newline at end of file
+    return n
+
+
+def next_prime(n):
+    if n < SIEVE_PRIME_LIMIT:
+        return next_prime_wheel(n)
+
+    # Sieve a window of candidates, and only test the survivors
+    start = n + 1
+    while True:
+        for candidate in sieve_window(start):
+            if strong_pseudoprime(candidate, 2) \
+                    and strong_pseudoprime(candidate, 3) \
+                    and strong_lucas_pseudoprime(candidate):
+                return candidate
+        start += SIEVE_WINDOW_SIZE
\ No newline at end of file
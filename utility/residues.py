@@ -0,0 +1,79 @@
+'''
+Created on 18.10.2026
+'''
+import numpy as np
+from utility.primes import strong_pseudoprime
+from utility.modular import ModularIntegerInverse
+
+# The largest lane modulus, chosen so that products with small weights and sums of a few of them never overflow int64
+LANE_MODULUS_LIMIT = 2 ** 31
+
+# Deterministic primality test for lane candidates: below 2^32, the strong pseudoprime tests to bases 2, 7 and 61 suffice
+def IsLanePrime(n):
+    return all(n == a or strong_pseudoprime(n, a) for a in (2, 7, 61))
+
+# Returns the largest primes below the limit, as few as possible so that their product exceeds the specified minimum
+def GetLanePrimes(MinimumProduct, Limit = LANE_MODULUS_LIMIT):
+    result, product, candidate = [], 1, Limit - 1
+    while product <= MinimumProduct:
+        if IsLanePrime(candidate):
+            result.append(candidate)
+            product *= candidate
+        candidate -= 2 if candidate % 2 == 1 else 1
+    return result, product
+
+class ResidueNumberSystem(object):
+    '''
+    Represents signed integers of up to BitSize bits (plus sign) exactly as their residues modulo several ~31-bit primes,
+    held in int64 NumPy arrays with one lane per prime along the first axis. Additions and multiplications with small
+    integers can be done lane by lane, and the full integers are only rebuilt via the Chinese remainder theorem on demand.
+    If BitSize fits into int64 on its own, no residues are used at all and there is a single lane of plain integers.
+    '''
+
+    def __init__(self, BitSize):
+        '''
+        Constructor
+        '''
+        self.BitSize = BitSize
+        if BitSize <= 62:
+            self.Moduli = None
+            self.LaneCount = 1
+            return
+        # Pick enough primes so that their product covers the signed range
+        primes, product = GetLanePrimes(2 ** (BitSize + 1))
+        self.LaneCount = len(primes)
+        self.Moduli = np.array(primes, dtype=np.int64)
+        self.Modulus = product
+        # Precompute the CRT basis: (M / m_i) * ((M / m_i)^-1 mod m_i)
+        self.Basis = [(product // p) * ModularIntegerInverse(product // p, p) for p in primes]
+
+    def IsPlainInt64(self):
+        return self.Moduli is None
+
+    def ToResidues(self, Values):
+        '''
+        Converts an int64 array into an array of residues with the lanes along a new first axis.
+        '''
+        Values = np.asarray(Values, dtype=np.int64)
+        if self.IsPlainInt64():
+            return Values[None, ...].copy()
+        return np.mod(Values[None, ...], self.Moduli.reshape((-1,) + (1,) * Values.ndim))
+
+    def Reduce(self, Residues):
+        '''
+        Reduces residues (e.g., after a weighted sum) back into their lanes' ranges.
+        '''
+        if self.IsPlainInt64():
+            return Residues
+        return np.mod(Residues, self.Moduli.reshape((-1,) + (1,) * (Residues.ndim - 1)), out=Residues)
+
+    def FromResidues(self, Residues):
+        '''
+        Rebuilds the (signed) Python integer from the residues of a single value, one per lane.
+        '''
+        if self.IsPlainInt64():
+            return int(Residues[0])
+        result = sum(int(r) * b for r, b in zip(Residues, self.Basis)) % self.Modulus
+        if result > self.Modulus // 2:
+            result -= self.Modulus
+        return result